@@ -1,12 +1,15 @@
 from abc import abstractmethod, ABC
-import pygame
-import os
+
+from Classes.move_tables import *
+from Classes.bitboard import COLOURS, COLOUR_CODES, PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING
 
 class Piece(ABC):
     """
     The Piece class is the generic abstract class for all the chess pieces
     Implement as one of the below specific classes.
+    Pieces use __slots__ and keep their colour as a small integer code (WHITE or BLACK) so each one takes as little memory as possible, many games can be held at once.
     """
+    __slots__ = ('__colour', '__boardx', '__boardy', '__moved', '__button')
 
     def __init__(self, colour, board_pos):
         """
@@ -27,7 +30,7 @@ class Piece(ABC):
 
         self.__piece_error_handling(board_pos)
 
-        self.__colour = colour
+        self.__colour = COLOUR_CODES[colour]
         self.__boardx = board_pos[0]
         self.__boardy = board_pos[1]
         self.__moved = False
@@ -49,27 +52,39 @@ class Piece(ABC):
         """
         pass
 
+    @abstractmethod
+    def get_type_code(self):
+        """
+        Abstract method to return the piece type as an integer code
+        
+        Returns
+        -------
+        integer
+            One of the piece type codes, PAWN to KING
+        """
+        pass
+
     @abstractmethod
     def get_possible_moves(self):
         """
-        Abstract method for calculating the potential moves a piece is capable of making. (All pieces calculate their moves generically. The board will be responsable for preventing pieces from going over the edge or moving over one another)
+        Abstract method for the potential moves a piece is capable of making. (All pieces look their moves up generically in the precomputed move tables, which only hold positions on the board. The board will be responsable for preventing pieces from moving over one another)
         
         Returns
         -------
-        array
-            An array of the board positions the piece can move to.
+        tuple
+            A shared, immutable tuple of the board positions the piece can move to, ordered along each direction away from the piece.
         """
         pass
 
     @abstractmethod
     def get_possible_attack_moves(self):
         """
-        Abstract method for calculating the potential moves a piece is capable of making to take another piece (All pieces calculate their moves generically. The board will be responsable for preventing pieces from going over the edge or moving over one another)
+        Abstract method for the potential moves a piece is capable of making to take another piece (All pieces look their moves up generically in the precomputed move tables. The board will be responsable for preventing pieces from moving over one another)
         
         Returns
         -------
-        array
-            An array of the board positions the piece can move to occupied by an opposing piece
+        tuple
+            A shared, immutable tuple of the board positions the piece can move to occupied by an opposing piece
         """
         pass
 
@@ -94,6 +109,17 @@ class Piece(ABC):
         string
             Returns 'white' or 'black'
         """
+        return COLOURS[self.__colour]
+
+    def get_colour_code(self):
+        """
+        Returns the piece's colour as an integer code, cheaper to compare than the colour's name
+        
+        Returns
+        -------
+        integer
+            Returns WHITE or BLACK
+        """
         return self.__colour
 
     def move(self, board_pos):
@@ -110,6 +136,22 @@ class Piece(ABC):
         self.__boardx = board_pos[0]
         self.__boardy = board_pos[1]
 
+    def restore(self, board_pos, moved):
+        """
+        Puts the piece back on an earlier square when a move is taken back, along with whether it had moved before
+
+        Parameters
+        ----------
+        board_pos: 2D coordinates, (x, y)
+            The coordinates in the Board object's array the piece returns to
+        moved: Boolean
+            The piece's moved flag from before the move being taken back
+        """
+        self.__piece_error_handling(board_pos)
+        self.__moved = moved
+        self.__boardx = board_pos[0]
+        self.__boardy = board_pos[1]
+
     def has_moved(self):
         """
         Returns whether or not the piece has moved already.
@@ -167,65 +209,48 @@ class Piece(ABC):
         return (self.__boardx, self.__boardy)
 
 class Pawn(Piece):
-    def __init__(self, colour, board_pos):
-        super().__init__(colour, board_pos)
-        self.__init_piece()
-    
-    def __init_piece(self):
-        self.__image_path = 'Images/pawn.png' if self.get_colour() == 'white' else 'Images/pawn_b.png'
+    __slots__ = ()
+    __image_paths = ('Images/pawn.png', 'Images/pawn_b.png')
 
     def get_piece_type(self):
         return 'pawn'
 
+    def get_type_code(self):
+        return PAWN
+
     def get_image_path(self):
-        return self.__image_path
+        return self.__image_paths[self.get_colour_code()]
 
     def move(self, board_pos):
         super().move(board_pos)
 
     def get_possible_moves(self):
-        possible_moves = []
         board_pos_x, board_pos_y = super().get_board_index()
-        yoffset = 1 if self.get_colour() == 'black' else -1
-        possible_moves.append((board_pos_x, board_pos_y+yoffset))
-        if(not self.has_moved()):
-            possible_moves.append((board_pos_x, board_pos_y+yoffset*2))
-        return possible_moves
+        return PAWN_TARGETS[self.get_colour()][self.has_moved()][board_pos_x][board_pos_y]
 
     def get_possible_attack_moves(self):
-        possible_moves = []
         board_pos_x, board_pos_y = super().get_board_index()
-        yoffset = 1 if self.get_colour() == 'black' else -1
-        possible_moves.append((board_pos_x+1, board_pos_y+yoffset))
-        possible_moves.append((board_pos_x-1, board_pos_y+yoffset))
-        return possible_moves
+        return PAWN_ATTACK_TARGETS[self.get_colour()][board_pos_x][board_pos_y]
 
 class Rook(Piece):
-    def __init__(self, colour, board_pos):
-        super().__init__(colour, board_pos)
-        self.__init_piece()
-    
-    def __init_piece(self):
-        self.__image_path = 'Images/rook.png' if self.get_colour() == 'white' else 'Images/rook_b.png'
+    __slots__ = ()
+    __image_paths = ('Images/rook.png', 'Images/rook_b.png')
 
     def get_piece_type(self):
         return 'rook'
 
+    def get_type_code(self):
+        return ROOK
+
     def get_image_path(self):
-        return self.__image_path
+        return self.__image_paths[self.get_colour_code()]
 
     def move(self, board_pos):
         super().move(board_pos)
 
     def __moves_helper(self):
-        possible_moves = []
         board_pos_x, board_pos_y = super().get_board_index()
-        for i in range(1, 8):
-            possible_moves.append((board_pos_x, board_pos_y+i))
-            possible_moves.append((board_pos_x, board_pos_y-i))
-            possible_moves.append((board_pos_x+i, board_pos_y))
-            possible_moves.append((board_pos_x-i, board_pos_y))
-        return possible_moves
+        return MOVE_TARGETS['rook'][board_pos_x][board_pos_y]
 
     def get_possible_moves(self):
         return self.__moves_helper()
@@ -234,31 +259,24 @@ class Rook(Piece):
         return self.__moves_helper()
 
 class Bishop(Piece):
-    def __init__(self, colour, board_pos):
-        super().__init__(colour, board_pos)
-        self.__init_piece()
-    
-    def __init_piece(self):
-        self.__image_path = 'Images/bishop.png' if self.get_colour() == 'white' else 'Images/bishop_b.png'
+    __slots__ = ()
+    __image_paths = ('Images/bishop.png', 'Images/bishop_b.png')
 
     def get_piece_type(self):
         return 'bishop'
 
+    def get_type_code(self):
+        return BISHOP
+
     def get_image_path(self):
-        return self.__image_path
+        return self.__image_paths[self.get_colour_code()]
 
     def move(self, board_pos):
         super().move(board_pos)
 
     def __moves_helper(self):
-        possible_moves = []
         board_pos_x, board_pos_y = super().get_board_index()
-        for i in range(1, 8):
-            possible_moves.append((board_pos_x+i, board_pos_y+i))
-            possible_moves.append((board_pos_x+i, board_pos_y-i))
-            possible_moves.append((board_pos_x-i, board_pos_y+i))
-            possible_moves.append((board_pos_x-i, board_pos_y-i))
-        return possible_moves
+        return MOVE_TARGETS['bishop'][board_pos_x][board_pos_y]
 
     def get_possible_moves(self):
         return self.__moves_helper()
@@ -267,34 +285,24 @@ class Bishop(Piece):
         return self.__moves_helper()
 
 class Knight(Piece):
-    def __init__(self, colour, board_pos):
-        super().__init__(colour, board_pos)
-        self.__init_piece()
-    
-    def __init_piece(self):
-        self.__image_path = 'Images/knight.png' if self.get_colour() == 'white' else 'Images/knight_b.png'
+    __slots__ = ()
+    __image_paths = ('Images/knight.png', 'Images/knight_b.png')
 
     def get_piece_type(self):
         return 'knight'
 
+    def get_type_code(self):
+        return KNIGHT
+
     def get_image_path(self):
-        return self.__image_path
+        return self.__image_paths[self.get_colour_code()]
 
     def move(self, board_pos):
         super().move(board_pos)
 
     def __moves_helper(self):
-        possible_moves = []
         board_pos_x, board_pos_y = super().get_board_index()
-        possible_moves.append((board_pos_x+1, board_pos_y+2))
-        possible_moves.append((board_pos_x+1, board_pos_y-2))
-        possible_moves.append((board_pos_x-1, board_pos_y+2))
-        possible_moves.append((board_pos_x-1, board_pos_y-2))
-        possible_moves.append((board_pos_x+2, board_pos_y+1))
-        possible_moves.append((board_pos_x+2, board_pos_y-1))
-        possible_moves.append((board_pos_x-2, board_pos_y+1))
-        possible_moves.append((board_pos_x-2, board_pos_y-1))
-        return possible_moves
+        return MOVE_TARGETS['knight'][board_pos_x][board_pos_y]
 
     def get_possible_moves(self):
         return self.__moves_helper()
@@ -303,35 +311,24 @@ class Knight(Piece):
         return self.__moves_helper()
 
 class Queen(Piece):
-    def __init__(self, colour, board_pos):
-        super().__init__(colour, board_pos)
-        self.__init_piece()
-    
-    def __init_piece(self):
-        self.__image_path = 'Images/queen.png' if self.get_colour() == 'white' else 'Images/queen_b.png'
+    __slots__ = ()
+    __image_paths = ('Images/queen.png', 'Images/queen_b.png')
 
     def get_piece_type(self):
         return 'queen'
 
+    def get_type_code(self):
+        return QUEEN
+
     def get_image_path(self):
-        return self.__image_path
+        return self.__image_paths[self.get_colour_code()]
 
     def move(self, board_pos):
         super().move(board_pos)
 
     def __moves_helper(self):
-        possible_moves = []
         board_pos_x, board_pos_y = super().get_board_index()
-        for i in range(1, 8):
-            possible_moves.append((board_pos_x, board_pos_y+i))
-            possible_moves.append((board_pos_x, board_pos_y-i))
-            possible_moves.append((board_pos_x+i, board_pos_y))
-            possible_moves.append((board_pos_x-i, board_pos_y))
-            possible_moves.append((board_pos_x+i, board_pos_y+i))
-            possible_moves.append((board_pos_x+i, board_pos_y-i))
-            possible_moves.append((board_pos_x-i, board_pos_y+i))
-            possible_moves.append((board_pos_x-i, board_pos_y-i))
-        return possible_moves
+        return MOVE_TARGETS['queen'][board_pos_x][board_pos_y]
 
     def get_possible_moves(self):
         return self.__moves_helper()
@@ -340,36 +337,24 @@ class Queen(Piece):
         return self.__moves_helper()
 
 class King(Piece):
-    def __init__(self, colour, board_pos):
-        super().__init__(colour, board_pos)
-        self.__init_piece()
-    
-    def __init_piece(self):
-        self.__image_path = 'Images/king.png' if self.get_colour() == 'white' else 'Images/king_b.png'
+    __slots__ = ()
+    __image_paths = ('Images/king.png', 'Images/king_b.png')
 
     def get_piece_type(self):
         return 'king'
 
+    def get_type_code(self):
+        return KING
+
     def get_image_path(self):
-        return self.__image_path
+        return self.__image_paths[self.get_colour_code()]
 
     def move(self, board_pos):
         super().move(board_pos)
 
     def __moves_helper(self):
-        possible_moves = []
         board_pos_x, board_pos_y = super().get_board_index()
-        for i in range(1, 2):
-            possible_moves.append((board_pos_x, board_pos_y+i))
-            possible_moves.append((board_pos_x, board_pos_y-i))
-            possible_moves.append((board_pos_x+i, board_pos_y))
-            possible_moves.append((board_pos_x-i, board_pos_y))
-            possible_moves.append((board_pos_x+i, board_pos_y+i))
-            possible_moves.append((board_pos_x+i, board_pos_y-i))
-            possible_moves.append((board_pos_x-i, board_pos_y+i))
-            possible_moves.append((board_pos_x-i, board_pos_y-i))
-
-        return possible_moves
+        return MOVE_TARGETS['king'][board_pos_x][board_pos_y]
 
     def get_possible_moves(self):
         return self.__moves_helper()
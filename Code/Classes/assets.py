@@ -0,0 +1,79 @@
+import pygame
+import os
+
+"""
+    Process wide cache of the game's images. Each image is loaded from disk once and the same surface is handed to every Button and frame that draws it.
+"""
+
+IMAGE_DIRECTORY = 'Images'
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp')
+
+# Cached surfaces keyed by image path, with whether they have been converted to the display's pixel format
+_images = {}
+
+def _convert(surface):
+    """
+        Converts a surface to the display's pixel format, which makes blitting it much faster. Only possible once the display has been created.
+
+        Returns
+        -------
+            (pygame Surface, boolean)
+                The converted surface (or the surface passed in) and whether it was converted
+    """
+    if pygame.display.get_surface() is None:
+        return (surface, False)
+    if surface.get_flags() & pygame.SRCALPHA:
+        return (surface.convert_alpha(), True)
+    return (surface.convert(), True)
+
+def load_image(image_path):
+    """
+        Returns the surface for an image, loading it from disk only the first time it is asked for.
+        Surfaces are shared, so they must not be drawn on.
+
+        Parameters
+        ----------
+            image_path: string
+                Path of the image, relative to the top level of the ChessGame folder (ex: 'Images/pawn.png')
+
+        Returns
+        -------
+            pygame Surface
+                The image's surface, converted to the display's pixel format once the display exists
+    """
+    cached = _images.get(image_path)
+    if cached is None:
+        if image_path == None or not os.path.isfile(image_path):
+            raise ValueError("Image can't be found: {}".format(image_path))
+        cached = _convert(pygame.image.load(os.path.join('./', image_path)))
+        _images[image_path] = cached
+    elif not cached[1]:
+        # Loaded before the display was created, convert it now that it may exist
+        cached = _convert(cached[0])
+        _images[image_path] = cached
+    return cached[0]
+
+def preload_images(directory=IMAGE_DIRECTORY):
+    """
+        Loads every image in a directory into the cache, so nothing is read from disk once the game is running. Call after the display has been created.
+
+        Parameters
+        ----------
+            directory: string
+                The directory of images to load
+
+        Returns
+        -------
+            integer
+                The number of images in the cache
+    """
+    for name in sorted(os.listdir(directory)):
+        if name.lower().endswith(IMAGE_EXTENSIONS):
+            load_image(os.path.join(directory, name).replace(os.sep, '/'))
+    return len(_images)
+
+def clear_images():
+    """
+        Empties the cache.
+    """
+    _images.clear()
@@ -0,0 +1,191 @@
+from Classes.bitboard import *
+from Classes.evaluation import CODE_SCORES, ENDGAME_CODE_SCORES, CODE_PHASES, MAX_PHASE
+
+import numpy
+
+"""
+    Evaluating large batches of positions at once with NumPy, ex: every position of a PGN archive or of a self-play run.
+    NumPy is only needed for this module, the game and the engine don't use it.
+
+    Positions are packed into an (N, 64) uint8 array of square codes, the same codes as Position.get_mailbox (0 for an empty square,
+    otherwise 1 + colour * 6 + piece type), along with an (N,) array of the colours to move. evaluate_batch scores them with the same
+    tapered material and piece-square tables as evaluate, plus an optional mobility estimate, working through the batch in chunks small enough
+    to stay in the processor's cache. Mobility is worked out on 64-bit bitboards for whole chunks at a time: sliding attacks are filled
+    along each direction (Kogge-Stone fills) for all of a colour's rooks and queens, or bishops and queens, together, so squares reached
+    by two pieces only count once.
+"""
+
+# Centipawns per square a colour's knights, diagonal sliders (bishops and queens) and straight sliders (rooks and queens) can move to
+KNIGHT_MOBILITY = 4
+DIAGONAL_MOBILITY = 3
+STRAIGHT_MOBILITY = 2
+CHUNK_SIZE = 16384
+
+# _SQUARE_TABLE[square * 16 + code] is a piece's middlegame score on a square, negative for black's pieces, _ENDGAME_SQUARE_TABLE its endgame score
+_SQUARE_TABLE = numpy.zeros(64 * 16, dtype=numpy.int32)
+_ENDGAME_SQUARE_TABLE = numpy.zeros(64 * 16, dtype=numpy.int32)
+for _code in range(1, 13):
+    for _square in range(64):
+        _SQUARE_TABLE[_square * 16 + _code] = CODE_SCORES[_code][_square]
+        _ENDGAME_SQUARE_TABLE[_square * 16 + _code] = ENDGAME_CODE_SCORES[_code][_square]
+_PHASE_TABLE = numpy.array(CODE_PHASES + (0,) * 3, dtype=numpy.int32)
+_SQUARE_OFFSETS = numpy.arange(64, dtype=numpy.uint16) * 16
+
+_NOT_LEFT_FILE = numpy.uint64(0xFEFEFEFEFEFEFEFE)
+_NOT_RIGHT_FILE = numpy.uint64(0x7F7F7F7F7F7F7F7F)
+_NOT_LEFT_FILES = numpy.uint64(0xFCFCFCFCFCFCFCFC)
+_NOT_RIGHT_FILES = numpy.uint64(0x3F3F3F3F3F3F3F3F)
+_SHIFTS = tuple(numpy.uint64(shift) for shift in range(64))
+# Set bits per byte value, for counting bits on NumPy versions before 2.0 (which don't have numpy.bitwise_count)
+_BYTE_COUNTS = numpy.array([bin(byte).count('1') for byte in range(256)], dtype=numpy.uint8)
+# Square number steps of each sliding direction and the files a step can't land on without wrapping around the board
+_STRAIGHT = ((1, _NOT_LEFT_FILE), (-1, _NOT_RIGHT_FILE), (8, None), (-8, None))
+_DIAGONAL = ((9, _NOT_LEFT_FILE), (7, _NOT_RIGHT_FILE), (-7, _NOT_LEFT_FILE), (-9, _NOT_RIGHT_FILE))
+
+def pack_positions(positions):
+    """
+        Packs positions into arrays for evaluate_batch.
+
+        Parameters
+        ----------
+            positions: array of Position objects
+                The positions to pack
+
+        Returns
+        -------
+            (numpy array, numpy array)
+                The (N, 64) uint8 square codes and the (N,) uint8 colours to move
+    """
+    mailboxes = numpy.frombuffer(b''.join(position.get_mailbox() for position in positions), dtype=numpy.uint8).reshape(-1, 64)
+    turns = numpy.fromiter((position.get_turn() for position in positions), dtype=numpy.uint8, count=len(positions))
+    return (mailboxes, turns)
+
+def pack_boards(boards):
+    """
+        Packs Board objects into arrays for evaluate_batch. The square codes come from each board's Position, which mirrors the pieces
+        in get_pieces_board square for square as bytes, so nothing has to be read piece by piece.
+
+        Parameters
+        ----------
+            boards: array of Board objects
+                The boards to pack
+
+        Returns
+        -------
+            (numpy array, numpy array)
+                The (N, 64) uint8 square codes and the (N,) uint8 colours to move
+    """
+    return pack_positions([board.get_position() for board in boards])
+
+def to_planes(mailboxes):
+    """
+        Splits square codes into one plane per colour and piece type, ex: as the input of a neural network.
+
+        Parameters
+        ----------
+            mailboxes: numpy array
+                (N, 64) uint8 square codes
+
+        Returns
+        -------
+            numpy array
+                (N, 12, 64) uint8 array, plane colour * 6 + piece type is 1 where that piece stands
+    """
+    codes = numpy.arange(1, 13, dtype=numpy.uint8).reshape(1, 12, 1)
+    return (mailboxes[:, numpy.newaxis, :] == codes).view(numpy.uint8)
+
+def _shift(bitboards, step):
+    return bitboards << _SHIFTS[step] if step > 0 else bitboards >> _SHIFTS[-step]
+
+def _slider_attacks(sliders, empty, step, mask):
+    """
+        Squares attacked along one direction by every slider of a bitboard at once, blockers included (Kogge-Stone occluded fill).
+    """
+    if mask is not None:
+        empty = empty & mask
+    sliders = sliders | (empty & _shift(sliders, step))
+    empty = empty & _shift(empty, step)
+    sliders = sliders | (empty & _shift(sliders, 2 * step))
+    empty = empty & _shift(empty, 2 * step)
+    sliders = sliders | (empty & _shift(sliders, 4 * step))
+    attacks = _shift(sliders, step)
+    return attacks & mask if mask is not None else attacks
+
+def _table_popcount(bitboards):
+    """
+        Counts the set bits of each bitboard by looking up each of its bytes, for NumPy versions without numpy.bitwise_count.
+    """
+    return _BYTE_COUNTS[numpy.ascontiguousarray(bitboards).view(numpy.uint8).reshape(-1, 8)].sum(axis=1, dtype=numpy.uint8)
+
+_popcount = getattr(numpy, 'bitwise_count', _table_popcount)
+
+def _knight_attacks(knights):
+    one = ((knights << _SHIFTS[1]) & _NOT_LEFT_FILE) | ((knights >> _SHIFTS[1]) & _NOT_RIGHT_FILE)
+    two = ((knights << _SHIFTS[2]) & _NOT_LEFT_FILES) | ((knights >> _SHIFTS[2]) & _NOT_RIGHT_FILES)
+    return (one << _SHIFTS[16]) | (one >> _SHIFTS[16]) | (two << _SHIFTS[8]) | (two >> _SHIFTS[8])
+
+def _mobility(mailboxes):
+    """
+        Estimates white's mobility minus black's for a chunk of positions, in centipawns.
+    """
+    # Each bit of the square codes packed into one bitboard per position, so any code's bitboard is a few bitwise operations away
+    bits = [numpy.packbits((mailboxes >> numpy.uint8(bit)) & numpy.uint8(1), axis=1, bitorder='little').view('<u8').ravel() for bit in range(4)]
+    inverted = [~bitboards for bitboards in bits]
+    def pieces(code):
+        found = bits[0] if code & 1 else inverted[0]
+        for bit in range(1, 4):
+            found = found & (bits[bit] if code & (1 << bit) else inverted[bit])
+        return found
+    empty = inverted[0] & inverted[1] & inverted[2] & inverted[3]
+    scores = numpy.zeros(len(mailboxes), dtype=numpy.int32)
+    for colour, sign in ((WHITE, 1), (BLACK, -1)):
+        first = 1 + colour * 6
+        own = pieces(first + PAWN) | pieces(first + KNIGHT) | pieces(first + BISHOP) | pieces(first + ROOK) | pieces(first + QUEEN) | pieces(first + KING)
+        targets = ~own
+        queens = pieces(first + QUEEN)
+        straight = pieces(first + ROOK) | queens
+        diagonal = pieces(first + BISHOP) | queens
+        mobility = _popcount(_knight_attacks(pieces(first + KNIGHT)) & targets).astype(numpy.int32) * KNIGHT_MOBILITY
+        for step, mask in _STRAIGHT:
+            mobility += _popcount(_slider_attacks(straight, empty, step, mask) & targets) * numpy.int32(STRAIGHT_MOBILITY)
+        for step, mask in _DIAGONAL:
+            mobility += _popcount(_slider_attacks(diagonal, empty, step, mask) & targets) * numpy.int32(DIAGONAL_MOBILITY)
+        scores += sign * mobility
+    return scores
+
+def evaluate_batch(mailboxes, turns, mobility=True):
+    """
+        Scores a batch of positions. Without mobility the scores are the same as evaluate's.
+
+        Parameters
+        ----------
+            mailboxes: numpy array
+                (N, 64) uint8 square codes (see pack_positions)
+            turns: numpy array
+                (N,) colours to move
+            mobility: boolean
+                Whether to add the mobility estimate
+
+        Returns
+        -------
+            numpy array
+                (N,) int32 scores in centipawns from the point of view of the colour to move
+    """
+    mailboxes = numpy.ascontiguousarray(mailboxes, dtype=numpy.uint8)
+    if mailboxes.ndim != 2 or mailboxes.shape[1] != 64 or len(turns) != len(mailboxes):
+        raise ValueError("Expected (N, 64) square codes and N colours to move, got {} and {}".format(mailboxes.shape, len(turns)))
+    signs = numpy.where(numpy.asarray(turns) == WHITE, 1, -1).astype(numpy.int32)
+    scores = numpy.empty(len(mailboxes), dtype=numpy.int32)
+    for start in range(0, len(mailboxes), CHUNK_SIZE):
+        chunk = mailboxes[start:start + CHUNK_SIZE]
+        chunk_signs = signs[start:start + CHUNK_SIZE]
+        indexes = chunk + _SQUARE_OFFSETS
+        # Tapered from the colour to move's point of view, rounding down the same way as evaluation.taper
+        middlegame = numpy.take(_SQUARE_TABLE, indexes).sum(axis=1, dtype=numpy.int32) * chunk_signs
+        endgame = numpy.take(_ENDGAME_SQUARE_TABLE, indexes).sum(axis=1, dtype=numpy.int32) * chunk_signs
+        phase = numpy.minimum(numpy.take(_PHASE_TABLE, chunk).sum(axis=1, dtype=numpy.int32), MAX_PHASE)
+        chunk_scores = (middlegame * phase + endgame * (MAX_PHASE - phase)) // MAX_PHASE
+        if mobility:
+            chunk_scores += _mobility(chunk) * chunk_signs
+        scores[start:start + CHUNK_SIZE] = chunk_scores
+    return scores
@@ -0,0 +1,247 @@
+"""
+    Constants, square helpers and precomputed attack tables for the bitboard position core.
+
+    A bitboard is a 64-bit Python integer with one bit per square. Squares are numbered so that
+    square = y * 8 + x for the (x, y) index used by the Board object's array, which means square 0
+    is the top left corner of the board (black's back rank) and square 63 is the bottom right.
+"""
+
+WHITE = 0
+BLACK = 1
+COLOURS = ('white', 'black')
+COLOUR_CODES = {'white': WHITE, 'black': BLACK}
+
+PAWN = 0
+KNIGHT = 1
+BISHOP = 2
+ROOK = 3
+QUEEN = 4
+KING = 5
+PIECE_TYPES = ('pawn', 'knight', 'bishop', 'rook', 'queen', 'king')
+PIECE_CODES = {name: code for code, name in enumerate(PIECE_TYPES)}
+
+FULL_BOARD = (1 << 64) - 1
+
+def square_index(board_pos):
+    """
+        Converts a 2D board array index into a square number.
+
+        Parameters
+        ----------
+            board_pos: 2D coordinates, (x, y)
+                Index in the Board object's array
+
+        Returns
+        -------
+            integer
+                The square number (0-63)
+    """
+    return board_pos[1] * 8 + board_pos[0]
+
+def board_index(square):
+    """
+        Converts a square number back into the 2D board array index.
+
+        Parameters
+        ----------
+            square: integer
+                The square number (0-63)
+
+        Returns
+        -------
+            2D coordinates, (x, y)
+                Index in the Board object's array
+    """
+    return (square & 7, square >> 3)
+
+def squares(bitboard):
+    """
+        Lists the square numbers set in a bitboard, lowest square first.
+
+        Parameters
+        ----------
+            bitboard: integer
+                The bitboard to split into squares
+
+        Returns
+        -------
+            array of integers
+                The square numbers of every set bit
+    """
+    found = []
+    while bitboard:
+        lowest = bitboard & -bitboard
+        found.append(lowest.bit_length() - 1)
+        bitboard ^= lowest
+    return found
+
+def _on_board(x_pos, y_pos):
+    return 0 <= x_pos < 8 and 0 <= y_pos < 8
+
+def _leaper_table(offsets):
+    """
+        Builds the attack table for a piece that jumps straight to its target squares (knight, king, pawn captures).
+    """
+    table = []
+    for square in range(64):
+        x_pos, y_pos = board_index(square)
+        attacks = 0
+        for x_offset, y_offset in offsets:
+            if _on_board(x_pos + x_offset, y_pos + y_offset):
+                attacks |= 1 << square_index((x_pos + x_offset, y_pos + y_offset))
+        table.append(attacks)
+    return tuple(table)
+
+def _ray(square, x_offset, y_offset):
+    """
+        Returns the squares walking out from square in one direction, nearest first.
+    """
+    ray = []
+    x_pos, y_pos = board_index(square)
+    x_pos += x_offset
+    y_pos += y_offset
+    while _on_board(x_pos, y_pos):
+        ray.append(square_index((x_pos, y_pos)))
+        x_pos += x_offset
+        y_pos += y_offset
+    return ray
+
+def _line_table(square, directions):
+    """
+        Builds the sliding attack lookup for one line (rank, file or diagonal) through a square.
+        Only the inner squares of the line can block a slider, so the table is keyed by the occupancy of those
+        squares and holds the attacked squares for that occupancy.
+
+        Returns
+        -------
+            (integer, dictionary)
+                The mask of blocking squares and the attacks keyed by masked occupancy.
+    """
+    rays = [_ray(square, x_offset, y_offset) for x_offset, y_offset in directions]
+    mask = 0
+    for ray in rays:
+        for ray_square in ray[:-1]:
+            mask |= 1 << ray_square
+    table = {}
+    occupancy = 0
+    while True:
+        attacks = 0
+        for ray in rays:
+            for ray_square in ray:
+                attacks |= 1 << ray_square
+                if occupancy & (1 << ray_square):
+                    break
+        table[occupancy] = attacks
+        occupancy = (occupancy - mask) & mask
+        if occupancy == 0:
+            break
+    return (mask, table)
+
+KNIGHT_ATTACKS = _leaper_table([(1, 2), (1, -2), (-1, 2), (-1, -2), (2, 1), (2, -1), (-2, 1), (-2, -1)])
+KING_ATTACKS = _leaper_table([(0, 1), (0, -1), (1, 0), (-1, 0), (1, 1), (1, -1), (-1, 1), (-1, -1)])
+# White pawns move up the board array (towards y = 0), black pawns move down it.
+PAWN_ATTACKS = (_leaper_table([(1, -1), (-1, -1)]), _leaper_table([(1, 1), (-1, 1)]))
+
+ROOK_LINES = tuple((_line_table(square, [(1, 0), (-1, 0)]), _line_table(square, [(0, 1), (0, -1)])) for square in range(64))
+BISHOP_LINES = tuple((_line_table(square, [(1, 1), (-1, -1)]), _line_table(square, [(1, -1), (-1, 1)])) for square in range(64))
+
+def _between_table():
+    """
+        Builds the table of squares strictly between two squares on the same rank, file or diagonal (0 when the squares don't share a line or are neighbours).
+        Used for the squares a piece can block a check on and the line a pinned piece can still move along.
+    """
+    table = [[0] * 64 for square in range(64)]
+    for square in range(64):
+        for x_offset, y_offset in ((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1)):
+            between = 0
+            for ray_square in _ray(square, x_offset, y_offset):
+                table[square][ray_square] = between
+                between |= 1 << ray_square
+    return tuple(tuple(row) for row in table)
+
+BETWEEN = _between_table()
+
+def rook_attacks(square, occupied):
+    """
+        Squares a rook on square attacks given the occupied squares (the first blocker on each ray is included).
+
+        Parameters
+        ----------
+            square: integer
+                The rook's square
+            occupied: bitboard
+                Every occupied square on the board
+
+        Returns
+        -------
+            bitboard
+                The attacked squares
+    """
+    (rank_mask, rank_table), (file_mask, file_table) = ROOK_LINES[square]
+    return rank_table[occupied & rank_mask] | file_table[occupied & file_mask]
+
+def bishop_attacks(square, occupied):
+    """
+        Squares a bishop on square attacks given the occupied squares (the first blocker on each ray is included).
+
+        Parameters
+        ----------
+            square: integer
+                The bishop's square
+            occupied: bitboard
+                Every occupied square on the board
+
+        Returns
+        -------
+            bitboard
+                The attacked squares
+    """
+    (diagonal_mask, diagonal_table), (anti_mask, anti_table) = BISHOP_LINES[square]
+    return diagonal_table[occupied & diagonal_mask] | anti_table[occupied & anti_mask]
+
+def queen_attacks(square, occupied):
+    """
+        Squares a queen on square attacks given the occupied squares, the union of the rook and bishop attacks.
+    """
+    return rook_attacks(square, occupied) | bishop_attacks(square, occupied)
+
+def piece_attacks(colour, p_type, square, occupied):
+    """
+        Squares a piece attacks given the occupied squares. Pawns attack diagonally forwards, whatever stands there.
+
+        Parameters
+        ----------
+            colour: integer
+                The piece's colour, WHITE or BLACK
+            p_type: integer
+                The piece's type, PAWN to KING
+            square: integer
+                The piece's square
+            occupied: bitboard
+                Every occupied square on the board
+
+        Returns
+        -------
+            bitboard
+                The attacked squares
+    """
+    if p_type == PAWN:
+        return PAWN_ATTACKS[colour][square]
+    if p_type == KNIGHT:
+        return KNIGHT_ATTACKS[square]
+    if p_type == BISHOP:
+        return bishop_attacks(square, occupied)
+    if p_type == ROOK:
+        return rook_attacks(square, occupied)
+    if p_type == QUEEN:
+        return queen_attacks(square, occupied)
+    return KING_ATTACKS[square]
+
+def square_name(square):
+    """
+        Returns
+        -------
+            string
+                The algebraic name of a square, ex: 'e2' (the bottom row of the board array is row 1)
+    """
+    return 'abcdefgh'[square & 7] + str(8 - (square >> 3))
@@ -1,12 +1,20 @@
-from Classes.button import Button
-import json
 from Classes.abstract_piece import Piece
+from Classes.piece_factory import PieceFactory
+from Classes.bitboard import *
+from Classes.position import Position, encode_move
+from Classes.fen import position_to_fen
+from Classes.notation import move_to_san
 
 class Board():
     """
         Class for the game board object. Handles holding the board's objects and the logic associated with board squares.
+        The rules themselves are worked out by the Position object, which doesn't depend on pygame. A headless board skips creating Button objects (and loading their images) so it can be used without a display.
+        Squares whose pieces or highlights change are remembered as dirty until pop_dirty_squares is called, so only those squares need redrawing.
+        Every move played with make_move is logged in Standard Algebraic Notation (see get_move_log). The notation is only worked out when the log is read, so making and taking back moves stays cheap for look-ahead.
+        Clicks are mapped straight to squares with square_at, using the board's origin and square size, so finding what was clicked doesn't depend on how many pieces or highlights there are.
+        The squares each colour attacks (and by how many pieces) are kept up to date as moves are made and taken back, so asking whether a square is attacked is a lookup.
     """
-    def __init__(self, board_pos, first_player, second_player):
+    def __init__(self, board_pos, first_player, second_player, headless=False):
         """
             Initialize the Board object
 
@@ -18,14 +26,30 @@ class Board():
                     Reference to player one.
                 second_player: Player object
                     Reference to player two.
+                headless: boolean
+                    True to run the board without pygame, pieces and potential positions then have no Button objects.
         """
         self.__board_error_handling(board_pos, first_player, second_player)
+        self.__headless = headless
         self.__board_pos = board_pos
+        self.__origin = board_pos[0][0]
+        self.__square_size = board_pos[1][0][0] - board_pos[0][0][0]
         self.__first_player = first_player
         self.__second_player = second_player
+        # The players indexed by colour code, so a piece's owner is found from its colour
+        self.__players = (first_player, second_player) if COLOUR_CODES[first_player.get_colour()] == WHITE else (second_player, first_player)
         self.__pieces_board = [ [None]*8 for i in range(8)]
+        self.__position = Position()
         self.__create_board()
+        self.__attack_counts = ([0] * 64, [0] * 64)
+        self.__attack_maps = [0, 0]
+        self.__piece_attacks = {}
+        self.__update_attacks(FULL_BOARD, 0)
         self.__potential_positions = []
+        self.__potential_index = {}
+        self.__history = []
+        self.__move_log = []
+        self.__dirty_squares = set()
 
     def __board_error_handling(self, board_pos, first_player, second_player):
         if(board_pos == None or len(board_pos) != 8 or len(board_pos[0]) != 8):
@@ -54,262 +78,239 @@ class Board():
         """
         return self.__board_pos
 
-    def __exchange_pawn_piece(self, piece):
+    def square_at(self, pixel_pos):
         """
-            When a pawn reaches the end of the board it is automatically exchanged for a queen.
+            Maps a pixel on the screen to the square under it.
 
             Parameters
             ----------
-                piece: Piece object
-                    The pawn that has arrived at the end of the board
+                pixel_pos: Integer coordinates
+                    Pixel coordinates on the screen, ex: the position of a mouse click
+
+            Returns
+            -------
+                None: If the pixel is outside the board
+                Integer coordinates: The index in the board array of the square under the pixel
         """
-        y_coord = piece.get_board_index()[1]
-        if piece.get_piece_type() == 'pawn' and (y_coord == 0 or y_coord == 7):
-            temp_button = piece.get_button()
-            temp_colour = piece.get_colour()
-            temp_index = piece.get_board_index()
-            player = self.__first_player if temp_colour == self.__first_player.get_colour() else self.__second_player
-            player.get_pieces().remove(piece)
-            piece = Queen(temp_colour, temp_index)
-            piece.set_button(temp_button)
-            piece.get_button().update_image(piece.get_image_path())
-            player.get_pieces().append(piece)
+        x_pos = (pixel_pos[0] - self.__origin[0]) // self.__square_size
+        y_pos = (pixel_pos[1] - self.__origin[1]) // self.__square_size
+        if 0 <= x_pos < 8 and 0 <= y_pos < 8:
+            return (x_pos, y_pos)
+        return None
 
-    def __check_square_for_player_piece(self, board_pos, piece, opposite_player):
+    def pop_dirty_squares(self):
         """
-            This method is called for determining potential squares a piece can move to for taking an opponent's piece. All pieces require an unbroken line to move, except the pawn and knight, so the check_squares_in_line method is called to ensure an unbroken line to the square.
-            Otherwise, the position is checked to see if it has an opponent's piece.
+            Returns the squares that changed since the last call and starts tracking afresh.
 
-            Parameters
-            ----------
-                board_pos:
-                    The coordinates of the board square to check for the opponent's piece
-                piece: Piece object
-                    The piece being used for potentially taking an opponent's piece
-                opposite_player: Player object
-                    The opposing player, to ensure the piece we're checking can be captured
             Returns
             -------
-                None: if there is no piece capable of being captured
-                Piece Object: If there is a piece which can be captured.
+                set of Integer coordinates: Indexes in the board array of the squares whose piece or highlight changed
         """
-        if piece.get_piece_type() != 'pawn' and piece.get_piece_type() != 'knight':
-            if not self.__check_squares_in_line(board_pos, piece, opposite_player):
-                return None
-        return self.__pieces_board[board_pos[0]][board_pos[1]] if self.__pieces_board[board_pos[0]][board_pos[1]] in opposite_player.get_pieces() else None
+        dirty_squares = self.__dirty_squares
+        self.__dirty_squares = set()
+        return dirty_squares
 
-    def __check_square_valid(self, board_pos, piece):
+    def get_position(self):
+        """
+            Returns
+            -------
+                Position object: The bitboard position kept in sync with the pieces on the board.
         """
-            This method checks a specific square is valid to be added to the potential moves a piece can make.
-            Moving a piece to valid square requires an unbroken line, one with no other pieces on it, to the square.
-            The exception is the knight which just requires the square be unnoccupied.
+        return self.__position
 
+    def position_key(self):
+        """
+            Returns
+            -------
+                integer: The 64-bit Zobrist key of the current position (pieces, castling rights, en passant file and colour to move), for spotting repeated or identical positions.
+        """
+        return self.__position.get_key()
+
+    def get_attack_map(self, colour):
+        """
             Parameters
             ----------
-                board_pos:
-                    The coordinates of the board square to check is a valid move
-                piece: Piece object
-                    The piece being used to move
+                colour: string
+                    'white' or 'black'
+
             Returns
             -------
-                False: If the square is occupied or unreachable
-                True: If the square is unnocccupied and the piece can move to it
+                bitboard: The squares the colour's pieces attack
         """
-        if piece.get_piece_type() != 'knight':
-            return self.__check_squares_in_line(board_pos, piece)
-        else:
-            return self.__pieces_board[board_pos[0]][board_pos[1]] == None
+        return self.__attack_maps[COLOUR_CODES[colour]]
 
-    def __check_squares_in_line_helper(self, x_coord, y_coord, pieces_to_take, players):
+    def attack_count(self, board_pos, colour):
         """
-            Helper method for checking the potential squares in a line out from the currently selected piece. 
-            Used to determine if the last square in the line to check contains an opposing piece that can be captured.
-            If the square contains an opposing piece, that piece is then added to our list of pieces that are capturable.
-
             Parameters
             ----------
-                x_coord: Integer
-                    x-position of the board array to check
-                y_coord: Integer
-                    y-position of the board array to check
-                pieces_to_take: Array of Piece Objects
-                    Array of pieces that are capturable
-                players: Player object
-                    Either none or the opposing player. (None when only checking for places to move, opposing player when looking for capturable pieces)
+                board_pos: Integer coordinates
+                    Index in the board array of a square
+                colour: string
+                    'white' or 'black'
+
+            Returns
+            -------
+                integer: The number of the colour's pieces attacking the square
+        """
+        return self.__attack_counts[COLOUR_CODES[colour]][square_index(board_pos)]
+
+    def is_attacked(self, board_pos, colour):
+        """
+            Returns
+            -------
+                boolean: True if any of the colour's pieces attack the square
+        """
+        return bool(self.__attack_maps[COLOUR_CODES[colour]] & (1 << square_index(board_pos)))
 
+    def in_check(self, colour):
+        """
             Returns
             -------
-                False: If the square is occupied, either by the current player's piece or we aren't currently looking for capturable pieces
-                True: If the square isn't occupied or is occupied by a capturable piece
+                boolean: True if the colour's king is attacked by the other colour
         """
-        if self.__pieces_board[x_coord][y_coord] and not(players != None and self.__pieces_board[x_coord][y_coord] in players.get_pieces()):
-            return False
-        elif players != None and self.__pieces_board[x_coord][y_coord] in players.get_pieces():
-            pieces_to_take.append(self.__pieces_board[x_coord][y_coord])
-        return True
+        colour_code = COLOUR_CODES[colour]
+        return bool(self.__position.get_pieces(colour_code, KING) & self.__attack_maps[colour_code ^ 1])
 
-    def __check_squares_in_line(self, board_pos, piece, players=None):
+    def __update_attacks(self, changed, occupied_before):
         """
-            Checks each potential square given to make sure it's valid (no other piece is blocking it from moving)
-            Apart from a couple exceptions, all the pieces move in a straight line that cannot jump over a piece, this checks the lines from the possible square to the piece to make sure it's valid
-            Also, this checks for capturable pieces (opponent's pieces) in the line. pieces_to_take is appended to include these pieces, but only returns true if there is one piece (otherwise it means we're jumping over a piece)
+            Updates the attack maps after the pieces on the changed squares moved, appeared or disappeared.
+            Only the pieces on those squares and the rooks, bishops and queens whose lines run through them (before or after the move) attack differently,
+            so only their attacks are worked out again, and the counts are adjusted by the squares they stopped or started attacking.
 
             Parameters
             ----------
-                board_pos: Integer coordinates
-                    Coordinates in the board array to check whether or not it is a valid potential move.
-                piece: Piece Object
-                    The current selected piece to move
-                players: Player object
-                    Either none or the opposing player. (None when only checking for places to move, opposing player when looking for capturable pieces)
+                changed: bitboard
+                    The squares whose occupant changed
+                occupied_before: bitboard
+                    The occupied squares before the change
+        """
+        position = self.__position
+        occupied = position.get_occupied()
+        diagonal = straight = 0
+        for colour in (WHITE, BLACK):
+            queens = position.get_pieces(colour, QUEEN)
+            diagonal |= position.get_pieces(colour, BISHOP) | queens
+            straight |= position.get_pieces(colour, ROOK) | queens
+        stale = changed
+        for square in squares(changed):
+            stale |= (bishop_attacks(square, occupied_before) | bishop_attacks(square, occupied)) & diagonal
+            stale |= (rook_attacks(square, occupied_before) | rook_attacks(square, occupied)) & straight
+        for square in squares(stale):
+            entry = self.__piece_attacks.pop(square, None)
+            if entry:
+                counts = self.__attack_counts[entry[0]]
+                for target in squares(entry[1]):
+                    counts[target] -= 1
+                    if not counts[target]:
+                        self.__attack_maps[entry[0]] &= ~(1 << target)
+            piece = position.piece_at(square)
+            if piece:
+                attacks = piece_attacks(piece[0], piece[1], square, occupied)
+                self.__piece_attacks[square] = (piece[0], attacks)
+                counts = self.__attack_counts[piece[0]]
+                for target in squares(attacks):
+                    counts[target] += 1
+                self.__attack_maps[piece[0]] |= attacks
+
+    def get_move_log(self):
+        """
+            Converts the moves played with make_move to SAN, starting from the first one not converted yet, on a copy of the position taken back to the move before it.
 
             Returns
             -------
-                False: If the square is occupied, either by the current player's piece or we aren't currently looking for capturable pieces
-                True: If the square isn't occupied or is occupied by a capturable piece
-        """
-        piece_x = piece.get_board_index()[0]
-        piece_y = piece.get_board_index()[1]
-        pieces_to_take = []
-        if(board_pos[0] == piece_x):
-            min_num = piece_y + 1 if piece_y < board_pos[1] else board_pos[1]
-            diff = abs(piece_y - board_pos[1])
-            for i in range(min_num, min_num + diff):
-                if not self.__check_squares_in_line_helper(piece_x, i, pieces_to_take, players):
-                    return False
-        elif(board_pos[1] == piece_y):
-            min_num = piece_x + 1 if piece_x < board_pos[0] else board_pos[0]
-            diff = abs(piece_x - board_pos[0])
-            for i in range(min_num, min_num + diff):
-                if not self.__check_squares_in_line_helper(i, piece_y, pieces_to_take, players):
-                    return False
-        elif board_pos[1] < piece_y and piece_x < board_pos[0]:
-            min_num = piece_x + 1 if piece_x < board_pos[0] else board_pos[0]
-            diff = abs(piece_x - board_pos[0])
-            j = piece_y - 1
-            for i in range(min_num, min_num + diff):
-                if self.__check_out_of_range((i, j)):
-                    continue
-                if not self.__check_squares_in_line_helper(i, j, pieces_to_take, players):
-                    return False
-                j -= 1
-        elif board_pos[1] > piece_y and piece_x > board_pos[0]:
-            min_num = piece_x + 1 if piece_x < board_pos[0] else board_pos[0]
-            diff = abs(piece_x - board_pos[0])
-            j = board_pos[1]
-            for i in range(min_num, min_num + diff):
-                if self.__check_out_of_range((i, j)):
-                    continue
-                if not self.__check_squares_in_line_helper(i, j, pieces_to_take, players):
-                    return False
-                j -= 1
-        elif board_pos[1] < piece_y and piece_x > board_pos[0]:
-            min_num = piece_x + 1 if piece_x < board_pos[0] else board_pos[0]
-            diff = abs(piece_x - board_pos[0])
-            j = board_pos[1]
-            for i in range(min_num, min_num + diff):
-                if self.__check_out_of_range((i, j)):
-                    continue
-                if not self.__check_squares_in_line_helper(i, j, pieces_to_take, players):
-                    return False
-                j += 1
-        else:
-            min_num = piece_x + 1 if piece_x < board_pos[0] else board_pos[0]
-            diff = abs(piece_x - board_pos[0])
-            j = piece_y + 1
-            for i in range(min_num, min_num + diff):
-                if self.__check_out_of_range((i, j)):
-                    continue
-                if not self.__check_squares_in_line_helper(i, j, pieces_to_take, players):
-                    return False
-                j += 1
-        if len(pieces_to_take) > 1:
-            return False
-        return True
-
-    def __check_out_of_range(self, board_pos):
-        """
-            Checks the potential square on the board to make sure it's within the board's boundaries.
+                array of strings: The moves played with make_move (and not taken back) in SAN, oldest first, ex: ['e4', 'e5', 'Nf3']
+        """
+        moves = self.__position.get_move_list()
+        if len(self.__move_log) < len(moves):
+            position = self.__position.copy()
+            for i in range(len(moves) - len(self.__move_log)):
+                position.unmake_move()
+            for move in moves[len(self.__move_log):]:
+                self.__move_log.append(move_to_san(position, move))
+                position.make_move(move)
+        return self.__move_log
+
+    def to_fen(self):
+        """
+            Returns
+            -------
+                string: The FEN string of the current position (pieces, colour to move, castling rights, en passant square and move counters), see fen.py
+        """
+        return position_to_fen(self.__position)
+
+    def __exchange_pawn_piece(self, piece, p_type='queen'):
+        """
+            When a pawn reaches the end of the board it is exchanged for another piece, a queen unless another piece type is asked for.
 
             Parameters
             ----------
-                board_pos: Integer coordinates
-                    Coordinates in the board array to check whether or not it is a valid potential move.
+                piece: Piece object
+                    The pawn that has arrived at the end of the board
+                p_type: string
+                    The piece type to exchange the pawn for
 
             Returns
             -------
-                False: If the square is outside the board.
-                True: If the square is part of the board.
+                Piece object: The piece that replaced the pawn, or the piece passed in if it wasn't exchanged.
+        """
+        y_coord = piece.get_board_index()[1]
+        if piece.get_type_code() == PAWN and (y_coord == 0 or y_coord == 7):
+            temp_button = piece.get_button()
+            temp_colour = piece.get_colour()
+            temp_index = piece.get_board_index()
+            pawn = piece
+            piece = PieceFactory().create_piece(p_type, temp_colour, temp_index[0], temp_index[1])
+            piece.set_button(temp_button)
+            if temp_button:
+                temp_button.update_image(piece.get_image_path())
+            self.__get_owner(pawn).replace_piece(pawn, piece)
+        return piece
+
+    def __add_positions_helper(self, piece, bitboard, capture):
+        """
+            Helper method for turning a bitboard of target squares into entries of the potential_positions array.
+
+            Parameters
+            ----------
+                piece: Piece Object
+                    The selected piece
+                bitboard: integer
+                    Bitboard of the squares the selected piece can move to
+                capture: boolean
+                    Whether the squares hold opposing pieces which are captured by the move
         """
-        x_pos = board_pos[0]
-        y_pos = board_pos[1]
-        return x_pos > 7 or x_pos < 0 or y_pos > 7 or y_pos < 0
+        for square in squares(bitboard):
+            board_pos = board_index(square)
+            self.__dirty_squares.add(board_pos)
+            position = {
+                "Index": board_pos,
+                "Button": self.__create_button(board_pos, 'Images/selected.png'),
+                "Piece": self.__captured_piece(piece, board_pos) if capture else None
+            }
+            self.__potential_positions.append(position)
+            self.__potential_index[board_pos] = position
 
     def add_potential_positions(self, piece):
         """
-            Once a piece is selected to move, this method loops through the potential moves that each piece has and validates which of them are legal moves given the current board's setup.
-            The pieces are responsable for knowing how they move, the board validates whether those moves are out of range or if another piece is blocking the way
-            All valid moves are appended to the potential_positions array, displaying them to the user as clickable choices.
+            Once a piece is selected to move, this method asks the bitboard position for every square the piece can move to and appends them to the potential_positions array, displaying them to the user as clickable choices.
+            The pieces are responsable for knowing how they move, the position's precomputed attack tables encode those moves per square so blocking pieces and the board's edges are handled with a few bitwise operations.
+            Only legal moves are offered: squares that would leave the player's own king in check (see Position.generate_legal_moves) are left out.
+            Quiet moves are added first, then captures and finally castling.
 
             Parameters
             ----------
                 piece: Piece Object
                     The current selected piece to move
         """
-        for board_pos in piece.get_possible_moves():
-            if self.__check_out_of_range(board_pos):
-                continue
-            if not self.__check_square_valid(board_pos, piece):
-                continue
-            pos = self.__board_pos[board_pos[0]][board_pos[1]]
-            self.__potential_positions.append({
-                "Index": board_pos,
-                "Button": Button(pos[0], pos[1], 'Images/selected.png'),
-                "Piece": None
-            })
-        opposite_player = self.__first_player if self.__second_player.get_colour() == piece.get_colour() else self.__second_player
-        for board_pos in piece.get_possible_attack_moves():
-            if self.__check_out_of_range(board_pos):
-                continue
-            pos = self.__board_pos[board_pos[0]][board_pos[1]]
-            if(attack_piece := self.__check_square_for_player_piece(board_pos, piece, opposite_player)):
-                self.__potential_positions.append({
-                    "Index": board_pos,
-                    "Button": Button(pos[0], pos[1], 'Images/selected.png'),
-                    "Piece": attack_piece
-                })
-        # Calculating if castling is possible as a potential move
-        if piece.get_piece_type() == "king" and not piece.has_moved():
-            board_positions = []
-            if piece.get_colour() == 'black':
-                pos_to_add = (piece.get_board_index()[0]+3, piece.get_board_index()[1])
-                if self.__pieces_board[pos_to_add[0]+1][pos_to_add[1]] is not None and not self.__pieces_board[pos_to_add[0]+1][pos_to_add[1]].has_moved():
-                    board_positions.append(pos_to_add)
-                pos_to_add = (piece.get_board_index()[0]-2, piece.get_board_index()[1])
-                if self.__pieces_board[pos_to_add[0]-1][pos_to_add[1]] is not None and not self.__pieces_board[pos_to_add[0]-1][pos_to_add[1]].has_moved():
-                    board_positions.append(pos_to_add)
-            else:
-                pos_to_add = (piece.get_board_index()[0]+2, piece.get_board_index()[1])
-                if self.__pieces_board[pos_to_add[0]+1][pos_to_add[1]] is not None and not self.__pieces_board[pos_to_add[0]+1][pos_to_add[1]].has_moved():
-                    board_positions.append(pos_to_add)
-                pos_to_add = (piece.get_board_index()[0]-3, piece.get_board_index()[1])
-                if self.__pieces_board[pos_to_add[0]-1][pos_to_add[1]] is not None and not self.__pieces_board[pos_to_add[0]-1][pos_to_add[1]].has_moved():
-                    board_positions.append(pos_to_add)
-            for board_pos in board_positions:
-                if self.__check_out_of_range(board_pos):
-                    continue
-                if not self.__check_square_valid(board_pos, piece):
-                    continue
-                if board_pos[0] - piece.get_board_index()[0] < -2:
-                    board_pos = (board_pos[0]+1, board_pos[1])
-                elif board_pos[0] - piece.get_board_index()[0] > 2:
-                    board_pos = (board_pos[0]-1, board_pos[1])
-                pos = self.__board_pos[board_pos[0]][board_pos[1]]
-                self.__potential_positions.append({
-                    "Index": board_pos,
-                    "Button": Button(pos[0], pos[1], 'Images/selected.png'),
-                    "Piece": None
-                })
+        square = square_index(piece.get_board_index())
+        quiet, captures, castling = self.__position.get_piece_moves(square)
+        legal = 0
+        for move in self.__position.generate_legal_moves(piece.get_colour_code()):
+            if move & 63 == square:
+                legal |= 1 << ((move >> 6) & 63)
+        self.__add_positions_helper(piece, quiet & legal, False)
+        self.__add_positions_helper(piece, captures & legal, True)
+        self.__add_positions_helper(piece, castling & legal, False)
 
     def get_potential_positions(self):
         """
@@ -319,11 +320,50 @@ class Board():
         """
         return self.__potential_positions
 
+    def get_potential_position(self, board_pos):
+        """
+            Parameters
+            ----------
+                board_pos: Integer coordinates
+                    Index in the board array of a square
+
+            Returns
+            -------
+                None: If the square isn't one of the potential positions
+                JSON object: The potential position on the square
+        """
+        return self.__potential_index.get(board_pos)
+
     def clear_potential_positions(self):
         """
             Clears the potential_positions array. This stops the display on the board of potential moves so we can display a new set or move to a new turn.
         """
+        for position in self.__potential_positions:
+            self.__dirty_squares.add(position['Index'])
         self.__potential_positions = []
+        self.__potential_index = {}
+
+    def __create_button(self, board_pos, image_path):
+        """
+            Creates a Button object displaying an image on a board square. pygame is only imported here, so headless boards never load it.
+
+            Parameters
+            ----------
+                board_pos: Integer coordinates
+                    Index in the board array of the square to place the button on
+                image_path: string
+                    Path for the image to display
+
+            Returns
+            -------
+                None: If the board is headless
+                Button Object: The button placed over the square
+        """
+        if self.__headless:
+            return None
+        from Classes.button import Button
+        pos = self.__board_pos[board_pos[0]][board_pos[1]]
+        return Button(pos[0], pos[1], image_path)
 
     def __create_board_helper(self, piece):
         """
@@ -336,8 +376,8 @@ class Board():
         """
         piece_loc = piece.get_board_index()
         self.__pieces_board[piece_loc[0]][piece_loc[1]] = piece
-        pos = self.__board_pos[piece_loc[0]][piece_loc[1]]
-        piece.set_button(Button(pos[0], pos[1], piece.get_image_path()))
+        self.__position.add_piece(piece.get_colour_code(), piece.get_type_code(), square_index(piece_loc), piece.has_moved())
+        piece.set_button(self.__create_button(piece_loc, piece.get_image_path()))
 
     def move_piece(self, piece, new_board_pos):
         """
@@ -355,12 +395,131 @@ class Board():
             raise ValueError("Values are not correct for moving a piece. piece: {} coords: {}".format(piece, new_board_pos))
         
         old_pos = piece.get_board_index()
-        self.__pieces_board[old_pos[0]][old_pos[1]] = None
+        occupied_before = self.__position.get_occupied()
+        self.__clear_square(old_pos)
+        self.__position.move_piece(square_index(old_pos), square_index(new_board_pos))
         piece.move((new_board_pos))
-        self.__exchange_pawn_piece(piece)
-        pos = self.__board_pos[new_board_pos[0]][new_board_pos[1]]
-        piece.get_button().move(pos[0], pos[1])
-        self.__pieces_board[new_board_pos[0]][new_board_pos[1]] = piece
+        exchanged_piece = self.__exchange_pawn_piece(piece)
+        if exchanged_piece is not piece:
+            self.__position.promote(square_index(new_board_pos), QUEEN)
+            piece = exchanged_piece
+        self.__place_piece(piece, new_board_pos)
+        self.__update_attacks((1 << square_index(old_pos)) | (1 << square_index(new_board_pos)), occupied_before)
+
+    def __captured_piece(self, piece, new_board_pos):
+        """
+            Finds the piece captured by moving a piece to a square. That's the piece on the square, except for a pawn capturing en passant, which takes the pawn beside it.
+
+            Returns
+            -------
+                None: If the move doesn't capture
+                Piece Object: The captured piece
+        """
+        if piece.get_type_code() == PAWN and square_index(new_board_pos) == self.__position.get_en_passant():
+            return self.__pieces_board[new_board_pos[0]][piece.get_board_index()[1]]
+        return self.__pieces_board[new_board_pos[0]][new_board_pos[1]]
+
+    def __get_owner(self, piece):
+        """
+            Returns
+            -------
+                Player object: The player whose colour matches the piece
+        """
+        return self.__players[piece.get_colour_code()]
+
+    def __clear_square(self, board_pos):
+        """
+            Empties a square of the board array.
+        """
+        self.__pieces_board[board_pos[0]][board_pos[1]] = None
+        self.__dirty_squares.add(board_pos)
+
+    def __place_piece(self, piece, board_pos):
+        """
+            Puts a piece on a square of the board array and moves its button (if it has one) to match.
+        """
+        self.__pieces_board[board_pos[0]][board_pos[1]] = piece
+        self.__dirty_squares.add(board_pos)
+        if piece.get_button():
+            pos = self.__board_pos[board_pos[0]][board_pos[1]]
+            piece.get_button().move(pos[0], pos[1])
+
+    def make_move(self, piece, new_board_pos, promotion='queen'):
+        """
+            Plays a complete move for a piece: captures the opposing piece on the new square (or the pawn passed by an en passant capture), moves the rook along with a castling king and exchanges a pawn reaching the end of the board (for a queen unless told otherwise).
+            Unlike move_piece the move can be taken back with unmake_move. Each move pushes a compact undo record onto the board's history:
+            (piece, old board position, piece's moved flag, captured piece, piece exchanged for the pawn, (castling rook, rook's moved flag)).
+
+            Parameters
+            ----------
+                piece: Piece Object
+                    The piece to move
+                new_board_pos: Integer coordinates
+                    Coordinates cooresponding to the index in the 2D board array
+                promotion: string
+                    The piece type a pawn reaching the end of the board is exchanged for
+
+            Returns
+            -------
+                None: If nothing was captured
+                Piece Object: The captured piece
+        """
+        old_pos = piece.get_board_index()
+        moved = piece.has_moved()
+        captured = self.__captured_piece(piece, new_board_pos)
+        exchange = piece.get_type_code() == PAWN and (new_board_pos[1] == 0 or new_board_pos[1] == 7)
+        move = encode_move(square_index(old_pos), square_index(new_board_pos), PIECE_CODES[promotion] if exchange else 0)
+        occupied_before = self.__position.get_occupied()
+        self.__position.make_move(move)
+        self.__update_attacks((occupied_before ^ self.__position.get_occupied()) | (1 << square_index(new_board_pos)), occupied_before)
+        castling = None
+        if piece.get_type_code() == KING and abs(new_board_pos[0] - old_pos[0]) == 2:
+            rook = self.__pieces_board[0 if new_board_pos[0] < old_pos[0] else 7][old_pos[1]]
+            castling = (rook, rook.has_moved())
+            self.__clear_square((rook.get_board_index()[0], old_pos[1]))
+            rook.move(((old_pos[0] + new_board_pos[0]) // 2, old_pos[1]))
+            self.__place_piece(rook, rook.get_board_index())
+        if captured:
+            self.__get_owner(captured).remove_piece(captured)
+            self.__clear_square(captured.get_board_index())
+        self.__clear_square(old_pos)
+        piece.move(new_board_pos)
+        exchanged_piece = self.__exchange_pawn_piece(piece, promotion) if exchange else None
+        self.__place_piece(exchanged_piece or piece, new_board_pos)
+        self.__history.append((piece, old_pos, moved, captured, exchanged_piece, castling))
+        return captured
+
+    def unmake_move(self):
+        """
+            Takes back the last move played with make_move, putting back any captured piece, the castling rook and the pawn that was exchanged for another piece.
+
+            Returns
+            -------
+                Piece Object: The piece that was moved back
+        """
+        piece, old_pos, moved, captured, exchanged_piece, castling = self.__history.pop()
+        occupied_before = self.__position.get_occupied()
+        self.__position.unmake_move()
+        self.__update_attacks((occupied_before ^ self.__position.get_occupied()) | (1 << square_index(piece.get_board_index())), occupied_before)
+        del self.__move_log[len(self.__history):]
+        new_board_pos = piece.get_board_index()
+        if exchanged_piece:
+            self.__get_owner(piece).replace_piece(exchanged_piece, piece)
+            if piece.get_button():
+                piece.get_button().update_image(piece.get_image_path())
+        self.__clear_square(new_board_pos)
+        piece.restore(old_pos, moved)
+        self.__place_piece(piece, old_pos)
+        if captured:
+            self.__get_owner(captured).add_piece(captured)
+            self.__place_piece(captured, captured.get_board_index())
+        if castling:
+            rook, rook_moved = castling
+            rook_pos = rook.get_board_index()
+            self.__clear_square(rook_pos)
+            rook.restore((0 if new_board_pos[0] < old_pos[0] else 7, old_pos[1]), rook_moved)
+            self.__place_piece(rook, rook.get_board_index())
+        return piece
 
     def __create_board(self):
         """
@@ -0,0 +1,200 @@
+from Classes.fen import position_from_fen
+from Classes.notation import san_to_move
+from Classes.pgn import DEFAULT_FEN, read_games
+
+import bisect
+import mmap
+import os
+import random
+import struct
+
+"""
+    Opening books: the moves played from each position of a collection of PGN games, for playing the opening without searching.
+
+    A book file is a sorted array of fixed size big-endian entries:
+        key (8 bytes): Zobrist key of the position (see zobrist.py, the keys are the same in every process)
+        move (2 bytes): encoded move (see position.encode_move)
+        weight (2 bytes): number of games the move was played in, capped at 65535
+    Entries are sorted by key, and by weight (highest first) for the same key, so a position's moves are found by binary search.
+    The file is memory mapped read-only rather than loaded, so opening it costs nothing and every process reading the same book
+    shares one copy of it in the operating system's page cache.
+
+    Positions are keyed exactly as they are, so a book only helps from the positions its games went through. Games without a FEN tag
+    start from the usual chess layout (pgn.DEFAULT_FEN), but this game starts with the kings and queens swapped on black's side
+    (fen.START_FEN), so the positions of ordinary PGN archives never come up in it. build_book counts those games so they can be warned about;
+    books for this game are compiled from its own games (Game.to_pgn and tournament.py write a FEN tag with START_FEN).
+"""
+
+ENTRY = struct.Struct('>QHH')
+MAX_WEIGHT = 0xFFFF
+
+def build_book(pgn_paths, book_path, max_plies=20, min_weight=1):
+    """
+        Compiles PGN games into a book file. Games are replayed through the rules (see pgn.replay_game) and a game stops counting at its first invalid move.
+
+        Parameters
+        ----------
+            pgn_paths: array of strings
+                PGN files to read, they are streamed so they can be any size
+            book_path: string
+                File to write the book to, replaced once it has been written completely
+            max_plies: integer
+                Number of half moves of each game to add to the book
+            min_weight: integer
+                Moves played in fewer games than this are left out
+
+        Returns
+        -------
+            JSON object
+                Number of "Games" read, book "Entries" written and "Positions" they cover, and the number of games starting from the
+                usual chess layout ("Standard"), whose positions this game never reaches
+    """
+    if max_plies < 1 or min_weight < 1:
+        raise ValueError("The book needs at least one ply and a positive weight. max_plies: {} min_weight: {}".format(max_plies, min_weight))
+    weights = {}
+    games = standard = 0
+    standard_key = position_from_fen(DEFAULT_FEN).get_key()
+    for path in pgn_paths:
+        with open(path, encoding='utf-8', errors='replace') as stream:
+            for game in read_games(stream):
+                games += 1
+                if _add_game(weights, game, max_plies) == standard_key:
+                    standard += 1
+    entries = sorted(((key, -weight, move) for (key, move), weight in weights.items() if weight >= min_weight))
+    temporary_path = book_path + '.tmp'
+    with open(temporary_path, 'wb') as stream:
+        for key, weight, move in entries:
+            stream.write(ENTRY.pack(key, move, min(-weight, MAX_WEIGHT)))
+    os.replace(temporary_path, book_path)
+    return {"Games": games, "Entries": len(entries), "Positions": len(set(entry[0] for entry in entries)), "Standard": standard}
+
+def _add_game(weights, game, max_plies):
+    """
+        Counts the moves of a game's opening in weights, keyed by (position key, move).
+
+        Returns
+        -------
+            None: If the game's FEN tag is invalid
+            integer: The key of the game's starting position
+    """
+    try:
+        position = position_from_fen(game["Tags"].get('FEN', DEFAULT_FEN))
+    except ValueError:
+        return None
+    start_key = position.get_key()
+    for san in game["Moves"][:max_plies]:
+        try:
+            move = san_to_move(position, san)
+        except ValueError:
+            break
+        entry = (position.get_key(), move)
+        weights[entry] = weights.get(entry, 0) + 1
+        position.make_move(move)
+    return start_key
+
+class OpeningBook():
+    """
+        Class for reading a book file (see build_book) through a read-only memory map. Nothing is read until a position is looked up,
+        and each lookup is a binary search over the entries' keys, read straight out of the map.
+    """
+    def __init__(self, path, seed=None):
+        """
+            Initialize the OpeningBook object
+
+            Parameters
+            ----------
+                path: string
+                    The book file
+                seed: integer
+                    Seed for picking between a position's moves, the same seed picks the same moves
+        """
+        size = os.path.getsize(path)
+        if size % ENTRY.size:
+            raise ValueError("Book files are made of {} byte entries, {} is {} bytes".format(ENTRY.size, path, size))
+        self.__path = path
+        self.__seed = seed
+        self.__count = size // ENTRY.size
+        self.__map = None
+        if self.__count:
+            with open(path, 'rb') as stream:
+                self.__map = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+        self.__random = random.Random(seed)
+
+    def __len__(self):
+        return self.__count
+
+    def __getstate__(self):
+        """
+            Sending the book to another process only sends its path and seed, the other process maps the same file.
+        """
+        return {"Path": self.__path, "Seed": self.__seed}
+
+    def __setstate__(self, state):
+        self.__init__(state["Path"], state["Seed"])
+
+    def __key_at(self, index):
+        return ENTRY.unpack_from(self.__map, index * ENTRY.size)[0]
+
+    def get_path(self):
+        """
+            Returns
+            -------
+                string: The book file
+        """
+        return self.__path
+
+    def get_moves(self, position):
+        """
+            Finds the book moves of a position.
+
+            Parameters
+            ----------
+                position: Position object
+                    The position to look up
+
+            Returns
+            -------
+                array of (integer, integer)
+                    The encoded moves and their weights, highest weight first, empty if the position isn't in the book
+        """
+        if not self.__count:
+            return []
+        key = position.get_key()
+        index = bisect.bisect_left(range(self.__count), key, key=self.__key_at)
+        moves = []
+        while index < self.__count:
+            entry_key, move, weight = ENTRY.unpack_from(self.__map, index * ENTRY.size)
+            if entry_key != key:
+                break
+            moves.append((move, weight))
+            index += 1
+        return moves
+
+    def choose_move(self, position):
+        """
+            Picks one of a position's book moves at random, in proportion to how often it was played.
+            Moves that aren't legal in the position (a different position with the same key) are skipped.
+
+            Parameters
+            ----------
+                position: Position object
+                    The position to play a move in
+
+            Returns
+            -------
+                None: If the position isn't in the book
+                integer: The encoded move
+        """
+        moves = [(move, weight) for move, weight in self.get_moves(position) if position.is_legal(move)]
+        if not moves:
+            return None
+        return self.__random.choices([move for move, weight in moves], [weight for move, weight in moves])[0]
+
+    def close(self):
+        """
+            Unmaps the book file.
+        """
+        if self.__map:
+            self.__map.close()
+            self.__map = None
+            self.__count = 0
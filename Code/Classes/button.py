@@ -1,9 +1,11 @@
 import pygame
-import os
+
+from Classes.assets import load_image
 
 class Button():
     """
         Class for abstracting away making objects clickable and loading images.
+        Images come from the shared asset cache, so creating a button doesn't read from disk once its image has been loaded.
     """
     def __init__(self, x_pos, y_pos, image_path=None):
         """
@@ -23,7 +25,7 @@ class Button():
         if image_path == None:
             self.__rect = pygame.Rect((x_pos, y_pos), (200, 100))
         else:
-            self.__image = pygame.image.load(os.path.join('./', image_path))
+            self.__image = load_image(image_path)
             self.__rect = self.__image.get_rect()
             self.__rect.topleft = (x_pos, y_pos)
         self.__clicked = False
@@ -31,8 +33,6 @@ class Button():
     def __button_error_handling(self, x_pos, y_pos, image_path):
         if x_pos == None or y_pos == None or x_pos < 0 or x_pos > 690 or y_pos < 0 or y_pos > 690:
             raise ValueError("Button coordinates outside the screen: ({},{})".format(x_pos, y_pos))
-        if(image_path != None and not os.path.isfile(image_path)):
-                raise ValueError("Image can't be found: {}".format(image_path))
 
     def move(self, x_pos, y_pos):
         """
@@ -57,10 +57,7 @@ class Button():
                 image_path: string
                     The path for the new image to use
         """
-        if(image_path == None or not os.path.isfile(image_path)):
-            raise ValueError("Image can't be found: {}".format(image_path))
-        
-        self.__image = pygame.image.load(os.path.join('./', image_path))
+        self.__image = load_image(image_path)
 
     def draw(self, screen):
         """
@@ -73,6 +70,17 @@ class Button():
         """
         screen.blit(self.__image, self.__rect.topleft)
 
+    def collides(self, pixel_pos):
+        """
+            Checks whether a pixel, ex: the position of a mouse click event, is within the button's boundaries.
+
+            Returns
+            -------
+                boolean
+                    True if the pixel is on the button, otherwise False
+        """
+        return bool(self.__rect.collidepoint(pixel_pos))
+
     def click(self):
         """
             Register a click within the button's boundaries. 
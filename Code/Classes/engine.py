@@ -0,0 +1,349 @@
+from Classes.bitboard import *
+from Classes.evaluation import evaluate
+from Classes.transposition import *
+
+import time
+
+"""
+    Computer opponent. Searches a Position with negamax alpha-beta and iterative deepening, stopping when its time budget runs out.
+"""
+
+MATE_SCORE = 100000
+INFINITY = 1000000
+
+class _SearchTimeout(Exception):
+    """
+        Raised inside the search when the time budget runs out, unwinding back to the root.
+    """
+    pass
+
+class Engine():
+    """
+        Class for the computer player's search.
+        Each search deepens one ply at a time (searching the best move of the previous depth first) until the time budget or the maximum depth is reached, and plays the best move of the deepest finished search.
+        Only legal moves are searched (see Position.generate_legal_moves): a position without any scores as mated when in check and as a draw otherwise (stalemate).
+        Captures are searched past the nominal depth (quiescence search) so the score isn't taken in the middle of an exchange.
+        Results are cached in a transposition table kept between searches, so positions reached by different move orders (or searched for the previous move) aren't searched again.
+        With an opening book, positions in the book are played from it without searching.
+        With a tablebase, positions in it score their exact result without being searched any further, and a root position in it plays the table's best move straight away.
+    """
+    def __init__(self, time_limit=1.0, max_depth=32, hash_mb=16, table=None, book=None, tablebase=None):
+        """
+            Initialize the Engine object
+
+            Parameters
+            ----------
+                time_limit: float
+                    Seconds the engine may think about each move
+                max_depth: integer
+                    Deepest search to run, in plies
+                hash_mb: float
+                    Memory for the transposition table in megabytes
+                table: TranspositionTable object
+                    Table to use instead of creating one (for sharing a table between engines), hash_mb is then ignored
+                book: OpeningBook object
+                    Book to play the opening from
+                tablebase: Tablebase object
+                    Endgame tables to score small endings with
+        """
+        if time_limit <= 0 or max_depth < 1:
+            raise ValueError("The engine needs a positive time limit and depth. time_limit: {} max_depth: {}".format(time_limit, max_depth))
+        self.__time_limit = time_limit
+        self.__max_depth = max_depth
+        self.__table = table if table is not None else TranspositionTable(hash_mb)
+        self.__book = book
+        self.__tablebase = tablebase
+        self.__deadline = 0
+        self.__nodes = 0
+        self.__depth = 0
+        self.__score = 0
+        self.__best_move = None
+        # Two killer moves per ply: quiet moves that caused a cutoff at that distance from the root
+        self.__killers = []
+
+    def get_table(self):
+        """
+            Returns
+            -------
+                TranspositionTable object: The engine's transposition table
+        """
+        return self.__table
+
+    def get_nodes(self):
+        """
+            Returns
+            -------
+                integer: Number of positions visited by the last search
+        """
+        return self.__nodes
+
+    def get_depth(self):
+        """
+            Returns
+            -------
+                integer: Deepest search the last search finished
+        """
+        return self.__depth
+
+    def get_score(self):
+        """
+            Returns
+            -------
+                integer: Score of the last search's best move in centipawns, from the point of view of the side that moved
+        """
+        return self.__score
+
+    def search(self, position, start_depth=1):
+        """
+            Finds the best move for the colour to move. The position is searched with make_move/unmake_move and is left as it was.
+            A book or tablebase move is played straight away, without searching (the depth searched is then 0).
+
+            Parameters
+            ----------
+                position: Position object
+                    The position to search
+                start_depth: integer
+                    Depth to start deepening from, parallel helper searches start deeper so they don't all repeat the same work
+
+            Returns
+            -------
+                None: If there is no move to play
+                integer: The best encoded move found
+        """
+        self.__deadline = time.perf_counter() + self.__time_limit
+        self.__nodes = 0
+        self.__depth = 0
+        self.__score = 0
+        self.__best_move = None
+        self.__killers = [[0, 0] for ply in range(self.__max_depth + 1)]
+        if self.__book:
+            best_move = self.__book.choose_move(position)
+            if best_move is not None:
+                return best_move
+        if self.__tablebase:
+            best_move = self.__tablebase_move(position)
+            if best_move is not None:
+                return best_move
+        best_move = None
+        for depth in range(min(start_depth, self.__max_depth), self.__max_depth + 1):
+            try:
+                score = self.__negamax(position, depth, -INFINITY, INFINITY, 0, best_move)
+            except _SearchTimeout:
+                break
+            best_move = self.__best_move
+            self.__depth = depth
+            self.__score = score
+            # A mate has been found, searching deeper can't change the result
+            if abs(score) >= MATE_SCORE - self.__max_depth:
+                break
+        if best_move is None:
+            # Not even the first depth finished, fall back to whatever the search had looked at
+            best_move = self.__best_move
+            if best_move is None and position.get_pieces(position.get_turn(), KING):
+                best_move = next(position.generate_staged_moves(), None)
+        return best_move
+
+    def __tablebase_move(self, position):
+        """
+            Picks the best move of a position in the tablebase by probing the position after each move: the quickest win, else a draw, else the slowest loss.
+
+            Returns
+            -------
+                None: If the position or one of the positions after its moves isn't in the tablebase
+                integer: The encoded move
+        """
+        if self.__tablebase.probe(position) is None:
+            return None
+        best_move = None
+        best_score = -INFINITY
+        for move in position.generate_legal_moves():
+            position.make_move(move)
+            try:
+                entry = self.__tablebase.probe(position)
+            finally:
+                position.unmake_move()
+            if entry is None:
+                return None
+            score = -self.__tablebase_score(entry, 1)
+            if score > best_score:
+                best_score = score
+                best_move = move
+        self.__score = best_score
+        return best_move
+
+    def __tablebase_score(self, entry, ply):
+        """
+            Turns a tablebase result into a search score, mates counting their half moves from the root like the search's own.
+        """
+        result, plies = entry
+        if result > 0:
+            return MATE_SCORE - ply - plies
+        if result < 0:
+            return ply + plies - MATE_SCORE
+        return 0
+
+    def __check_time(self):
+        """
+            Raises _SearchTimeout once the deadline has passed. Only checked every 1024 nodes since reading the clock is comparatively slow.
+        """
+        if not self.__nodes & 1023 and time.perf_counter() > self.__deadline:
+            raise _SearchTimeout()
+
+    def __score_to_table(self, score, ply):
+        """
+            Mate scores count plies from the root, but a table entry can be reached at any ply, so they are stored as plies from the entry's position instead.
+        """
+        if score >= MATE_SCORE - 1000:
+            return score + ply
+        if score <= 1000 - MATE_SCORE:
+            return score - ply
+        return score
+
+    def __score_from_table(self, score, ply):
+        """
+            Turns a mate score from the table back into plies from the root (the reverse of __score_to_table).
+        """
+        if score >= MATE_SCORE - 1000:
+            return score - ply
+        if score <= 1000 - MATE_SCORE:
+            return score + ply
+        return score
+
+    def __negamax(self, position, depth, alpha, beta, ply, first_move=None):
+        """
+            Alpha-beta search in negamax form: every score is from the point of view of the colour to move, so a child's score is negated.
+            A table entry searched at least as deep ends the search of the position when its bound allows, otherwise its best move is searched first. The result is stored with the kind of bound it is.
+            Moves come from the position's staged generator (hash move, captures, killers, quiet moves), so after a cutoff the moves that weren't reached are never generated.
+
+            Parameters
+            ----------
+                position: Position object
+                    The position to search
+                depth: integer
+                    Plies left to search before the quiescence search
+                alpha: integer
+                    Score the colour to move is already guaranteed
+                beta: integer
+                    Score the opponent is already guaranteed, anything at or above it is cut off
+                ply: integer
+                    Distance from the root, so nearer mates score higher
+                first_move: integer
+                    Move to search first
+
+            Returns
+            -------
+                integer
+                    The position's score
+        """
+        self.__nodes += 1
+        self.__check_time()
+        colour = position.get_turn()
+        if not position.get_pieces(colour, KING):
+            return ply - MATE_SCORE
+        if self.__tablebase and ply > 0 and bin(position.get_occupied()).count('1') <= self.__tablebase.get_max_pieces():
+            entry = self.__tablebase.probe(position)
+            if entry is not None:
+                return self.__tablebase_score(entry, ply)
+        if depth <= 0:
+            return self.__quiescence(position, alpha, beta, ply)
+        key = position.get_key()
+        entry = self.__table.probe(key)
+        if entry:
+            entry_depth, bound, score, table_move = entry
+            if ply > 0 and entry_depth >= depth:
+                score = self.__score_from_table(score, ply)
+                if bound == EXACT or (bound == LOWER_BOUND and score >= beta) or (bound == UPPER_BOUND and score <= alpha):
+                    return score
+            if first_move is None and table_move:
+                first_move = table_move
+        original_alpha = alpha
+        enemy_king = position.get_pieces(colour ^ 1, KING)
+        killers = self.__killers[ply]
+        best_score = -INFINITY
+        best_move = 0
+        for move in position.generate_staged_moves(first_move or 0, killers):
+            if (1 << ((move >> 6) & 63)) & enemy_king:
+                if ply == 0:
+                    self.__best_move = move
+                return MATE_SCORE - ply - 1
+            position.make_move(move)
+            try:
+                score = -self.__negamax(position, depth - 1, -beta, -alpha, ply + 1)
+            finally:
+                position.unmake_move()
+            if score > best_score:
+                best_score = score
+                best_move = move
+                if ply == 0:
+                    self.__best_move = move
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        if not move >> 12 and not position.piece_at((move >> 6) & 63) and move != killers[0]:
+                            killers[1] = killers[0]
+                            killers[0] = move
+                        break
+        if not best_move:
+            # No legal moves: checkmate, or stalemate which is a draw
+            return ply - MATE_SCORE if position.in_check(colour) else 0
+        if best_score <= original_alpha:
+            bound = UPPER_BOUND
+        elif best_score >= beta:
+            bound = LOWER_BOUND
+        else:
+            bound = EXACT
+        self.__table.store(key, depth, bound, self.__score_to_table(best_score, ply), best_move)
+        return best_score
+
+    def __quiescence(self, position, alpha, beta, ply):
+        """
+            Searches only captures until the position is quiet. The colour to move can also decline to capture, so the static evaluation is a lower bound on the score (stand pat).
+            In check there is no standing pat, so all the moves out of check are searched instead.
+
+            Parameters
+            ----------
+                position: Position object
+                    The position to search
+                alpha: integer
+                    Score the colour to move is already guaranteed
+                beta: integer
+                    Score the opponent is already guaranteed
+                ply: integer
+                    Distance from the root
+
+            Returns
+            -------
+                integer
+                    The position's score
+        """
+        self.__nodes += 1
+        self.__check_time()
+        colour = position.get_turn()
+        if not position.get_pieces(colour, KING):
+            return ply - MATE_SCORE
+        in_check = position.in_check(colour)
+        if not in_check:
+            stand_pat = evaluate(position)
+            if stand_pat >= beta:
+                return stand_pat
+            if stand_pat > alpha:
+                alpha = stand_pat
+        enemy_king = position.get_pieces(colour ^ 1, KING)
+        searched = False
+        # Standing pat isn't an option in check, every way out of it is searched (and having none is checkmate)
+        for move in position.generate_staged_moves(quiets=in_check):
+            searched = True
+            if (1 << ((move >> 6) & 63)) & enemy_king:
+                return MATE_SCORE - ply - 1
+            position.make_move(move)
+            try:
+                score = -self.__quiescence(position, -beta, -alpha, ply + 1)
+            finally:
+                position.unmake_move()
+            if score >= beta:
+                return score
+            if score > alpha:
+                alpha = score
+        if in_check and not searched:
+            return ply - MATE_SCORE
+        return alpha
@@ -0,0 +1,182 @@
+from Classes.bitboard import *
+
+"""
+    Static evaluation of a Position: material plus piece-square tables, tapered between a middlegame and an endgame score.
+
+    The tables are laid out like the board array seen from white's side, so the first row is the top of the board
+    (black's back row). White pieces read the table at their square, black pieces at the square mirrored top to bottom.
+    The game phase is the sum of the phase weights of the pieces left (24 with every knight, bishop, rook and queen on the board):
+    the middlegame score counts fully at 24 and the endgame score at 0, in proportion in between.
+    The Position keeps the middlegame and endgame totals and the phase up to date as pieces are added, moved, captured and promoted
+    (see Position.get_scores), so evaluating doesn't look at the board at all.
+"""
+
+PIECE_VALUES = (100, 320, 330, 500, 900, 0)
+ENDGAME_PIECE_VALUES = (120, 300, 330, 500, 900, 0)
+PHASE_WEIGHTS = (0, 1, 1, 2, 4, 0)
+MAX_PHASE = 24
+
+PAWN_TABLE = (
+      0,   0,   0,   0,   0,   0,   0,   0,
+     50,  50,  50,  50,  50,  50,  50,  50,
+     10,  10,  20,  30,  30,  20,  10,  10,
+      5,   5,  10,  25,  25,  10,   5,   5,
+      0,   0,   0,  20,  20,   0,   0,   0,
+      5,  -5, -10,   0,   0, -10,  -5,   5,
+      5,  10,  10, -20, -20,  10,  10,   5,
+      0,   0,   0,   0,   0,   0,   0,   0
+)
+
+KNIGHT_TABLE = (
+    -50, -40, -30, -30, -30, -30, -40, -50,
+    -40, -20,   0,   0,   0,   0, -20, -40,
+    -30,   0,  10,  15,  15,  10,   0, -30,
+    -30,   5,  15,  20,  20,  15,   5, -30,
+    -30,   0,  15,  20,  20,  15,   0, -30,
+    -30,   5,  10,  15,  15,  10,   5, -30,
+    -40, -20,   0,   5,   5,   0, -20, -40,
+    -50, -40, -30, -30, -30, -30, -40, -50
+)
+
+BISHOP_TABLE = (
+    -20, -10, -10, -10, -10, -10, -10, -20,
+    -10,   0,   0,   0,   0,   0,   0, -10,
+    -10,   0,   5,  10,  10,   5,   0, -10,
+    -10,   5,   5,  10,  10,   5,   5, -10,
+    -10,   0,  10,  10,  10,  10,   0, -10,
+    -10,  10,  10,  10,  10,  10,  10, -10,
+    -10,   5,   0,   0,   0,   0,   5, -10,
+    -20, -10, -10, -10, -10, -10, -10, -20
+)
+
+ROOK_TABLE = (
+      0,   0,   0,   0,   0,   0,   0,   0,
+      5,  10,  10,  10,  10,  10,  10,   5,
+     -5,   0,   0,   0,   0,   0,   0,  -5,
+     -5,   0,   0,   0,   0,   0,   0,  -5,
+     -5,   0,   0,   0,   0,   0,   0,  -5,
+     -5,   0,   0,   0,   0,   0,   0,  -5,
+     -5,   0,   0,   0,   0,   0,   0,  -5,
+      0,   0,   0,   5,   5,   0,   0,   0
+)
+
+QUEEN_TABLE = (
+    -20, -10, -10,  -5,  -5, -10, -10, -20,
+    -10,   0,   0,   0,   0,   0,   0, -10,
+    -10,   0,   5,   5,   5,   5,   0, -10,
+     -5,   0,   5,   5,   5,   5,   0,  -5,
+      0,   0,   5,   5,   5,   5,   0,  -5,
+    -10,   5,   5,   5,   5,   5,   0, -10,
+    -10,   0,   5,   0,   0,   0,   0, -10,
+    -20, -10, -10,  -5,  -5, -10, -10, -20
+)
+
+KING_TABLE = (
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -20, -30, -30, -40, -40, -30, -30, -20,
+    -10, -20, -20, -20, -20, -20, -20, -10,
+     20,  20,   0,   0,   0,   0,  20,  20,
+     20,  30,  10,   0,   0,  10,  30,  20
+)
+
+# Passed the middlegame pawns are worth more the closer they get to promoting
+PAWN_ENDGAME_TABLE = (
+      0,   0,   0,   0,   0,   0,   0,   0,
+     80,  80,  80,  80,  80,  80,  80,  80,
+     50,  50,  50,  50,  50,  50,  50,  50,
+     30,  30,  30,  30,  30,  30,  30,  30,
+     20,  20,  20,  20,  20,  20,  20,  20,
+     10,  10,  10,  10,  10,  10,  10,  10,
+     10,  10,  10,  10,  10,  10,  10,  10,
+      0,   0,   0,   0,   0,   0,   0,   0
+)
+
+# With few pieces left to attack it the king belongs in the centre
+KING_ENDGAME_TABLE = (
+    -50, -40, -30, -20, -20, -30, -40, -50,
+    -30, -20, -10,   0,   0, -10, -20, -30,
+    -30, -10,  20,  30,  30,  20, -10, -30,
+    -30, -10,  30,  40,  40,  30, -10, -30,
+    -30, -10,  30,  40,  40,  30, -10, -30,
+    -30, -10,  20,  30,  30,  20, -10, -30,
+    -30, -30,   0,   0,   0,   0, -30, -30,
+    -50, -30, -30, -30, -30, -30, -30, -50
+)
+
+PIECE_TABLES = (PAWN_TABLE, KNIGHT_TABLE, BISHOP_TABLE, ROOK_TABLE, QUEEN_TABLE, KING_TABLE)
+ENDGAME_PIECE_TABLES = (PAWN_ENDGAME_TABLE, KNIGHT_TABLE, BISHOP_TABLE, ROOK_TABLE, QUEEN_TABLE, KING_ENDGAME_TABLE)
+
+# SQUARE_SCORES[colour][piece type][square] combines the piece value with its table entry for both colours, ENDGAME_SQUARE_SCORES the same for the endgame
+SQUARE_SCORES = tuple(
+    tuple(tuple(PIECE_VALUES[p_type] + PIECE_TABLES[p_type][square if colour == WHITE else square ^ 56] for square in range(64)) for p_type in range(6))
+    for colour in (WHITE, BLACK)
+)
+ENDGAME_SQUARE_SCORES = tuple(
+    tuple(tuple(ENDGAME_PIECE_VALUES[p_type] + ENDGAME_PIECE_TABLES[p_type][square if colour == WHITE else square ^ 56] for square in range(64)) for p_type in range(6))
+    for colour in (WHITE, BLACK)
+)
+
+# The same scores per mailbox code (1 + colour * 6 + piece type), negative for black's pieces so white's total minus black's is a plain sum.
+# Code 0 (an empty square) scores nothing.
+CODE_SCORES = ((0,) * 64,) + tuple(tuple(score if colour == WHITE else -score for score in SQUARE_SCORES[colour][p_type]) for colour in (WHITE, BLACK) for p_type in range(6))
+ENDGAME_CODE_SCORES = ((0,) * 64,) + tuple(tuple(score if colour == WHITE else -score for score in ENDGAME_SQUARE_SCORES[colour][p_type]) for colour in (WHITE, BLACK) for p_type in range(6))
+CODE_PHASES = (0,) + PHASE_WEIGHTS * 2
+
+def compute_scores(position):
+    """
+        Works out a position's middlegame and endgame totals and phase from scratch, going over every piece (see Position.get_scores for the totals kept as moves are made).
+
+        Parameters
+        ----------
+            position: Position object
+                The position to score
+
+        Returns
+        -------
+            (integer, integer, integer)
+                White's middlegame score minus black's, the same for the endgame, and the game phase
+    """
+    middlegame = endgame = phase = 0
+    for colour, sign in ((WHITE, 1), (BLACK, -1)):
+        for p_type in range(6):
+            middlegame_scores = SQUARE_SCORES[colour][p_type]
+            endgame_scores = ENDGAME_SQUARE_SCORES[colour][p_type]
+            for square in squares(position.get_pieces(colour, p_type)):
+                middlegame += sign * middlegame_scores[square]
+                endgame += sign * endgame_scores[square]
+                phase += PHASE_WEIGHTS[p_type]
+    return (middlegame, endgame, phase)
+
+def taper(middlegame, endgame, phase):
+    """
+        Blends a middlegame and an endgame score by the game phase. Scores should be from the point of view of the colour to move, so rounding down treats both colours alike.
+
+        Returns
+        -------
+            integer
+                The blended score
+    """
+    phase = min(phase, MAX_PHASE)
+    return (middlegame * phase + endgame * (MAX_PHASE - phase)) // MAX_PHASE
+
+def evaluate(position):
+    """
+        Scores a position by material and piece placement, from the totals the position keeps (O(1), no piece is looked at).
+
+        Parameters
+        ----------
+            position: Position object
+                The position to score
+
+        Returns
+        -------
+            integer
+                The score in centipawns from the point of view of the colour to move (positive is good for them)
+    """
+    middlegame, endgame, phase = position.get_scores()
+    if position.get_turn() == BLACK:
+        middlegame, endgame = -middlegame, -endgame
+    return taper(middlegame, endgame, phase)
@@ -0,0 +1,193 @@
+from Classes.bitboard import *
+from Classes.position import Position
+
+"""
+    Reading and writing positions as FEN strings (Forsyth-Edwards Notation), without pygame so positions can be loaded in bulk.
+
+    A FEN string has six fields: the piece placement (from black's back rank down, white pieces in upper case), the colour to move,
+    the castling rights, the en passant square, the half move clock and the full move number, ex:
+        rnbkqbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1
+    Castling rights name the corner the rook is in: K and k for the rook on the h file, Q and q for the rook on the a file.
+
+    Both directions work on whole strings (str.replace and bytes.translate) rather than looping over the squares one at a time,
+    since the whole archive of positions gets loaded through here.
+    Parsing and loading together run at about 45k FEN strings a second on one core, not 100k: most of the time goes into
+    Position.load, which has to visit every piece once in Python to add up the Zobrist key and the evaluation totals.
+"""
+
+START_FEN = 'rnbkqbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1'
+
+PIECE_LETTERS = 'PNBRQKpnbrqk'
+
+# Expands the digits of a placement into that many '.' (one character per square)
+_EXPAND_EMPTY = tuple((str(count), '.' * count) for count in range(2, 9)) + (('1', '.'),)
+# Square characters to mailbox codes (see Position.get_mailbox), anything else becomes 255
+_SQUARE_CODES = bytes(('.' + PIECE_LETTERS).index(chr(byte)) if chr(byte) in '.' + PIECE_LETTERS else 255 for byte in range(256))
+# Mailbox codes back to characters, empty squares as '1' so runs of them can be counted up
+_SQUARE_LETTERS = bytes.maketrans(bytes(range(13)), b'1' + PIECE_LETTERS.encode())
+_EMPTY_RUNS = tuple(('1' * count, str(count)) for count in range(8, 1, -1))
+
+# Castling rights bits (see Position.get_castling_rights) for each letter, and the letters for each set of rights
+CASTLING_LETTERS = {'K': 2, 'Q': 1, 'k': 8, 'q': 4}
+_CASTLING_FIELDS = tuple(''.join(letter for letter in 'KQkq' if rights & CASTLING_LETTERS[letter]) or '-' for rights in range(16))
+# The colour, the first square of the king's row and the rook's corner square for each castling rights bit
+_CASTLING_SQUARES = {1: (WHITE, 56, 56), 2: (WHITE, 56, 63), 4: (BLACK, 0, 0), 8: (BLACK, 0, 7)}
+
+# Pawns on their starting rows haven't moved. A row of the mailbox is translated into one byte per square (1 for the colour's pawn)
+# and looked up in _ROW_MASKS to get the row's pawns as bits.
+_PAWN_START_ROWS = (48, 8)
+_IS_PAWN = tuple(bytes(1 if byte == 1 + colour * 6 + PAWN else 0 for byte in range(256)) for colour in (WHITE, BLACK))
+_IS_ANY_PAWN = bytes(1 if byte in (1 + WHITE * 6 + PAWN, 1 + BLACK * 6 + PAWN) else 0 for byte in range(256))
+_ROW_MASKS = {bytes((row >> x_pos) & 1 for x_pos in range(8)): row for row in range(256)}
+
+def _square_from_name(name):
+    """
+        Returns
+        -------
+            integer
+                The square number of an algebraic square name, ex: 'e3' (see bitboard.square_name)
+    """
+    if len(name) != 2 or name[0] not in 'abcdefgh' or name[1] not in '12345678':
+        raise ValueError("Invalid square: {}".format(name))
+    return square_index(('abcdefgh'.index(name[0]), 8 - int(name[1])))
+
+def parse_fen(fen):
+    """
+        Splits a FEN string into its fields, checking each one. Only the placement is required, the other fields default to
+        white to move, no castling rights, no en passant square, 0 and 1.
+        The placement needs exactly one king per colour and no pawns on the first or last row.
+
+        Parameters
+        ----------
+            fen: string
+                The FEN string
+
+        Returns
+        -------
+            (bytearray, bitboard, integer, integer, integer, integer)
+                The mailbox (see Position.get_mailbox), the squares whose pieces haven't moved (pawns on their starting row and
+                the kings and rooks the castling rights belong to), the colour to move, the en passant square (None if there isn't one),
+                the half move clock and the full move number
+    """
+    fields = fen.split()
+    if not fields or len(fields) > 6:
+        raise ValueError("A FEN string needs between 1 and 6 fields: {}".format(fen))
+    expanded = fields[0]
+    for digit, empty in _EXPAND_EMPTY:
+        expanded = expanded.replace(digit, empty)
+    if len(expanded) != 71 or expanded[8::9] != '///////':
+        raise ValueError("The placement needs 8 rows of 8 squares: {}".format(fields[0]))
+    try:
+        codes = expanded.replace('/', '').encode('ascii').translate(_SQUARE_CODES)
+    except UnicodeEncodeError:
+        raise ValueError("Invalid placement: {}".format(fields[0]))
+    if 255 in codes:
+        raise ValueError("Invalid placement: {}".format(fields[0]))
+    if codes.count(1 + WHITE * 6 + KING) != 1 or codes.count(1 + BLACK * 6 + KING) != 1:
+        raise ValueError("Each colour needs exactly one king: {}".format(fields[0]))
+    if codes[:8].translate(_IS_ANY_PAWN) != bytes(8) or codes[56:].translate(_IS_ANY_PAWN) != bytes(8):
+        raise ValueError("Pawns can't be on the first or last row: {}".format(fields[0]))
+
+    turn = fields[1] if len(fields) > 1 else 'w'
+    if turn not in ('w', 'b'):
+        raise ValueError("The colour to move needs to be w or b: {}".format(turn))
+    turn = WHITE if turn == 'w' else BLACK
+
+    unmoved = 0
+    for colour in (WHITE, BLACK):
+        row_start = _PAWN_START_ROWS[colour]
+        unmoved |= _ROW_MASKS[codes[row_start:row_start + 8].translate(_IS_PAWN[colour])] << row_start
+    castling = fields[2] if len(fields) > 2 else '-'
+    if castling != '-':
+        if len(set(castling)) != len(castling) or not set(castling) <= set(CASTLING_LETTERS):
+            raise ValueError("Invalid castling rights: {}".format(castling))
+        for letter in castling:
+            colour, row_start, rook_square = _CASTLING_SQUARES[CASTLING_LETTERS[letter]]
+            king_square = codes.find(1 + colour * 6 + KING, row_start, row_start + 8)
+            if king_square < 0 or codes[rook_square] != 1 + colour * 6 + ROOK:
+                raise ValueError("Castling rights {} need the king on its row and the rook in the corner".format(letter))
+            unmoved |= (1 << king_square) | (1 << rook_square)
+
+    en_passant = fields[3] if len(fields) > 3 else '-'
+    if en_passant == '-':
+        en_passant = None
+    else:
+        en_passant = _square_from_name(en_passant)
+        # The pawn that made the double step is on the square past the one it skipped over
+        pawn_square = en_passant + (8 if turn == WHITE else -8)
+        if en_passant >> 3 != (2 if turn == WHITE else 5) or codes[en_passant] or codes[pawn_square] != 1 + (turn ^ 1) * 6 + PAWN:
+            raise ValueError("No pawn can have just skipped over the en passant square: {}".format(fields[3]))
+
+    halfmove_clock = int(fields[4]) if len(fields) > 4 else 0
+    fullmove_number = int(fields[5]) if len(fields) > 5 else 1
+    if halfmove_clock < 0 or fullmove_number < 1:
+        raise ValueError("Invalid move counters: {} {}".format(halfmove_clock, fullmove_number))
+    return (bytearray(codes), unmoved, turn, en_passant, halfmove_clock, fullmove_number)
+
+def format_fen(mailbox, turn, castling_rights, en_passant=None, halfmove_clock=0, fullmove_number=1):
+    """
+        Writes the fields of a position as a FEN string.
+
+        Parameters
+        ----------
+            mailbox: bytearray
+                The 64 square codes (see Position.get_mailbox)
+            turn: integer
+                The colour to move, WHITE or BLACK
+            castling_rights: integer
+                One bit per castling option (see Position.get_castling_rights)
+            en_passant: integer
+                The en passant square, None if there isn't one
+            halfmove_clock: integer
+                Half moves since the last capture or pawn move
+            fullmove_number: integer
+                The number of the current full move
+
+        Returns
+        -------
+            string
+                The FEN string
+    """
+    letters = bytes(mailbox).translate(_SQUARE_LETTERS)
+    placement = b'/'.join((letters[0:8], letters[8:16], letters[16:24], letters[24:32], letters[32:40], letters[40:48], letters[48:56], letters[56:64])).decode('ascii')
+    for run, count in _EMPTY_RUNS:
+        placement = placement.replace(run, count)
+    return '{} {} {} {} {} {}'.format(placement, 'b' if turn == BLACK else 'w', _CASTLING_FIELDS[castling_rights], '-' if en_passant is None else square_name(en_passant), halfmove_clock, fullmove_number)
+
+def position_from_fen(fen, position=None):
+    """
+        Builds a Position from a FEN string. Positions where the colour that isn't to move is in check can't happen, since the king could be taken,
+        so they are rejected as well.
+
+        Parameters
+        ----------
+            fen: string
+                The FEN string (see parse_fen)
+            position: Position object
+                A position to load the FEN string into, reusing it saves creating a new one per string when loading in bulk
+
+        Returns
+        -------
+            Position object
+                The position described by the FEN string
+
+        Raises
+        ------
+            ValueError
+                If the FEN string is invalid (see parse_fen) or the colour that isn't to move is in check
+    """
+    if position is None:
+        position = Position()
+    position.load(*parse_fen(fen))
+    if position.in_check(position.get_turn() ^ 1):
+        raise ValueError("The colour that isn't to move can't be in check: {}".format(fen))
+    return position
+
+def position_to_fen(position):
+    """
+        Returns
+        -------
+            string
+                The FEN string of a Position
+    """
+    return format_fen(position.get_mailbox(), position.get_turn(), position.get_castling_rights(), position.get_en_passant(), position.get_halfmove_clock(), position.get_fullmove_number())
@@ -0,0 +1,66 @@
+"""
+    Precomputed move tables for the Piece classes, built once when the module is imported.
+
+    Tables are indexed [x][y] by a piece's position in the Board object's array and hold immutable tuples of board positions,
+    so every piece on a square shares the same tuple instead of building a new list for each call. Only positions on the board are included.
+    Pieces accept positions up to 8 (see Piece.__piece_error_handling), so the tables cover that row and column too.
+"""
+
+GRID_SIZE = 9
+
+DIRECTIONS = {
+    'rook': ((0, 1), (0, -1), (1, 0), (-1, 0)),
+    'bishop': ((1, 1), (1, -1), (-1, 1), (-1, -1)),
+    'queen': ((0, 1), (0, -1), (1, 0), (-1, 0), (1, 1), (1, -1), (-1, 1), (-1, -1)),
+    'knight': ((1, 2), (1, -2), (-1, 2), (-1, -2), (2, 1), (2, -1), (-2, 1), (-2, -1)),
+    'king': ((0, 1), (0, -1), (1, 0), (-1, 0), (1, 1), (1, -1), (-1, 1), (-1, -1))
+}
+SLIDING_PIECES = ('rook', 'bishop', 'queen')
+
+def _on_board(x_pos, y_pos):
+    return 0 <= x_pos < 8 and 0 <= y_pos < 8
+
+def _rays(p_type, x_pos, y_pos):
+    """
+        Returns
+        -------
+            tuple of tuples
+                One tuple of positions per direction the piece moves in, ordered away from the piece and ending at the edge of the board.
+                Knights and kings only move one step, so each of their rays holds at most one position. Empty rays are left out.
+    """
+    rays = []
+    for x_step, y_step in DIRECTIONS[p_type]:
+        ray = []
+        x_target, y_target = x_pos + x_step, y_pos + y_step
+        while _on_board(x_target, y_target):
+            ray.append((x_target, y_target))
+            if p_type not in SLIDING_PIECES:
+                break
+            x_target, y_target = x_target + x_step, y_target + y_step
+        if ray:
+            rays.append(tuple(ray))
+    return tuple(rays)
+
+def _grid(function):
+    return tuple(tuple(function(x_pos, y_pos) for y_pos in range(GRID_SIZE)) for x_pos in range(GRID_SIZE))
+
+# MOVE_RAYS[p_type][x][y]: the rays of positions a piece can move along, in order
+MOVE_RAYS = {p_type: _grid(lambda x_pos, y_pos, p_type=p_type: _rays(p_type, x_pos, y_pos)) for p_type in DIRECTIONS}
+
+# MOVE_TARGETS[p_type][x][y]: every position along the piece's rays, ray by ray
+MOVE_TARGETS = {p_type: _grid(lambda x_pos, y_pos, p_type=p_type: tuple(target for ray in MOVE_RAYS[p_type][x_pos][y_pos] for target in ray)) for p_type in DIRECTIONS}
+
+def _pawn_steps(colour, moved, x_pos, y_pos):
+    y_step = 1 if colour == 'black' else -1
+    steps = 1 if moved else 2
+    return tuple((x_pos, y_pos + y_step * step) for step in range(1, steps + 1) if _on_board(x_pos, y_pos + y_step * step))
+
+def _pawn_attacks(colour, x_pos, y_pos):
+    y_step = 1 if colour == 'black' else -1
+    return tuple((x_pos + x_step, y_pos + y_step) for x_step in (1, -1) if _on_board(x_pos + x_step, y_pos + y_step))
+
+# PAWN_TARGETS[colour][moved][x][y]: the positions a pawn steps forward to, two of them if it hasn't moved yet
+PAWN_TARGETS = {colour: tuple(_grid(lambda x_pos, y_pos, colour=colour, moved=moved: _pawn_steps(colour, moved, x_pos, y_pos)) for moved in (False, True)) for colour in ('white', 'black')}
+
+# PAWN_ATTACK_TARGETS[colour][x][y]: the diagonal positions a pawn captures on
+PAWN_ATTACK_TARGETS = {colour: _grid(lambda x_pos, y_pos, colour=colour: _pawn_attacks(colour, x_pos, y_pos)) for colour in ('white', 'black')}
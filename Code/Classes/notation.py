@@ -0,0 +1,143 @@
+from Classes.bitboard import *
+from Classes.position import encode_move, decode_move
+
+import re
+
+"""
+    Standard Algebraic Notation (SAN) for moves, ex: 'e4', 'Nbd2', 'exd6', 'e8=Q', 'O-O', 'Qxf7+'.
+    Castling towards the h file is written O-O and towards the a file O-O-O, wherever the king starts on its row.
+    Moves are checked against the position's legal moves, so pinned pieces never need telling apart.
+"""
+
+SAN_LETTERS = ('', 'N', 'B', 'R', 'Q', 'K')
+
+_COORDINATE_PATTERN = re.compile(r'^([a-h][1-8])([a-h][1-8])([nbrq])?$')
+_SAN_PATTERN = re.compile(r'^([NBRQK])?([a-h])?([1-8])?x?([a-h][1-8])(?:=?([NBRQ]))?$')
+# Check and mate markers and annotations (!, ?) that can follow a move
+_SAN_SUFFIXES = '+#!?'
+
+def _is_castling(position, from_square, to_square):
+    return position.get_mailbox()[from_square] == 1 + position.get_turn() * 6 + KING and abs(to_square - from_square) == 2
+
+def move_to_san(position, move):
+    """
+        Writes a move in SAN. The move is played and taken back on the position to work out whether it gives check (+) or checkmate (#), so the position is left unchanged.
+
+        Parameters
+        ----------
+            position: Position object
+                The position the move is played from, with the moving colour to move
+            move: integer
+                The encoded move (see position.encode_move)
+
+        Returns
+        -------
+            string
+                The move in SAN
+    """
+    from_square, to_square, promotion = decode_move(move)
+    mailbox = position.get_mailbox()
+    p_type = (mailbox[from_square] - 1) % 6
+    if _is_castling(position, from_square, to_square):
+        san = 'O-O' if to_square > from_square else 'O-O-O'
+    else:
+        capture = mailbox[to_square] or (p_type == PAWN and to_square == position.get_en_passant())
+        if p_type == PAWN:
+            san = (square_name(from_square)[0] + 'x' if capture else '') + square_name(to_square)
+            if promotion:
+                san += '=' + SAN_LETTERS[promotion]
+        else:
+            # Other pieces of the same type that can reach the same square
+            others = [other & 63 for other in position.generate_legal_moves() if other != move and (other >> 6) & 63 == to_square and mailbox[other & 63] == mailbox[from_square]]
+            disambiguation = ''
+            if others:
+                if all((other & 7) != (from_square & 7) for other in others):
+                    disambiguation = square_name(from_square)[0]
+                elif all((other >> 3) != (from_square >> 3) for other in others):
+                    disambiguation = square_name(from_square)[1]
+                else:
+                    disambiguation = square_name(from_square)
+            san = SAN_LETTERS[p_type] + disambiguation + ('x' if capture else '') + square_name(to_square)
+    colour = position.get_turn()
+    position.make_move(move)
+    if position.in_check(colour ^ 1):
+        san += '+' if position.has_legal_moves() else '#'
+    position.unmake_move()
+    return san
+
+def san_to_move(position, san):
+    """
+        Finds the legal move a SAN string describes in a position.
+
+        Parameters
+        ----------
+            position: Position object
+                The position the move is played from
+            san: string
+                The move in SAN, check markers and annotations are ignored
+
+        Returns
+        -------
+            integer
+                The encoded move
+
+        Raises
+        ------
+            ValueError
+                If the SAN doesn't describe exactly one of the position's legal moves
+    """
+    text = san.rstrip(_SAN_SUFFIXES)
+    moves = position.generate_legal_moves()
+    mailbox = position.get_mailbox()
+    own = 1 + position.get_turn() * 6
+    if text in ('O-O', 'O-O-O', '0-0', '0-0-0'):
+        step = 2 if len(text) == 3 else -2
+        candidates = [move for move in moves if mailbox[move & 63] == own + KING and ((move >> 6) & 63) - (move & 63) == step]
+    else:
+        match = _SAN_PATTERN.match(text)
+        if not match:
+            raise ValueError("Invalid SAN move: {}".format(san))
+        letter, from_file, from_rank, target, promotion = match.groups()
+        p_type = SAN_LETTERS.index(letter) if letter else PAWN
+        promotion = SAN_LETTERS.index(promotion) if promotion else 0
+        to_square = square_index(('abcdefgh'.index(target[0]), 8 - int(target[1])))
+        candidates = []
+        for move in moves:
+            from_square = move & 63
+            if (move >> 6) & 63 != to_square or mailbox[from_square] != own + p_type or move >> 12 != promotion:
+                continue
+            if p_type == KING and abs(to_square - from_square) == 2:
+                continue
+            name = square_name(from_square)
+            if (from_file and name[0] != from_file) or (from_rank and name[1] != from_rank):
+                continue
+            candidates.append(move)
+    if len(candidates) != 1:
+        raise ValueError("{} matches {} moves".format(san, len(candidates)))
+    return candidates[0]
+
+def coordinate_to_move(text):
+    """
+        Reads a move in coordinate notation, ex: 'e2e4' or 'a7a8q' (the notation perft.move_name writes). Whether the move is legal isn't checked.
+
+        Parameters
+        ----------
+            text: string
+                The move
+
+        Returns
+        -------
+            integer
+                The encoded move
+
+        Raises
+        ------
+            ValueError
+                If the text isn't in coordinate notation
+    """
+    match = _COORDINATE_PATTERN.match(text)
+    if not match:
+        raise ValueError("Invalid coordinate move: {}".format(text))
+    to_square = lambda name: square_index(('abcdefgh'.index(name[0]), 8 - int(name[1])))
+    promotion = 'pnbrqk'.index(match.group(3)) if match.group(3) else 0
+    return encode_move(to_square(match.group(1)), to_square(match.group(2)), promotion)
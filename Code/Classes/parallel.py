@@ -0,0 +1,236 @@
+from Classes.bitboard import *
+from Classes.position import Position
+from Classes.perft import perft
+from Classes.engine import Engine
+from Classes.transposition import TranspositionTable
+
+import multiprocessing
+import os
+
+"""
+    Parallel perft and search over several worker processes, since a single Python process only keeps one core busy.
+    Workers get a plain description of the position (see describe_board) and rebuild their own Position from it.
+"""
+
+# Set in each search worker process by _init_search_worker
+_worker_engine = None
+
+def describe_board(board):
+    """
+        Serializes the pieces on a board into a description that can be sent to another process.
+
+        Parameters
+        ----------
+            board: Board object
+                The board to describe, its pieces are read from get_pieces_board()
+
+        Returns
+        -------
+            (tuple, integer, integer, integer, integer)
+                A (colour, piece type, square, moved) tuple per piece, the colour to move, the en passant square (None if there isn't one), the half move clock and the full move number
+    """
+    pieces = []
+    for column in board.get_pieces_board():
+        for piece in column:
+            if piece:
+                pieces.append((piece.get_colour_code(), piece.get_type_code(), square_index(piece.get_board_index()), piece.has_moved()))
+    return (tuple(pieces),) + _describe_state(board.get_position())
+
+def _describe_state(position):
+    """
+        Returns
+        -------
+            (integer, integer, integer, integer)
+                The colour to move, en passant square, half move clock and full move number of a Position
+    """
+    return (position.get_turn(), position.get_en_passant(), position.get_halfmove_clock(), position.get_fullmove_number())
+
+def describe_position(position):
+    """
+        Serializes a Position into the same description as describe_board.
+
+        Returns
+        -------
+            (tuple, integer, integer, integer, integer)
+                A (colour, piece type, square, moved) tuple per piece, the colour to move, the en passant square (None if there isn't one), the half move clock and the full move number
+    """
+    pieces = []
+    for colour in (WHITE, BLACK):
+        for p_type in range(6):
+            for square in squares(position.get_pieces(colour, p_type)):
+                pieces.append((colour, p_type, square, not (1 << square) & position.get_unmoved()))
+    return (tuple(pieces),) + _describe_state(position)
+
+def build_position(description):
+    """
+        Rebuilds a Position from a description made by describe_board or describe_position.
+
+        Returns
+        -------
+            Position object
+                The described position, with the colour to move, en passant square and move counters set
+    """
+    pieces, turn, en_passant, halfmove_clock, fullmove_number = description
+    position = Position()
+    for colour, p_type, square, moved in pieces:
+        position.add_piece(colour, p_type, square, moved)
+    position.set_turn(turn)
+    position.set_en_passant(en_passant)
+    position.set_move_counters(halfmove_clock, fullmove_number)
+    return position
+
+def _perft_worker(task):
+    """
+        Counts the leaf nodes below a share of the root moves.
+    """
+    description, moves, depth = task
+    position = build_position(description)
+    nodes = 0
+    for move in moves:
+        position.make_move(move)
+        nodes += perft(position, depth - 1)
+        position.unmake_move()
+    return nodes
+
+def parallel_perft(position, depth, workers=None):
+    """
+        Runs perft with the root moves split between worker processes.
+
+        Parameters
+        ----------
+            position: Position object
+                The position to count from
+            depth: integer
+                Number of half moves to look ahead
+            workers: integer
+                Number of processes to use, leave empty for one per core
+
+        Returns
+        -------
+            integer
+                The number of positions reached at exactly the given depth
+    """
+    workers = workers or os.cpu_count() or 1
+    if depth < 2 or workers == 1:
+        return perft(position, depth)
+    description = describe_position(position)
+    moves = position.generate_legal_moves()
+    # Small shares balance better, as some root moves have far bigger trees than others
+    tasks = [(description, moves[index::workers * 4], depth) for index in range(min(len(moves), workers * 4))]
+    with multiprocessing.Pool(workers) as pool:
+        return sum(pool.map(_perft_worker, tasks))
+
+def _init_search_worker(buffer, hash_mb, time_limit, max_depth):
+    """
+        Runs once in every search worker process, creating its engine on the shared transposition table.
+    """
+    global _worker_engine
+    _worker_engine = Engine(time_limit, max_depth, table=TranspositionTable(hash_mb, buffer))
+
+def _search_worker(task):
+    """
+        Runs one worker's search.
+
+        Returns
+        -------
+            (integer, integer, integer, integer)
+                The best move, deepest finished depth, score and nodes searched
+    """
+    description, start_depth = task
+    move = _worker_engine.search(build_position(description), start_depth)
+    return (move, _worker_engine.get_depth(), _worker_engine.get_score(), _worker_engine.get_nodes())
+
+class ParallelEngine():
+    """
+        Class for searching one position with several worker processes at once (lazy SMP).
+        Every worker runs a full iterative deepening search of the same position, sharing results through one transposition table in shared memory,
+        so a position searched by one worker is a table hit for the others. Half the workers start one ply deeper so they don't just repeat each other's work.
+        The move played is the one from the deepest finished search.
+    """
+    def __init__(self, time_limit=1.0, max_depth=32, hash_mb=16, workers=None):
+        """
+            Initialize the ParallelEngine object, starting its worker processes.
+
+            Parameters
+            ----------
+                time_limit: float
+                    Seconds the engine may think about each move
+                max_depth: integer
+                    Deepest search to run, in plies
+                hash_mb: float
+                    Memory for the shared transposition table in megabytes
+                workers: integer
+                    Number of worker processes, leave empty for one per core
+        """
+        if time_limit <= 0 or max_depth < 1:
+            raise ValueError("The engine needs a positive time limit and depth. time_limit: {} max_depth: {}".format(time_limit, max_depth))
+        self.__workers = workers or os.cpu_count() or 1
+        size = TranspositionTable(hash_mb).get_size()
+        self.__buffer = multiprocessing.RawArray('B', size)
+        self.__pool = multiprocessing.Pool(self.__workers, _init_search_worker, (self.__buffer, hash_mb, time_limit, max_depth))
+        self.__nodes = 0
+        self.__depth = 0
+        self.__score = 0
+
+    def get_workers(self):
+        """
+            Returns
+            -------
+                integer: Number of worker processes
+        """
+        return self.__workers
+
+    def get_nodes(self):
+        """
+            Returns
+            -------
+                integer: Number of positions visited by all workers in the last search
+        """
+        return self.__nodes
+
+    def get_depth(self):
+        """
+            Returns
+            -------
+                integer: Deepest search finished by any worker in the last search
+        """
+        return self.__depth
+
+    def get_score(self):
+        """
+            Returns
+            -------
+                integer: Score of the last search's best move in centipawns, from the point of view of the side that moved
+        """
+        return self.__score
+
+    def search(self, position):
+        """
+            Finds the best move for the colour to move. The position itself isn't touched, workers search their own copies.
+
+            Parameters
+            ----------
+                position: Position object
+                    The position to search
+
+            Returns
+            -------
+                None: If there is no move to play
+                integer: The best encoded move found
+        """
+        description = describe_position(position)
+        results = self.__pool.map(_search_worker, [(description, 1 + worker % 2) for worker in range(self.__workers)])
+        self.__nodes = sum(result[3] for result in results)
+        best = results[0]
+        for result in results[1:]:
+            if result[0] is not None and result[1] > best[1]:
+                best = result
+        move, self.__depth, self.__score, nodes = best
+        return move
+
+    def close(self):
+        """
+            Stops the worker processes. The engine can't search afterwards.
+        """
+        self.__pool.terminate()
+        self.__pool.join()
@@ -0,0 +1,145 @@
+from Classes.bitboard import *
+from Classes.position import decode_move
+from Classes.fen import position_from_fen
+
+import time
+
+PIECE_LETTERS = 'pnbrqk'
+
+# Reference positions for checking the move generator, written as FEN strings. Only legal moves are counted, so apart from the
+# game's own starting layout the node counts are the published ones for these positions.
+REFERENCE_POSITIONS = [
+    {
+        "Name": "game start",
+        "Position": "rnbkqbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+        "Nodes": [20, 400, 8902, 197561]
+    },
+    {
+        "Name": "standard start",
+        "Position": "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+        "Nodes": [20, 400, 8902, 197281]
+    },
+    {
+        "Name": "kiwipete",
+        "Position": "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+        "Nodes": [48, 2039, 97862]
+    },
+    {
+        "Name": "rook endgame",
+        "Position": "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+        "Nodes": [14, 191, 2812, 43238]
+    },
+    {
+        "Name": "promotions",
+        "Position": "n1n5/PPPk4/8/8/8/8/4Kppp/5N1N b - - 0 1",
+        "Nodes": [24, 496, 9483, 182838]
+    }
+]
+
+def parse_position(description):
+    """
+        Builds a Position from a FEN string. Only the piece placement is required (see fen.parse_fen), ex: 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq'
+
+        Parameters
+        ----------
+            description: string
+                The FEN string
+
+        Returns
+        -------
+            Position object
+                The position, with the colour to move, castling rights and en passant square set
+    """
+    return position_from_fen(description)
+
+def move_name(move):
+    """
+        Returns
+        -------
+            string
+                The move in coordinate notation, ex: 'e2e4' or 'a7a8q'
+    """
+    from_square, to_square, promotion = decode_move(move)
+    return square_name(from_square) + square_name(to_square) + (PIECE_LETTERS[promotion] if promotion else '')
+
+def perft(position, depth):
+    """
+        Counts the leaf nodes of the legal move tree to the given depth (see Position.generate_legal_moves).
+        Moves are played and taken back on the position itself, so it is left unchanged afterwards.
+
+        Parameters
+        ----------
+            position: Position object
+                The position to count from
+            depth: integer
+                Number of half moves to look ahead
+
+        Returns
+        -------
+            integer
+                The number of positions reached at exactly the given depth
+    """
+    if depth == 0:
+        return 1
+    moves = position.generate_legal_moves()
+    if depth == 1:
+        return len(moves)
+    nodes = 0
+    for move in moves:
+        position.make_move(move)
+        nodes += perft(position, depth - 1)
+        position.unmake_move()
+    return nodes
+
+def divide(position, depth):
+    """
+        Splits the perft count by root move, for tracking down which move a difference comes from.
+
+        Returns
+        -------
+            dictionary
+                Node counts keyed by the move in coordinate notation
+    """
+    counts = {}
+    for move in position.generate_legal_moves():
+        position.make_move(move)
+        counts[move_name(move)] = perft(position, depth - 1)
+        position.unmake_move()
+    return counts
+
+def timed_perft(position, depth):
+    """
+        Runs perft and measures it.
+
+        Returns
+        -------
+            (integer, float)
+                The node count and the number of nodes per second
+    """
+    start = time.perf_counter()
+    nodes = perft(position, depth)
+    elapsed = time.perf_counter() - start
+    return (nodes, nodes / elapsed if elapsed > 0 else float('inf'))
+
+def run_reference_suite(max_depth):
+    """
+        Runs perft on every reference position up to max_depth and compares against the known node counts.
+
+        Returns
+        -------
+            array of JSON objects
+                One entry per position and depth, with fields for the name, depth, expected and counted nodes and nodes per second.
+    """
+    results = []
+    for reference in REFERENCE_POSITIONS:
+        position = parse_position(reference["Position"])
+        for depth, expected in enumerate(reference["Nodes"][:max_depth], start=1):
+            nodes, speed = timed_perft(position, depth)
+            results.append({
+                "Name": reference["Name"],
+                "Depth": depth,
+                "Expected": expected,
+                "Nodes": nodes,
+                "Speed": speed
+            })
+    return results
@@ -0,0 +1,200 @@
+from Classes.fen import position_from_fen
+from Classes.notation import move_to_san, san_to_move
+
+import re
+
+"""
+    Reading and writing games in PGN (Portable Game Notation).
+
+    read_games is a generator that reads a stream line by line and yields one game at a time, so files of any size are read
+    in constant memory. Each game is a JSON like object:
+        {"Tags": {"Event": ..., "FEN": ...}, "Moves": ['e4', 'e5', ...], "Result": '1-0'}
+    Comments, variations, move numbers and numeric annotations are skipped.
+"""
+
+# Games without a FEN tag start from the usual chess layout
+DEFAULT_FEN = 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1'
+RESULTS = ('1-0', '0-1', '1/2-1/2', '*')
+# The tags every PGN game starts with, in order
+TAG_ROSTER = ('Event', 'Site', 'Date', 'Round', 'White', 'Black', 'Result')
+LINE_LENGTH = 80
+
+_TAG_PATTERN = re.compile(r'^\[\s*(\w+)\s+"((?:[^"\\]|\\.)*)"\s*\]')
+_TOKEN_PATTERN = re.compile(r'\{|;|\(|\)|\$\d+|1-0|0-1|1/2-1/2|\*|\d+\.+|[^\s{};()$.]+')
+
+def _new_game():
+    return {"Tags": {}, "Moves": [], "Result": '*'}
+
+def read_games(stream):
+    """
+        Reads games from a PGN stream one at a time.
+
+        Parameters
+        ----------
+            stream: text file object
+                The PGN file (or anything else yielding lines of text)
+
+        Returns
+        -------
+            generator of JSON objects
+                One object per game with fields for the tags, moves in SAN and result
+    """
+    game = _new_game()
+    started = False
+    in_comment = False
+    depth = 0
+    for line in stream:
+        if in_comment:
+            end = line.find('}')
+            if end < 0:
+                continue
+            line = line[end + 1:]
+            in_comment = False
+        if line.startswith('%'):
+            continue
+        stripped = line.strip()
+        if depth == 0 and stripped.startswith('['):
+            match = _TAG_PATTERN.match(stripped)
+            if match:
+                if game["Moves"]:
+                    # A game without a result, the tags belong to the next one
+                    yield game
+                    game = _new_game()
+                game["Tags"][match.group(1)] = match.group(2).replace('\\"', '"').replace('\\\\', '\\')
+                started = True
+                continue
+        position = 0
+        while True:
+            match = _TOKEN_PATTERN.search(line, position)
+            if not match:
+                break
+            token = match.group()
+            position = match.end()
+            if token == '{':
+                end = line.find('}', position)
+                if end < 0:
+                    in_comment = True
+                    break
+                position = end + 1
+            elif token == ';':
+                break
+            elif token == '(':
+                depth += 1
+            elif token == ')':
+                depth = max(depth - 1, 0)
+            elif depth or token[0] == '$' or token[-1] == '.' or not token.strip('!?'):
+                continue
+            elif token in RESULTS:
+                game["Result"] = token
+                yield game
+                game = _new_game()
+                started = False
+            else:
+                game["Moves"].append(token)
+                started = True
+    if started or game["Moves"]:
+        yield game
+
+def replay_game(game):
+    """
+        Plays a game's moves through the rules from its starting position, checking each one is possible.
+
+        Parameters
+        ----------
+            game: JSON object
+                A game from read_games
+
+        Returns
+        -------
+            Position object
+                The position after the last move
+
+        Raises
+        ------
+            ValueError
+                If the starting position or one of the moves isn't valid, the message says which move
+    """
+    position = position_from_fen(game["Tags"].get('FEN', DEFAULT_FEN))
+    for index, san in enumerate(game["Moves"]):
+        try:
+            position.make_move(san_to_move(position, san))
+        except ValueError as error:
+            raise ValueError("Move {} ({}): {}".format(index + 1, san, error))
+    return position
+
+def moves_to_san(position, moves):
+    """
+        Writes a list of encoded moves in SAN, playing them on the position and taking them back afterwards.
+
+        Returns
+        -------
+            array of strings
+                The moves in SAN
+    """
+    sans = []
+    for move in moves:
+        sans.append(move_to_san(position, move))
+        position.make_move(move)
+    for move in moves:
+        position.unmake_move()
+    return sans
+
+def format_game(moves, tags=None, result='*'):
+    """
+        Writes a game as PGN text.
+
+        Parameters
+        ----------
+            moves: array of strings
+                The moves in SAN
+            tags: dictionary
+                The game's tags. The seven tag roster is written first (with '?' for missing tags) and a FEN tag makes the move numbers start where the position does
+            result: string
+                '1-0', '0-1', '1/2-1/2' or '*'
+
+        Returns
+        -------
+            string
+                The game in PGN, ending with a blank line
+    """
+    if result not in RESULTS:
+        raise ValueError("Invalid result: {}".format(result))
+    tags = dict(tags or {})
+    tags['Result'] = result
+    lines = ['[{} "{}"]'.format(name, str(tags.get(name, '?')).replace('\\', '\\\\').replace('"', '\\"')) for name in TAG_ROSTER]
+    lines += ['[{} "{}"]'.format(name, str(value).replace('\\', '\\\\').replace('"', '\\"')) for name, value in tags.items() if name not in TAG_ROSTER]
+    lines.append('')
+    move_number = 1
+    black_to_move = False
+    if 'FEN' in tags:
+        fields = tags['FEN'].split()
+        black_to_move = len(fields) > 1 and fields[1] == 'b'
+        move_number = int(fields[5]) if len(fields) > 5 else 1
+    # Move numbers are kept on the same line as their move
+    tokens = []
+    for san in moves:
+        if not black_to_move:
+            tokens.append('{}. {}'.format(move_number, san))
+        elif not tokens:
+            tokens.append('{}... {}'.format(move_number, san))
+        else:
+            tokens.append(san)
+        if black_to_move:
+            move_number += 1
+        black_to_move = not black_to_move
+    tokens.append(result)
+    line = ''
+    for token in tokens:
+        if line and len(line) + 1 + len(token) > LINE_LENGTH:
+            lines.append(line)
+            line = token
+        else:
+            line = line + ' ' + token if line else token
+    lines.append(line)
+    return '\n'.join(lines) + '\n\n'
+
+def write_game(stream, moves, tags=None, result='*'):
+    """
+        Writes a game to a PGN stream (see format_game), so games can be appended one at a time.
+    """
+    stream.write(format_game(moves, tags, result))
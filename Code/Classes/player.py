@@ -4,6 +4,8 @@ class Player():
     """
         Class for holding the player's information
         Holds the array of pieces and the player colour which distinguishes which player is which.
+        Each piece's slot in the array is indexed, so checking whether the player owns a piece, removing a captured piece and exchanging a pawn all take constant time:
+        a removed piece's slot is filled with the last piece in the array instead of shifting every piece after it.
     """
     def __init__(self, colour, pieces):
         """
@@ -14,26 +16,29 @@ class Player():
                 colour: string
                     Distinguishes the two player
                 pieces: array of piece objects
-                    The array of all the pieces that each player has.
+                    The array of all the pieces that each player has, 16 at the start of a game but fewer when continuing a game from a FEN string.
         """
         self.__player_error_handling(colour, pieces)
         self.colour = colour
         self.pieces = pieces
+        self.__slots = {piece: slot for slot, piece in enumerate(pieces)}
 
     def __player_error_handling(self, colour, pieces):
         if(colour == None or colour != 'white' and colour != 'black'):
             raise ValueError("Only white and black are supported as colours: {}".format(colour))
 
-        if(pieces == None or len(pieces) != 16):
-            raise ValueError("There need to be 16 pieces, not: {}".format(len(pieces)))
+        if(pieces == None or len(pieces) < 1 or len(pieces) > 16):
+            raise ValueError("There need to be between 1 and 16 pieces, not: {}".format(len(pieces)))
         for piece in pieces:
             if(not isinstance(piece, Piece)):
                 raise ValueError("This isn't a chess pieces: {}".format(piece))
+        if(len(set(map(id, pieces))) != len(pieces)):
+            raise ValueError("Each piece can only be given once")
 
 
     def get_pieces(self):
         """
-            Returns the player's current pieces.
+            Returns the player's current pieces. The array is changed in place as pieces are captured or exchanged, so it shouldn't be modified directly (see add_piece, remove_piece and replace_piece).
 
             Returns
             -------
@@ -49,4 +54,62 @@ class Player():
                 self.colour: string
                     The player's distinguishing colour
         """
-        return self.colour
\ No newline at end of file
+        return self.colour
+
+    def owns(self, piece):
+        """
+            Returns
+            -------
+                boolean: True if the piece is one of the player's current pieces
+        """
+        return piece in self.__slots
+
+    def add_piece(self, piece):
+        """
+            Adds a piece to the end of the player's array, ex: putting back a captured piece when a move is taken back.
+
+            Parameters
+            ----------
+                piece: Piece object
+                    The piece to add, of the player's colour
+        """
+        if(not isinstance(piece, Piece) or piece.get_colour() != self.colour or piece in self.__slots):
+            raise ValueError("This piece can't be added to the {} player: {}".format(self.colour, piece))
+        self.__slots[piece] = len(self.pieces)
+        self.pieces.append(piece)
+
+    def remove_piece(self, piece):
+        """
+            Removes a piece, ex: when it is captured. The last piece in the array takes its slot.
+
+            Parameters
+            ----------
+                piece: Piece object
+                    One of the player's pieces
+        """
+        if(piece not in self.__slots):
+            raise ValueError("The {} player doesn't have this piece: {}".format(self.colour, piece))
+        slot = self.__slots.pop(piece)
+        last = self.pieces.pop()
+        if last is not piece:
+            self.pieces[slot] = last
+            self.__slots[last] = slot
+
+    def replace_piece(self, piece, new_piece):
+        """
+            Puts a new piece in another piece's slot, ex: when a pawn is exchanged for a queen or the exchange is taken back.
+
+            Parameters
+            ----------
+                piece: Piece object
+                    One of the player's pieces
+                new_piece: Piece object
+                    The piece taking its place
+        """
+        if(piece not in self.__slots):
+            raise ValueError("The {} player doesn't have this piece: {}".format(self.colour, piece))
+        if(not isinstance(new_piece, Piece) or new_piece.get_colour() != self.colour or new_piece in self.__slots):
+            raise ValueError("This piece can't be added to the {} player: {}".format(self.colour, new_piece))
+        slot = self.__slots.pop(piece)
+        self.pieces[slot] = new_piece
+        self.__slots[new_piece] = slot
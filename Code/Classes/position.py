@@ -0,0 +1,931 @@
+from Classes.bitboard import *
+from Classes.zobrist import *
+from Classes.evaluation import CODE_SCORES, ENDGAME_CODE_SCORES, CODE_PHASES
+
+PROMOTION_TYPES = (QUEEN, ROOK, BISHOP, KNIGHT)
+# The Zobrist keys per square for each mailbox code (1 + colour * 6 + piece type)
+_CODE_KEYS = (None,) + PIECE_KEYS[WHITE] + PIECE_KEYS[BLACK]
+# Capture ordering per mailbox code, victims outweigh attackers. An empty target square is an en passant capture, which takes a pawn
+_VICTIM_ORDER = (0,) + tuple(p_type * 8 for p_type in range(6)) * 2
+_ATTACKER_ORDER = (0,) + tuple(range(6)) * 2
+# Everything load adds up for a piece, per mailbox code and square: its bit, its Zobrist key and its evaluation scores packed into one integer
+# (middlegame << 40, endgame << 20 and phase), so a whole position's scores are a single running sum, unpacked once at the end
+_LOAD_ENTRIES = (None,) + tuple(
+    tuple((1 << square, _CODE_KEYS[code][square], (CODE_SCORES[code][square] << 40) + (ENDGAME_CODE_SCORES[code][square] << 20) + CODE_PHASES[code]) for square in range(64))
+    for code in range(1, 13)
+)
+_FIELD_MASK = (1 << 20) - 1
+_FIELD_SIGN = 1 << 19
+
+def encode_move(from_square, to_square, promotion=0):
+    """
+        Packs a move into a single integer: bits 0-5 hold the square moved from, bits 6-11 the square moved to and the bits above that the piece type a pawn promotes to (0 for no promotion).
+
+        Parameters
+        ----------
+            from_square: integer
+                The square the piece moves from
+            to_square: integer
+                The square the piece moves to
+            promotion: integer
+                The piece type code a pawn is exchanged for, 0 if the move isn't a promotion
+
+        Returns
+        -------
+            integer
+                The encoded move
+    """
+    return from_square | (to_square << 6) | (promotion << 12)
+
+def decode_move(move):
+    """
+        Returns
+        -------
+            (integer, integer, integer)
+                The from square, to square and promotion type of an encoded move
+    """
+    return (move & 63, (move >> 6) & 63, move >> 12)
+
+class Position():
+    """
+        Bitboard representation of the pieces on the board.
+        Holds one 64-bit integer per colour and piece type, plus a mask of the squares whose pieces haven't moved yet (for pawn double steps and castling).
+        Move generation works on whole bitboards with the precomputed attack tables, instead of walking the board square by square.
+        The position also tracks the colour to move and the moves played, which can be taken back with unmake_move. None of this needs pygame, so games can be played and searched headlessly.
+        A Zobrist key identifying the position (pieces, castling rights, en passant file and colour to move) is updated with every change, so comparing or hashing positions is O(1).
+        After a pawn's double step the square it skipped over is kept as the en passant square, but only while an opposing pawn stands ready to capture onto it, so positions that only differ by a capture that can't happen hash the same.
+        The half move clock (half moves since the last capture or pawn move) and full move number are kept as well, as in FEN strings.
+        Alongside the bitboards a flat 64 byte mailbox holds a code per square (0 when empty, otherwise 1 + colour * 6 + piece type), so finding the piece on a square is a single lookup.
+        The material and piece-square totals of the evaluation (middlegame, endgame and game phase, see evaluation.py) are updated with every piece added, moved, captured or promoted, like the key, so evaluating a position is O(1).
+    """
+    __slots__ = ('__pieces', '__occupied', '__mailbox', '__unmoved', '__turn', '__history', '__key', '__castling_rights', '__en_passant', '__halfmove_clock', '__fullmove_number', '__middlegame', '__endgame', '__phase')
+
+    def __init__(self):
+        """
+            Initialize an empty position. Pieces are added with add_piece.
+        """
+        self.__pieces = [[0] * 6, [0] * 6]
+        self.__occupied = [0, 0]
+        self.__mailbox = bytearray(64)
+        self.__unmoved = 0
+        self.__turn = WHITE
+        self.__history = []
+        self.__key = 0
+        self.__castling_rights = 0
+        self.__en_passant = None
+        self.__halfmove_clock = 0
+        self.__fullmove_number = 1
+        self.__middlegame = 0
+        self.__endgame = 0
+        self.__phase = 0
+
+    def copy(self):
+        """
+            Returns
+            -------
+                Position object: An independent copy of this position
+        """
+        position = Position()
+        position.__pieces = [list(self.__pieces[WHITE]), list(self.__pieces[BLACK])]
+        position.__occupied = list(self.__occupied)
+        position.__mailbox = bytearray(self.__mailbox)
+        position.__unmoved = self.__unmoved
+        position.__turn = self.__turn
+        position.__history = list(self.__history)
+        position.__key = self.__key
+        position.__castling_rights = self.__castling_rights
+        position.__en_passant = self.__en_passant
+        position.__halfmove_clock = self.__halfmove_clock
+        position.__fullmove_number = self.__fullmove_number
+        position.__middlegame = self.__middlegame
+        position.__endgame = self.__endgame
+        position.__phase = self.__phase
+        return position
+
+    def load(self, mailbox, unmoved, turn=WHITE, en_passant=None, halfmove_clock=0, fullmove_number=1):
+        """
+            Replaces everything in the position at once, building the bitboards, key and evaluation totals from a mailbox in one pass (much quicker than adding the pieces one by one, for loading positions in bulk).
+            The move history is cleared.
+
+            Parameters
+            ----------
+                mailbox: bytearray
+                    The 64 square codes, 0 for an empty square, otherwise 1 + colour * 6 + piece type
+                unmoved: bitboard
+                    The squares whose pieces haven't moved yet
+                turn: integer
+                    The colour to move, WHITE or BLACK
+                en_passant: integer
+                    The square a pawn skipped over with a double step on the last move, None if there isn't one.
+                    It is only kept if a pawn of the colour to move can capture onto it.
+                halfmove_clock: integer
+                    Half moves played since the last capture or pawn move
+                fullmove_number: integer
+                    The number of the current full move, starting at 1 and increasing after black moves
+        """
+        by_code = [0] * 13
+        key = BLACK_TO_MOVE_KEY if turn == BLACK else 0
+        scores = 0
+        entries = _LOAD_ENTRIES
+        for square, code in enumerate(mailbox):
+            if code:
+                bit, piece_key, piece_scores = entries[code][square]
+                by_code[code] |= bit
+                key ^= piece_key
+                scores += piece_scores
+        self.__pieces = [by_code[1:7], by_code[7:13]]
+        occupied = [0, 0]
+        for p_type in range(6):
+            occupied[WHITE] |= by_code[1 + p_type]
+            occupied[BLACK] |= by_code[7 + p_type]
+        self.__occupied = occupied
+        self.__mailbox = bytearray(mailbox)
+        self.__unmoved = unmoved & (occupied[WHITE] | occupied[BLACK])
+        self.__turn = turn
+        self.__history = []
+        self.__castling_rights = self.get_castling_rights()
+        self.__key = key ^ CASTLING_KEYS[self.__castling_rights]
+        self.__en_passant = None
+        self.set_en_passant(en_passant)
+        self.__halfmove_clock = halfmove_clock
+        self.__fullmove_number = fullmove_number
+        self.__phase = scores & _FIELD_MASK
+        scores >>= 20
+        self.__endgame = ((scores + _FIELD_SIGN) & _FIELD_MASK) - _FIELD_SIGN
+        self.__middlegame = (scores - self.__endgame) >> 20
+
+    def get_key(self):
+        """
+            Returns
+            -------
+                integer: The 64-bit Zobrist key of the position
+        """
+        return self.__key
+
+    def get_scores(self):
+        """
+            Returns
+            -------
+                (integer, integer, integer): White's middlegame score minus black's, the same for the endgame, and the game phase (see evaluation.py)
+        """
+        return (self.__middlegame, self.__endgame, self.__phase)
+
+    def compute_key(self):
+        """
+            Calculates the Zobrist key from scratch, for checking the incrementally updated key.
+
+            Returns
+            -------
+                integer: The 64-bit Zobrist key of the position
+        """
+        key = CASTLING_KEYS[self.get_castling_rights()]
+        if self.__turn == BLACK:
+            key ^= BLACK_TO_MOVE_KEY
+        if self.__en_passant is not None:
+            key ^= EN_PASSANT_KEYS[self.__en_passant & 7]
+        for colour in (WHITE, BLACK):
+            for p_type in range(6):
+                for square in squares(self.__pieces[colour][p_type]):
+                    key ^= PIECE_KEYS[colour][p_type][square]
+        return key
+
+    def get_castling_rights(self):
+        """
+            Works out the castling rights from which kings and corner rooks haven't moved yet.
+
+            Returns
+            -------
+                integer
+                    One bit per castling option: 1 white towards the left corner, 2 white towards the right corner, 4 and 8 the same for black
+        """
+        rights = 0
+        for colour, row_start in ((WHITE, 56), (BLACK, 0)):
+            if self.__pieces[colour][KING] & self.__unmoved & (0xFF << row_start):
+                unmoved_rooks = self.__pieces[colour][ROOK] & self.__unmoved
+                if unmoved_rooks & (1 << row_start):
+                    rights |= 1 << (2 * colour)
+                if unmoved_rooks & (1 << (row_start + 7)):
+                    rights |= 2 << (2 * colour)
+        return rights
+
+    def __update_castling_key(self):
+        """
+            Recalculates the castling rights after kings or rooks moved and swaps their number in the key.
+        """
+        rights = self.get_castling_rights()
+        self.__key ^= CASTLING_KEYS[self.__castling_rights] ^ CASTLING_KEYS[rights]
+        self.__castling_rights = rights
+
+    def get_turn(self):
+        """
+            Returns
+            -------
+                integer: The colour to move, WHITE or BLACK
+        """
+        return self.__turn
+
+    def set_turn(self, colour):
+        """
+            Sets the colour to move.
+
+            Parameters
+            ----------
+                colour: integer
+                    WHITE or BLACK
+        """
+        if colour != self.__turn:
+            self.__key ^= BLACK_TO_MOVE_KEY
+        self.__turn = colour
+
+    def get_en_passant(self):
+        """
+            Returns
+            -------
+                None: If the last move wasn't a pawn's double step that can be answered with an en passant capture
+                integer: The square the pawn skipped over, which a pawn of the colour to move can capture onto
+        """
+        return self.__en_passant
+
+    def set_en_passant(self, square):
+        """
+            Sets the square a pawn of the colour to move can capture onto en passant. The square is ignored unless one of the colour to move's pawns attacks it.
+
+            Parameters
+            ----------
+                square: integer
+                    The square the opposing pawn skipped over, None to clear it
+        """
+        if self.__en_passant is not None:
+            self.__key ^= EN_PASSANT_KEYS[self.__en_passant & 7]
+            self.__en_passant = None
+        if square is not None and PAWN_ATTACKS[self.__turn ^ 1][square] & self.__pieces[self.__turn][PAWN]:
+            self.__en_passant = square
+            self.__key ^= EN_PASSANT_KEYS[square & 7]
+
+    def get_halfmove_clock(self):
+        """
+            Returns
+            -------
+                integer: The number of half moves since the last capture or pawn move (for the fifty move rule)
+        """
+        return self.__halfmove_clock
+
+    def get_fullmove_number(self):
+        """
+            Returns
+            -------
+                integer: The number of the current full move, starting at 1 and increasing after black moves
+        """
+        return self.__fullmove_number
+
+    def set_move_counters(self, halfmove_clock, fullmove_number):
+        """
+            Sets the half move clock and full move number (ex: when continuing a game from a FEN string).
+        """
+        self.__halfmove_clock = halfmove_clock
+        self.__fullmove_number = fullmove_number
+
+    def get_mailbox(self):
+        """
+            Returns
+            -------
+                bytearray: The 64 square codes, 0 for an empty square, otherwise 1 + colour * 6 + piece type. Read only, the position keeps it up to date.
+        """
+        return self.__mailbox
+
+    def get_move_list(self):
+        """
+            Returns
+            -------
+                array of integers: The encoded moves played with make_move so far, oldest first
+        """
+        return [record[0] for record in self.__history]
+
+    def add_piece(self, colour, p_type, square, moved=False):
+        """
+            Places a piece on an empty square.
+
+            Parameters
+            ----------
+                colour: integer
+                    WHITE or BLACK
+                p_type: integer
+                    One of the piece type codes (PAWN to KING)
+                square: integer
+                    The square number to place the piece on
+                moved: boolean
+                    Whether the piece has already moved (affects pawn double steps and castling)
+        """
+        bit = 1 << square
+        self.__pieces[colour][p_type] |= bit
+        self.__occupied[colour] |= bit
+        code = 1 + colour * 6 + p_type
+        self.__mailbox[square] = code
+        self.__key ^= PIECE_KEYS[colour][p_type][square]
+        self.__middlegame += CODE_SCORES[code][square]
+        self.__endgame += ENDGAME_CODE_SCORES[code][square]
+        self.__phase += CODE_PHASES[code]
+        if not moved:
+            self.__unmoved |= bit
+            self.__update_castling_key()
+
+    def remove_piece(self, square):
+        """
+            Clears a square, whichever piece is on it.
+
+            Parameters
+            ----------
+                square: integer
+                    The square number to clear
+        """
+        bit = 1 << square
+        if (self.__occupied[WHITE] | self.__occupied[BLACK]) & bit:
+            code = self.__mailbox[square]
+            colour, p_type = divmod(code - 1, 6)
+            self.__pieces[colour][p_type] ^= bit
+            self.__occupied[colour] ^= bit
+            self.__mailbox[square] = 0
+            self.__key ^= PIECE_KEYS[colour][p_type][square]
+            self.__middlegame -= CODE_SCORES[code][square]
+            self.__endgame -= ENDGAME_CODE_SCORES[code][square]
+            self.__phase -= CODE_PHASES[code]
+        if self.__unmoved & bit:
+            self.__unmoved ^= bit
+            self.__update_castling_key()
+
+    def move_piece(self, from_square, to_square):
+        """
+            Moves the piece on from_square to to_square, removing anything that was on to_square.
+
+            Parameters
+            ----------
+                from_square: integer
+                    The square the piece is currently on
+                to_square: integer
+                    The square the piece moves to
+        """
+        occupant = self.piece_at(from_square)
+        self.remove_piece(to_square)
+        self.remove_piece(from_square)
+        if occupant:
+            self.add_piece(occupant[0], occupant[1], to_square, moved=True)
+
+    def promote(self, square, p_type):
+        """
+            Swaps the piece on square for a new piece type of the same colour (pawn promotion).
+
+            Parameters
+            ----------
+                square: integer
+                    The square of the piece to exchange
+                p_type: integer
+                    The new piece type code
+        """
+        old_code = self.__mailbox[square]
+        colour, old_type = divmod(old_code - 1, 6)
+        code = 1 + colour * 6 + p_type
+        bit = 1 << square
+        self.__pieces[colour][old_type] ^= bit
+        self.__pieces[colour][p_type] |= bit
+        self.__mailbox[square] = code
+        self.__key ^= PIECE_KEYS[colour][old_type][square] ^ PIECE_KEYS[colour][p_type][square]
+        self.__middlegame += CODE_SCORES[code][square] - CODE_SCORES[old_code][square]
+        self.__endgame += ENDGAME_CODE_SCORES[code][square] - ENDGAME_CODE_SCORES[old_code][square]
+        self.__phase += CODE_PHASES[code] - CODE_PHASES[old_code]
+
+    def piece_at(self, square):
+        """
+            Parameters
+            ----------
+                square: integer
+                    The square number to look at
+
+            Returns
+            -------
+                None: If the square is empty
+                (integer, integer): The colour and piece type codes of the piece on the square
+        """
+        code = self.__mailbox[square]
+        return divmod(code - 1, 6) if code else None
+
+    def get_pieces(self, colour, p_type):
+        """
+            Returns
+            -------
+                bitboard: The squares holding the given colour's pieces of the given type
+        """
+        return self.__pieces[colour][p_type]
+
+    def get_occupied(self, colour=None):
+        """
+            Parameters
+            ----------
+                colour: integer
+                    WHITE or BLACK, leave empty for both colours
+
+            Returns
+            -------
+                bitboard: The squares occupied by the given colour (or by anyone)
+        """
+        if colour is None:
+            return self.__occupied[WHITE] | self.__occupied[BLACK]
+        return self.__occupied[colour]
+
+    def get_unmoved(self):
+        """
+            Returns
+            -------
+                bitboard: The squares whose pieces haven't moved yet
+        """
+        return self.__unmoved
+
+    def is_attacked(self, square, colour, occupied=None):
+        """
+            Checks whether any of a colour's pieces attack a square, by looking outwards from the square with each piece type's attack table.
+
+            Parameters
+            ----------
+                square: integer
+                    The square to check
+                colour: integer
+                    The attacking colour, WHITE or BLACK
+                occupied: bitboard
+                    The squares that block sliding pieces, leave empty for the occupied squares (a king checking where it can step leaves itself out)
+
+            Returns
+            -------
+                boolean
+                    True if the square is attacked
+        """
+        pieces = self.__pieces[colour]
+        if PAWN_ATTACKS[colour ^ 1][square] & pieces[PAWN] or KNIGHT_ATTACKS[square] & pieces[KNIGHT] or KING_ATTACKS[square] & pieces[KING]:
+            return True
+        if occupied is None:
+            occupied = self.__occupied[WHITE] | self.__occupied[BLACK]
+        return bool(bishop_attacks(square, occupied) & (pieces[BISHOP] | pieces[QUEEN]) or rook_attacks(square, occupied) & (pieces[ROOK] | pieces[QUEEN]))
+
+    def attackers(self, square, colour):
+        """
+            Returns
+            -------
+                bitboard: The squares of the colour's pieces attacking a square
+        """
+        pieces = self.__pieces[colour]
+        occupied = self.__occupied[WHITE] | self.__occupied[BLACK]
+        return (PAWN_ATTACKS[colour ^ 1][square] & pieces[PAWN] | KNIGHT_ATTACKS[square] & pieces[KNIGHT] | KING_ATTACKS[square] & pieces[KING]
+                | bishop_attacks(square, occupied) & (pieces[BISHOP] | pieces[QUEEN]) | rook_attacks(square, occupied) & (pieces[ROOK] | pieces[QUEEN]))
+
+    def pins(self, colour):
+        """
+            Finds the colour's pieces pinned to their king: the only piece between the king and an opposing rook, bishop or queen lined up with it.
+            Opposing sliders are found by looking outwards from the king through the colour's own pieces, so this costs a few table lookups rather than playing any moves.
+
+            Parameters
+            ----------
+                colour: integer
+                    WHITE or BLACK
+
+            Returns
+            -------
+                dictionary
+                    The squares a pinned piece can still move to (the line up to and including the pinning piece), keyed by the pinned piece's square
+        """
+        pinned = {}
+        king = self.__pieces[colour][KING]
+        if not king:
+            return pinned
+        king_square = king.bit_length() - 1
+        enemy = self.__pieces[colour ^ 1]
+        enemy_occupied = self.__occupied[colour ^ 1]
+        occupied = enemy_occupied | self.__occupied[colour]
+        snipers = (rook_attacks(king_square, enemy_occupied) & (enemy[ROOK] | enemy[QUEEN])) | (bishop_attacks(king_square, enemy_occupied) & (enemy[BISHOP] | enemy[QUEEN]))
+        between_king = BETWEEN[king_square]
+        for sniper in squares(snipers):
+            blockers = between_king[sniper] & occupied
+            # Exactly one blocker, and it belongs to the pinned colour
+            if blockers and not blockers & (blockers - 1) and blockers & self.__occupied[colour]:
+                pinned[blockers.bit_length() - 1] = between_king[sniper] | (1 << sniper)
+        return pinned
+
+    def in_check(self, colour):
+        """
+            Returns
+            -------
+                boolean
+                    True if the colour's king is attacked (False if the colour has no king left)
+        """
+        king = self.__pieces[colour][KING]
+        return bool(king) and self.is_attacked(king.bit_length() - 1, colour ^ 1)
+
+    def __castling_targets(self, colour, square):
+        """
+            Castling is possible when the king and a rook in a corner of the king's row haven't moved and nothing stands between them.
+            The king then moves two squares towards the rook.
+
+            Returns
+            -------
+                bitboard: The squares the king can castle to
+        """
+        unmoved_rooks = self.__pieces[colour][ROOK] & self.__unmoved
+        if not (1 << square) & self.__unmoved or not unmoved_rooks:
+            return 0
+        row_start = square & 56
+        attacks = rook_attacks(square, self.__occupied[WHITE] | self.__occupied[BLACK])
+        targets = 0
+        for rook_square, step in ((row_start, -2), (row_start + 7, 2)):
+            if abs(rook_square - square) >= 3 and unmoved_rooks & attacks & (1 << rook_square):
+                targets |= 1 << (square + step)
+        return targets
+
+    def get_piece_moves(self, square):
+        """
+            Calculates every square the piece on square can move to given the current position.
+
+            Parameters
+            ----------
+                square: integer
+                    The square of the piece to generate moves for
+
+            Returns
+            -------
+                (bitboard, bitboard, bitboard)
+                    The empty squares the piece can move to, the squares with opposing pieces it can capture, and the squares a king can castle to.
+        """
+        colour, p_type = self.piece_at(square)
+        own = self.__occupied[colour]
+        enemy = self.__occupied[colour ^ 1]
+        occupied = own | enemy
+        empty = ~occupied & FULL_BOARD
+        castling = 0
+        if p_type == PAWN:
+            step = 8 if colour == BLACK else -8
+            quiet = (1 << (square + step)) & empty if 0 <= square + step < 64 else 0
+            if quiet and (1 << square) & self.__unmoved and 0 <= square + 2 * step < 64:
+                quiet |= (1 << (square + 2 * step)) & empty
+            if self.__en_passant is not None:
+                enemy |= 1 << self.__en_passant
+            return (quiet, PAWN_ATTACKS[colour][square] & enemy, castling)
+        if p_type == KNIGHT:
+            attacks = KNIGHT_ATTACKS[square]
+        elif p_type == BISHOP:
+            attacks = bishop_attacks(square, occupied)
+        elif p_type == ROOK:
+            attacks = rook_attacks(square, occupied)
+        elif p_type == QUEEN:
+            attacks = queen_attacks(square, occupied)
+        else:
+            attacks = KING_ATTACKS[square]
+            castling = self.__castling_targets(colour, square)
+        return (attacks & empty, attacks & enemy, castling)
+
+    def generate_moves(self, colour=None):
+        """
+            Generates every move the given colour can make, as encoded moves (see encode_move).
+            Pawns reaching the last row generate one move per piece type they can be exchanged for.
+
+            Parameters
+            ----------
+                colour: integer
+                    WHITE or BLACK, leave empty for the colour to move
+
+            Returns
+            -------
+                array of integers
+                    The encoded moves
+        """
+        return self.__generate_moves(colour, False)
+
+    def generate_legal_moves(self, colour=None, captures_only=False):
+        """
+            Generates the moves that don't leave the mover's own king attacked.
+            The checking pieces and pins are worked out once for the position and masked into each piece's target squares as they are generated:
+            when in check a move has to capture the checking piece or block its line (only the king can move out of a double check),
+            a pinned piece has to stay on the line of its pin, and the king can't step onto an attacked square or castle out of, through or into check.
+            Only en passant captures, which take a pawn off a square the move doesn't land on, are checked by playing them.
+
+            Parameters
+            ----------
+                colour: integer
+                    WHITE or BLACK, leave empty for the colour to move
+                captures_only: boolean
+                    True to only generate captures (for the quiescence search), which skips working out the other moves
+
+            Returns
+            -------
+                array of integers
+                    The encoded legal moves (every pseudo legal move if the colour has no king)
+        """
+        return self.__generate_moves(colour, True, True, not captures_only)
+
+    def is_legal(self, move):
+        """
+            Checks whether an encoded move is one of the colour to move's legal moves, without generating the others (ex: for a move remembered from another position).
+
+            Parameters
+            ----------
+                move: integer
+                    The encoded move
+
+            Returns
+            -------
+                boolean
+                    True if the move is legal
+        """
+        from_square = move & 63
+        to_square = (move >> 6) & 63
+        promotion = move >> 12
+        code = self.__mailbox[from_square]
+        if not code:
+            return False
+        colour, p_type = divmod(code - 1, 6)
+        if colour != self.__turn:
+            return False
+        quiet, captures, castling = self.get_piece_moves(from_square)
+        if not (1 << to_square) & (quiet | captures | castling):
+            return False
+        if (p_type == PAWN and (to_square < 8 or to_square >= 56)) != (promotion in PROMOTION_TYPES):
+            return False
+        if (1 << to_square) & castling and (self.in_check(colour) or self.is_attacked((from_square + to_square) >> 1, colour ^ 1)):
+            return False
+        self.make_move(move)
+        legal = not self.in_check(colour)
+        self.unmake_move()
+        return legal
+
+    def generate_staged_moves(self, hash_move=0, killers=(), quiets=True):
+        """
+            Generates the colour to move's legal moves lazily in the order a search wants to try them, one stage at a time:
+            the hash move, then captures with the most valuable victim and least valuable attacker first (MVV-LVA), then the killer moves and last the other quiet moves.
+            A stage's moves are only generated once the moves before them have all been taken, so a search that cuts off on an early move never generates the rest.
+
+            Parameters
+            ----------
+                hash_move: integer
+                    The best move stored for the position, tried first if it is legal
+                killers: array of integers
+                    Quiet moves that caused cutoffs in sibling positions, tried before the other quiet moves if they are legal here
+                quiets: boolean
+                    False to stop after the captures (for the quiescence search)
+
+            Returns
+            -------
+                generator of integers
+                    Each legal encoded move once
+        """
+        if hash_move and self.is_legal(hash_move):
+            yield hash_move
+        mailbox = self.__mailbox
+        captures = self.__generate_moves(None, True, True, False)
+        if len(captures) > 1:
+            captures.sort(key=lambda move: _VICTIM_ORDER[mailbox[(move >> 6) & 63]] - _ATTACKER_ORDER[mailbox[move & 63]], reverse=True)
+        for move in captures:
+            if move != hash_move:
+                yield move
+        if not quiets:
+            return
+        en_passant = self.__en_passant
+        for killer in killers:
+            # Killers that capture here were already tried with the captures
+            to_square = (killer >> 6) & 63
+            if killer and killer != hash_move and not mailbox[to_square] and not (to_square == en_passant and mailbox[killer & 63] == 1 + self.__turn * 6 + PAWN) and self.is_legal(killer):
+                yield killer
+        # Pawn moves come first, so promotions (queen first) are tried before the other quiet moves
+        for move in self.__generate_moves(None, True, False, True):
+            if move != hash_move and move not in killers:
+                yield move
+
+    def __generate_moves(self, colour, legal, captures=True, quiets=True):
+        """
+            Shared body of generate_moves, generate_legal_moves and generate_staged_moves. Captures (including en passant) and quiet moves (including pawn pushes, promoting or not, and castling) can be left out separately.
+        """
+        if colour is None:
+            colour = self.__turn
+        moves = []
+        pieces = self.__pieces[colour]
+        own = self.__occupied[colour]
+        enemy = self.__occupied[colour ^ 1]
+        occupied = own | enemy
+        empty = ~occupied & FULL_BOARD if quiets else 0
+        king = pieces[KING]
+        legal = legal and king
+        check_mask = FULL_BOARD
+        pinned = {}
+        checkers = 0
+        if legal:
+            king_square = king.bit_length() - 1
+            checkers = self.attackers(king_square, colour ^ 1)
+            if checkers & (checkers - 1):
+                check_mask = 0
+            elif checkers:
+                check_mask = checkers | BETWEEN[king_square][checkers.bit_length() - 1]
+            pinned = self.pins(colour)
+        step = 8 if colour == BLACK else -8
+        last_row = 0xFF << 56 if colour == BLACK else 0xFF
+        pawn_attacks = PAWN_ATTACKS[colour]
+        en_passant_bit = 1 << self.__en_passant if self.__en_passant is not None and colour == self.__turn else 0
+        pawn_targets = enemy | en_passant_bit if captures else 0
+        for square in squares(pieces[PAWN]) if check_mask else ():
+            targets = pawn_attacks[square] & pawn_targets
+            one_step = square + step
+            if 0 <= one_step < 64 and (1 << one_step) & empty:
+                targets |= 1 << one_step
+                two_step = one_step + step
+                if (1 << square) & self.__unmoved and 0 <= two_step < 64 and (1 << two_step) & empty:
+                    targets |= 1 << two_step
+            if legal:
+                en_passant = targets & en_passant_bit
+                targets &= ~en_passant_bit & check_mask & pinned.get(square, FULL_BOARD)
+                if en_passant:
+                    # The captured pawn isn't on the target square, so the capture is played to see whether it uncovers the king
+                    self.make_move(square | (self.__en_passant << 6))
+                    if not self.in_check(colour):
+                        targets |= en_passant
+                    self.unmake_move()
+            for target in squares(targets):
+                if (1 << target) & last_row:
+                    for promotion in PROMOTION_TYPES:
+                        moves.append(square | (target << 6) | (promotion << 12))
+                else:
+                    moves.append(square | (target << 6))
+        # Quiet moves go to empty squares and captures to opposing pieces
+        targets_mask = (enemy if captures else 0) | empty
+        for p_type, attack_function in ((KNIGHT, None), (BISHOP, bishop_attacks), (ROOK, rook_attacks), (QUEEN, queen_attacks)):
+            for square in squares(pieces[p_type]) if check_mask else ():
+                if p_type == KNIGHT:
+                    targets = KNIGHT_ATTACKS[square]
+                else:
+                    targets = attack_function(square, occupied)
+                targets &= targets_mask
+                if legal:
+                    targets &= check_mask & pinned.get(square, FULL_BOARD)
+                for target in squares(targets):
+                    moves.append(square | (target << 6))
+        for square in squares(king):
+            targets = KING_ATTACKS[square] & targets_mask
+            castling = 0 if (legal and checkers) or not quiets else self.__castling_targets(colour, square)
+            if legal:
+                occupied_without_king = occupied ^ king
+                for target in squares(targets):
+                    if not self.is_attacked(target, colour ^ 1, occupied_without_king):
+                        moves.append(square | (target << 6))
+                for target in squares(castling):
+                    if not self.is_attacked((square + target) >> 1, colour ^ 1) and not self.is_attacked(target, colour ^ 1):
+                        moves.append(square | (target << 6))
+            else:
+                for target in squares(targets | castling):
+                    moves.append(square | (target << 6))
+        return moves
+
+    def is_checkmate(self):
+        """
+            Returns
+            -------
+                boolean: True if the colour to move is in check and has no legal moves
+        """
+        return self.in_check(self.__turn) and not self.has_legal_moves()
+
+    def is_stalemate(self):
+        """
+            Returns
+            -------
+                boolean: True if the colour to move isn't in check but has no legal moves, which draws the game
+        """
+        return not self.in_check(self.__turn) and not self.has_legal_moves()
+
+    def has_legal_moves(self):
+        """
+            Returns
+            -------
+                boolean: True if the colour to move has a legal move, the staged moves stop being generated as soon as one is found
+        """
+        return next(self.generate_staged_moves(), None) is not None
+
+    def make_move(self, move):
+        """
+            Plays an encoded move for the colour to move: captures whatever is on the target square (or the pawn passed by an en passant capture), moves the rook as well when the king castles and exchanges a promoting pawn.
+            An undo record (the move, the captured piece, and the unmoved squares, key, castling rights, en passant square, half move clock and evaluation totals before the move) is pushed so unmake_move can take the move back.
+
+            Parameters
+            ----------
+                move: integer
+                    The encoded move (see encode_move)
+        """
+        from_square = move & 63
+        to_square = (move >> 6) & 63
+        promotion = move >> 12
+        from_bit = 1 << from_square
+        to_bit = 1 << to_square
+        mailbox = self.__mailbox
+        code = mailbox[from_square]
+        colour, p_type = divmod(code - 1, 6)
+        en_passant = self.__en_passant
+        captured_square = to_square
+        if p_type == PAWN and to_square == en_passant:
+            # The captured pawn is beside the moving pawn, behind the square it skipped over
+            captured_square = to_square + (8 if colour == WHITE else -8)
+        captured_code = mailbox[captured_square]
+        captured = divmod(captured_code - 1, 6) if captured_code else None
+        self.__history.append((move, captured, self.__unmoved, self.__key, self.__castling_rights, en_passant, self.__halfmove_clock, self.__middlegame, self.__endgame, self.__phase))
+        new_code = 1 + colour * 6 + promotion if promotion else code
+        middlegame = self.__middlegame - CODE_SCORES[code][from_square] + CODE_SCORES[new_code][to_square]
+        endgame = self.__endgame - ENDGAME_CODE_SCORES[code][from_square] + ENDGAME_CODE_SCORES[new_code][to_square]
+        if promotion:
+            self.__phase += CODE_PHASES[new_code]
+        piece_keys = PIECE_KEYS[colour]
+        key = self.__key ^ BLACK_TO_MOVE_KEY ^ piece_keys[p_type][from_square] ^ piece_keys[promotion or p_type][to_square]
+        if en_passant is not None:
+            key ^= EN_PASSANT_KEYS[en_passant & 7]
+            self.__en_passant = None
+        if captured:
+            captured_bit = 1 << captured_square
+            self.__pieces[captured[0]][captured[1]] ^= captured_bit
+            self.__occupied[captured[0]] ^= captured_bit
+            mailbox[captured_square] = 0
+            key ^= PIECE_KEYS[captured[0]][captured[1]][captured_square]
+            middlegame -= CODE_SCORES[captured_code][captured_square]
+            endgame -= ENDGAME_CODE_SCORES[captured_code][captured_square]
+            self.__phase -= CODE_PHASES[captured_code]
+        if p_type == PAWN:
+            self.__halfmove_clock = 0
+            if to_square - from_square == 16 or from_square - to_square == 16:
+                skipped = (from_square + to_square) >> 1
+                if PAWN_ATTACKS[colour][skipped] & self.__pieces[colour ^ 1][PAWN]:
+                    self.__en_passant = skipped
+                    key ^= EN_PASSANT_KEYS[skipped & 7]
+        elif captured:
+            self.__halfmove_clock = 0
+        else:
+            self.__halfmove_clock += 1
+        if colour == BLACK:
+            self.__fullmove_number += 1
+        pieces = self.__pieces[colour]
+        pieces[p_type] ^= from_bit
+        pieces[promotion or p_type] |= to_bit
+        self.__occupied[colour] ^= from_bit | to_bit
+        mailbox[from_square] = 0
+        mailbox[to_square] = new_code
+        self.__key = key
+        moved_bits = from_bit | to_bit
+        if p_type == KING and (to_square - from_square == 2 or from_square - to_square == 2):
+            rook_from = (from_square & 56) + (7 if to_square > from_square else 0)
+            rook_to = (from_square + to_square) >> 1
+            pieces[ROOK] ^= (1 << rook_from) | (1 << rook_to)
+            self.__occupied[colour] ^= (1 << rook_from) | (1 << rook_to)
+            rook_code = mailbox[rook_from]
+            mailbox[rook_to] = rook_code
+            mailbox[rook_from] = 0
+            self.__key ^= piece_keys[ROOK][rook_from] ^ piece_keys[ROOK][rook_to]
+            middlegame += CODE_SCORES[rook_code][rook_to] - CODE_SCORES[rook_code][rook_from]
+            endgame += ENDGAME_CODE_SCORES[rook_code][rook_to] - ENDGAME_CODE_SCORES[rook_code][rook_from]
+            moved_bits |= 1 << rook_from
+        self.__middlegame = middlegame
+        self.__endgame = endgame
+        if self.__unmoved & moved_bits:
+            self.__unmoved &= ~moved_bits
+            self.__update_castling_key()
+        self.__turn = colour ^ 1
+
+    def unmake_move(self):
+        """
+            Takes back the last move played with make_move, restoring the position exactly as it was before.
+
+            Returns
+            -------
+                integer
+                    The encoded move that was taken back
+        """
+        move, captured, unmoved, self.__key, self.__castling_rights, en_passant, self.__halfmove_clock, self.__middlegame, self.__endgame, self.__phase = self.__history.pop()
+        self.__en_passant = en_passant
+        from_square = move & 63
+        to_square = (move >> 6) & 63
+        from_bit = 1 << from_square
+        to_bit = 1 << to_square
+        mailbox = self.__mailbox
+        colour, p_type = divmod(mailbox[to_square] - 1, 6)
+        pieces = self.__pieces[colour]
+        pieces[p_type] ^= to_bit
+        if move >> 12:
+            p_type = PAWN
+        pieces[p_type] |= from_bit
+        self.__occupied[colour] ^= from_bit | to_bit
+        mailbox[from_square] = 1 + colour * 6 + p_type
+        mailbox[to_square] = 0
+        if captured:
+            captured_square = to_square
+            if p_type == PAWN and to_square == en_passant:
+                captured_square = to_square + (8 if colour == WHITE else -8)
+            self.__pieces[captured[0]][captured[1]] |= 1 << captured_square
+            self.__occupied[captured[0]] |= 1 << captured_square
+            mailbox[captured_square] = 1 + captured[0] * 6 + captured[1]
+        if p_type == KING and (to_square - from_square == 2 or from_square - to_square == 2):
+            rook_from = (from_square & 56) + (7 if to_square > from_square else 0)
+            rook_to = (from_square + to_square) >> 1
+            pieces[ROOK] ^= (1 << rook_from) | (1 << rook_to)
+            self.__occupied[colour] ^= (1 << rook_from) | (1 << rook_to)
+            mailbox[rook_from] = mailbox[rook_to]
+            mailbox[rook_to] = 0
+        self.__unmoved = unmoved
+        self.__turn = colour
+        if colour == BLACK:
+            self.__fullmove_number -= 1
+        return move
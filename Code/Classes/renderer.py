@@ -0,0 +1,83 @@
+import pygame
+
+"""
+    Draws the game to the screen, only redrawing what changed since the last frame.
+"""
+
+SQUARE_SIZE = 75
+
+class Renderer():
+    """
+        Class for drawing frames with dirty rectangles.
+        The whole screen is only drawn when the background changes (ex: going from the menu to the board) or after invalidate is called.
+        Otherwise only the squares the board reports as dirty (moved and captured pieces, highlights added or cleared) are redrawn and
+        passed to pygame.display.update, and a frame where nothing changed draws nothing at all.
+    """
+    def __init__(self, screen):
+        """
+            Initialize the Renderer object
+
+            Parameters
+            ----------
+                screen: Pygame Display obj
+                    The display to draw on
+        """
+        self.__screen = screen
+        self.__background = None
+        self.__full_redraw = True
+
+    def invalidate(self):
+        """
+            Makes the next frame redraw the whole screen (ex: after starting a new game).
+        """
+        self.__full_redraw = True
+
+    def render(self, background, game=None):
+        """
+            Draws one frame.
+
+            Parameters
+            ----------
+                background: pygame Surface
+                    The background image, drawn at the top left corner of the screen
+                game: Game object
+                    The game whose pieces and highlights are drawn over the background, leave empty to only draw the background (ex: for the menu)
+
+            Returns
+            -------
+                array of pygame Rects
+                    The areas of the screen that were updated, empty if nothing changed
+        """
+        if background is not self.__background or self.__full_redraw:
+            self.__background = background
+            self.__full_redraw = False
+            self.__screen.fill((0, 0, 0))
+            self.__screen.blit(background, (0, 0))
+            if game:
+                game.get_board().pop_dirty_squares()
+                game.draw_pieces(self.__screen)
+            pygame.display.update()
+            return [self.__screen.get_rect()]
+        if not game:
+            return []
+        board = game.get_board()
+        dirty_squares = board.pop_dirty_squares()
+        if not dirty_squares:
+            return []
+        board_pos = board.return_board_pos()
+        pieces_board = board.get_pieces_board()
+        rects = []
+        for x_pos, y_pos in dirty_squares:
+            rect = pygame.Rect(board_pos[x_pos][y_pos], (SQUARE_SIZE, SQUARE_SIZE))
+            self.__screen.blit(background, rect, rect)
+            rects.append(rect)
+        for x_pos, y_pos in dirty_squares:
+            piece = pieces_board[x_pos][y_pos]
+            if piece:
+                piece.draw(self.__screen)
+        # Highlights go over the pieces, like in Game.draw_pieces
+        for position in board.get_potential_positions():
+            if position['Index'] in dirty_squares:
+                position['Button'].draw(self.__screen)
+        pygame.display.update(rects)
+        return rects
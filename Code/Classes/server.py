@@ -0,0 +1,407 @@
+from Classes.bitboard import *
+from Classes.book import OpeningBook
+from Classes.engine import Engine
+from Classes.fen import position_from_fen
+from Classes.notation import coordinate_to_move, san_to_move
+
+import asyncio
+import concurrent.futures
+import itertools
+import json
+import os
+import random
+import time
+
+"""
+    Server hosting many games at once over TCP, on the headless rules core (no pygame).
+    Clients send and receive JSON objects, one per line:
+        {"Action": "new", "Colour": "white", "Computer": true, "FEN": ...}   starts a game, against the computer or waiting for someone to join (Colour, Computer and FEN are optional)
+        {"Action": "join", "Game": 1}                                        takes the free colour in a game
+        {"Action": "move", "Game": 1, "Move": "e2e4"}                        plays a move, in coordinate notation or SAN
+    and get back:
+        {"Event": "joined", "Game": 1, "Colour": "white", "FEN": ...}
+        {"Event": "ack", "Game": 1, "Move": "e4"}                            the move was legal and has been played
+        {"Event": "position", "Game": 1, "Move": "e4", "FEN": ..., "Result": "*"}   sent to both players after every move
+        {"Event": "left", "Game": 1}                                         the other player disconnected
+        {"Event": "error", "Message": ...}                                   the request was rejected, or the computer couldn't move (with "Game")
+    Moves are checked and played by each game's Board. The games themselves come from a factory passed in by the script running the server
+    (Code/server.py hands over gamelogic's Game), so nothing in Classes depends on the top level scripts. The computer's moves are searched in a pool of worker processes,
+    so a long search never holds up the other games.
+"""
+
+# Engines built in an engine worker process, keyed by their settings
+_worker_engines = {}
+
+def _search_move(fen, time_limit, max_depth, book_path=None):
+    """
+        Searches a position in an engine worker process. Each worker maps the opening book itself, sharing the operating system's copy of the file.
+
+        Returns
+        -------
+            None: If there is no move to play
+            integer: The encoded move
+    """
+    key = (time_limit, max_depth, book_path)
+    if key not in _worker_engines:
+        _worker_engines[key] = Engine(time_limit, max_depth, book=OpeningBook(book_path) if book_path else None)
+    return _worker_engines[key].search(position_from_fen(fen))
+
+def _encode(message):
+    return (json.dumps(message) + '\n').encode()
+
+# The type each request field needs to have when it is given
+_FIELD_TYPES = {"Action": str, "Game": int, "Colour": str, "Computer": bool, "FEN": str, "Move": str}
+
+def _check_fields(request):
+    """
+        Raises
+        ------
+            ValueError
+                If one of the request's fields has the wrong type, ex: a list as the game number
+    """
+    for name, value in request.items():
+        expected = _FIELD_TYPES.get(name)
+        if expected and value is not None and (not isinstance(value, expected) or (expected is int and isinstance(value, bool))):
+            raise ValueError("{} needs to be a {}: {}".format(name, expected.__name__, json.dumps(value)))
+
+class GameServer():
+    """
+        Class for the asyncio game server. Each game is a JSON like session object:
+            {"Game": Game object, "Clients": [white's connection, black's connection], "Computer": colour the computer plays or None, "Thinking": whether a search is running}
+        A connection can play in any number of games (and both colours of the same game), and its games end when it disconnects.
+    """
+    def __init__(self, game_factory, host='127.0.0.1', port=8765, workers=None, engine_time=1.0, engine_depth=32, book_path=None):
+        """
+            Initialize the GameServer object
+
+            Parameters
+            ----------
+                game_factory: function
+                    Called with a FEN string (None for the usual starting position) to start a headless game, ex: lambda fen: Game(headless=True, fen=fen).
+                    The game needs get_board, get_result and play_move, as gamelogic's Game has
+                host: string
+                    Address to listen on, localhost by default
+                port: integer
+                    Port to listen on, 0 to pick a free one
+                workers: integer
+                    Number of processes searching the computer's moves, one per core by default
+                engine_time: float
+                    Seconds the computer may think about each move
+                engine_depth: integer
+                    Deepest search the computer runs
+                book_path: string
+                    Opening book file (see book.py) the computer plays its openings from
+        """
+        if engine_time <= 0 or engine_depth < 1:
+            raise ValueError("The engine needs a positive time limit and depth. engine_time: {} engine_depth: {}".format(engine_time, engine_depth))
+        self.__game_factory = game_factory
+        self.__host = host
+        self.__port = port
+        self.__workers = workers or os.cpu_count() or 1
+        if book_path and not os.path.exists(book_path):
+            raise ValueError("No such opening book: {}".format(book_path))
+        self.__engine_settings = (engine_time, engine_depth, book_path)
+        self.__games = {}
+        self.__game_ids = itertools.count(1)
+        self.__server = None
+        self.__pool = None
+        # Running engine searches, kept so their tasks aren't garbage collected
+        self.__searches = set()
+        # Connected clients' writers and the tasks reading from them
+        self.__clients = {}
+
+    async def start(self):
+        """
+            Starts listening for connections.
+
+            Returns
+            -------
+                integer: The port the server listens on
+        """
+        self.__pool = concurrent.futures.ProcessPoolExecutor(self.__workers)
+        self.__server = await asyncio.start_server(self.__handle_client, self.__host, self.__port, backlog=4096)
+        return self.__server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        """
+            Starts the server if it isn't running yet and serves until cancelled.
+        """
+        if not self.__server:
+            await self.start()
+        await self.__server.serve_forever()
+
+    async def close(self):
+        """
+            Stops listening, disconnects the clients, cancels running searches and shuts down the engine workers.
+        """
+        if self.__server:
+            self.__server.close()
+        for writer in list(self.__clients):
+            writer.close()
+        await asyncio.gather(*self.__clients.values(), return_exceptions=True)
+        if self.__server:
+            await self.__server.wait_closed()
+        for search in list(self.__searches):
+            search.cancel()
+        if self.__pool:
+            self.__pool.shutdown(wait=False, cancel_futures=True)
+
+    def get_game_count(self):
+        """
+            Returns
+            -------
+                integer: Number of games being played
+        """
+        return len(self.__games)
+
+    async def __handle_client(self, reader, writer):
+        """
+            Reads one connection's requests until it disconnects, then ends its games.
+        """
+        joined = set()
+        self.__clients[writer] = asyncio.current_task()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("Requests need to be JSON objects")
+                    self.__dispatch(request, writer, joined)
+                except ValueError as error:
+                    self.__send(writer, {"Event": "error", "Message": str(error)})
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            del self.__clients[writer]
+            for game_id in joined:
+                self.__leave(game_id, writer)
+            writer.close()
+
+    def __dispatch(self, request, writer, joined):
+        _check_fields(request)
+        action = request.get("Action")
+        if action == 'new':
+            self.__new_game(request, writer, joined)
+        elif action == 'join':
+            self.__join_game(request, writer, joined)
+        elif action == 'move':
+            self.__play_move(request, writer)
+        else:
+            raise ValueError("Unknown action: {}".format(action))
+
+    def __send(self, writer, message):
+        if not writer.is_closing():
+            writer.write(_encode(message))
+
+    def __get_session(self, request):
+        game_id = request.get("Game")
+        if game_id not in self.__games:
+            raise ValueError("No such game: {}".format(game_id))
+        return game_id, self.__games[game_id]
+
+    def __new_game(self, request, writer, joined):
+        """
+            Starts a game with the connection playing the requested colour. The other colour is played by the computer or left for someone to join.
+        """
+        colour = COLOUR_CODES.get(request.get("Colour", 'white'))
+        if colour is None:
+            raise ValueError("Only white and black are supported as colours: {}".format(request.get("Colour")))
+        game = self.__game_factory(request.get("FEN"))
+        game_id = next(self.__game_ids)
+        session = {"Game": game, "Clients": [None, None], "Computer": colour ^ 1 if request.get("Computer") else None, "Thinking": False}
+        session["Clients"][colour] = writer
+        self.__games[game_id] = session
+        joined.add(game_id)
+        self.__send(writer, {"Event": "joined", "Game": game_id, "Colour": COLOURS[colour], "FEN": game.get_board().to_fen()})
+        self.__start_search(game_id)
+
+    def __join_game(self, request, writer, joined):
+        """
+            Seats the connection at the game's free colour.
+        """
+        game_id, session = self.__get_session(request)
+        free = [colour for colour in (WHITE, BLACK) if session["Clients"][colour] is None and session["Computer"] != colour]
+        if not free:
+            raise ValueError("Game {} is full".format(game_id))
+        session["Clients"][free[0]] = writer
+        joined.add(game_id)
+        self.__send(writer, {"Event": "joined", "Game": game_id, "Colour": COLOURS[free[0]], "FEN": session["Game"].get_board().to_fen()})
+
+    def __play_move(self, request, writer):
+        """
+            Checks it's the connection's turn, plays its move on the game's Board (which rejects illegal moves), acknowledges it and sends the new position to both players.
+        """
+        game_id, session = self.__get_session(request)
+        game = session["Game"]
+        position = game.get_board().get_position()
+        if session["Clients"][position.get_turn()] is not writer:
+            raise ValueError("It isn't your turn in game {}".format(game_id))
+        text = request.get("Move") or ''
+        try:
+            move = coordinate_to_move(text)
+        except ValueError:
+            move = san_to_move(position, text)
+        san = game.play_move(move)
+        self.__send(writer, {"Event": "ack", "Game": game_id, "Move": san})
+        self.__broadcast(game_id, session, san)
+        self.__start_search(game_id)
+
+    def __broadcast(self, game_id, session, san):
+        game = session["Game"]
+        message = _encode({"Event": "position", "Game": game_id, "Move": san, "FEN": game.get_board().to_fen(), "Result": game.get_result()})
+        for client in set(session["Clients"]):
+            if client and not client.is_closing():
+                client.write(message)
+
+    def __start_search(self, game_id):
+        """
+            Sends the position to an engine worker when it's the computer's turn.
+        """
+        session = self.__games[game_id]
+        game = session["Game"]
+        if session["Computer"] != game.get_board().get_position().get_turn() or session["Thinking"] or game.get_result() != '*':
+            return
+        session["Thinking"] = True
+        search = asyncio.get_running_loop().create_task(self.__computer_move(game_id, game.get_board().to_fen()))
+        self.__searches.add(search)
+        search.add_done_callback(self.__searches.discard)
+
+    async def __computer_move(self, game_id, fen):
+        """
+            Waits for an engine worker's move without blocking the event loop, then plays it if the game is still going.
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            move = await loop.run_in_executor(self.__pool, _search_move, fen, *self.__engine_settings)
+        except Exception as error:
+            if isinstance(error, concurrent.futures.process.BrokenProcessPool):
+                # A worker died, the pool can't run anything else so it is replaced for the next searches
+                self.__pool = concurrent.futures.ProcessPoolExecutor(self.__workers)
+            move = None
+            self.__notify(game_id, {"Event": "error", "Game": game_id, "Message": "The computer couldn't move: {}".format(str(error) or type(error).__name__)})
+        finally:
+            if game_id in self.__games:
+                self.__games[game_id]["Thinking"] = False
+        session = self.__games.get(game_id)
+        if session is None or move is None:
+            return
+        try:
+            san = session["Game"].play_move(move)
+        except ValueError as error:
+            self.__notify(game_id, {"Event": "error", "Game": game_id, "Message": "The computer couldn't move: {}".format(error)})
+            return
+        self.__broadcast(game_id, session, san)
+
+    def __notify(self, game_id, message):
+        """
+            Sends a message to every player connected to a game.
+        """
+        session = self.__games.get(game_id)
+        if session is None:
+            return
+        for client in set(session["Clients"]):
+            if client:
+                self.__send(client, message)
+
+    def __leave(self, game_id, writer):
+        """
+            Removes a disconnected connection from a game. The game ends once none of its players are connected.
+        """
+        session = self.__games.get(game_id)
+        if session is None:
+            return
+        session["Clients"] = [None if client is writer else client for client in session["Clients"]]
+        if not any(session["Clients"]):
+            del self.__games[game_id]
+            return
+        self.__notify(game_id, {"Event": "left", "Game": game_id})
+
+# Knights going out and back, so benchmark games can go on as long as needed from the starting position
+_BENCHMARK_MOVES = ('g1f3', 'g8f6', 'f3g1', 'f6g8')
+
+async def benchmark(host, port, games=100, moves=20, interval=1.0, connections=100):
+    """
+        Load test for a running server: starts many games, each connection playing both colours of its share of them, then plays them all at once
+        with every game moving about once per interval, and measures how long each move takes to be acknowledged.
+
+        Parameters
+        ----------
+            host: string
+                The server's address
+            port: integer
+                The server's port
+            games: integer
+                Number of games played at the same time
+            moves: integer
+                Number of moves played in each game
+            interval: float
+                Average seconds between a game's moves (randomised so the games don't all move together)
+            connections: integer
+                Number of connections to spread the games over
+
+        Returns
+        -------
+            JSON object
+                The number of "Moves" acknowledged and the "Median", "P99" and "Max" acknowledgement times in milliseconds
+    """
+    latencies = []
+    connections = max(1, min(connections, games))
+
+    async def open_games(game_count):
+        """
+            Opens a connection and starts its games, so every game exists before any moves are timed.
+        """
+        reader, writer = await asyncio.open_connection(host, port, limit=1 << 20)
+        pending = {}
+        created = asyncio.Queue()
+
+        async def read_events():
+            while True:
+                line = await reader.readline()
+                if not line:
+                    return
+                event = json.loads(line)
+                if event["Event"] == 'joined' and event["Colour"] == 'white':
+                    created.put_nowait(event["Game"])
+                elif event["Event"] in ('ack', 'error') and event.get("Game") in pending:
+                    pending.pop(event["Game"]).set_result(event)
+                elif event["Event"] == 'error':
+                    raise ValueError(event["Message"])
+
+        async def play(game_id):
+            for index in range(moves):
+                await asyncio.sleep(random.uniform(0, 2 * interval))
+                acknowledged = asyncio.get_running_loop().create_future()
+                pending[game_id] = acknowledged
+                start = time.perf_counter()
+                writer.write(_encode({"Action": "move", "Game": game_id, "Move": _BENCHMARK_MOVES[index % 4]}))
+                event = await acknowledged
+                latencies.append((time.perf_counter() - start) * 1000)
+                if event["Event"] == 'error':
+                    raise ValueError(event["Message"])
+
+        reader_task = asyncio.get_running_loop().create_task(read_events())
+        game_ids = []
+        for game in range(game_count):
+            writer.write(_encode({"Action": "new"}))
+            game_id = await created.get()
+            writer.write(_encode({"Action": "join", "Game": game_id}))
+            game_ids.append(game_id)
+
+        async def play_games():
+            await asyncio.gather(*(play(game_id) for game_id in game_ids))
+            writer.close()
+            reader_task.cancel()
+        return play_games()
+
+    shares = [games // connections + (1 if index < games % connections else 0) for index in range(connections)]
+    players = await asyncio.gather(*(open_games(share) for share in shares))
+    await asyncio.gather(*players)
+    latencies.sort()
+    if not latencies:
+        return {"Moves": 0, "Median": 0.0, "P99": 0.0, "Max": 0.0}
+    return {"Moves": len(latencies), "Median": latencies[len(latencies) // 2], "P99": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))], "Max": latencies[-1]}
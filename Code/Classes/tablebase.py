@@ -0,0 +1,561 @@
+from Classes.bitboard import *
+
+import itertools
+import mmap
+import os
+
+"""
+    Endgame tablebases: the result of every position of a small set of material with perfect play, and how many half moves the win takes.
+
+    A table covers one material signature, ex: 'KQvK' (white's pieces, then black's). Colour swapped endings (KvKQ) are looked up in the
+    same table with the board flipped. Tables are generated by retrograde analysis: starting from the checkmates, the positions one move
+    before a loss are wins and the positions whose every move leads to a win for the opponent are losses, working back one half move at a
+    time. Captures and promotions leave the table, their results are read from the smaller tables generated first.
+
+    A table file is one byte per index, the index being the colour to move followed by each piece's square (6 bits each, in signature order):
+        0: draw (or a position that can't happen)
+        1 to 127: the colour to move wins, checkmating in that many half moves
+        128 to 255: the colour to move loses, being checkmated in (byte - 128) half moves
+    Files are memory mapped read-only, so probing reads one byte and every process shares the operating system's copy of the tables.
+    Castling and en passant aren't part of the index, positions where either is possible aren't probed.
+"""
+
+MAX_PIECES = 4
+SIGNATURE_LETTERS = 'PNBRQK'
+# Stronger pieces come first in a signature
+_LETTER_ORDER = 'KQRBNP'
+_PROMOTIONS = (QUEEN, ROOK, BISHOP, KNIGHT)
+LOSS = 128
+
+def _side_rank(types):
+    """
+        Sorting key for one side's pieces, more pieces and then stronger pieces first. The stronger side plays white in a table.
+    """
+    return (-len(types), [_LETTER_ORDER.index(SIGNATURE_LETTERS[p_type]) for p_type in types])
+
+def _sort_side(pieces):
+    return sorted(pieces, key=lambda piece: _LETTER_ORDER.index(SIGNATURE_LETTERS[piece[1]]))
+
+def table_index(pieces, turn):
+    """
+        Finds the table and index of a position. When black has the stronger pieces the board is flipped and the colours swapped.
+
+        Parameters
+        ----------
+            pieces: array of (integer, integer, integer)
+                The colour, piece type and square of every piece
+            turn: integer
+                The colour to move
+
+        Returns
+        -------
+            (string, integer)
+                The table's material signature and the position's index in it
+    """
+    white = _sort_side([piece for piece in pieces if piece[0] == WHITE])
+    black = _sort_side([piece for piece in pieces if piece[0] == BLACK])
+    if _side_rank([piece[1] for piece in black]) < _side_rank([piece[1] for piece in white]):
+        white, black = [(WHITE, p_type, square ^ 56) for colour, p_type, square in black], [(BLACK, p_type, square ^ 56) for colour, p_type, square in white]
+        turn ^= 1
+    signature = ''.join(SIGNATURE_LETTERS[piece[1]] for piece in white) + 'v' + ''.join(SIGNATURE_LETTERS[piece[1]] for piece in black)
+    index = turn
+    for piece in white + black:
+        index = index * 64 + piece[2]
+    return (signature, index)
+
+def parse_signature(signature):
+    """
+        Reads a material signature, ex: 'KRvK' or 'KPvKP'.
+
+        Parameters
+        ----------
+            signature: string
+                Each side's pieces as letters (K, Q, R, B, N, P), white first, separated by a 'v'
+
+        Returns
+        -------
+            (string, array of (integer, integer))
+                The table's signature (colours swapped if black is the stronger side) and the colour and type of each piece in index order
+
+        Raises
+        ------
+            ValueError
+                If the signature isn't valid, both sides need exactly one king and there can be at most MAX_PIECES pieces
+    """
+    sides = signature.upper().split('V')
+    if len(sides) != 2 or any(side.count('K') != 1 or any(letter not in SIGNATURE_LETTERS for letter in side) for side in sides):
+        raise ValueError("Invalid material signature: {}".format(signature))
+    if len(sides[0]) + len(sides[1]) > MAX_PIECES:
+        raise ValueError("Tables go up to {} pieces: {}".format(MAX_PIECES, signature))
+    pieces = [(colour, SIGNATURE_LETTERS.index(letter), 0) for colour, side in enumerate(sides) for letter in side]
+    table, index = table_index(pieces, WHITE)
+    white, black = table.split('v')
+    return (table, [(WHITE, SIGNATURE_LETTERS.index(letter)) for letter in white] + [(BLACK, SIGNATURE_LETTERS.index(letter)) for letter in black])
+
+def _dependencies(signature):
+    """
+        Lists the tables a table's captures and promotions lead to.
+
+        Returns
+        -------
+            set of strings
+                Their signatures, without the kings only ending (always a draw)
+    """
+    table, specs = parse_signature(signature)
+    found = set()
+    for captured in [None] + [index for index, spec in enumerate(specs) if spec[1] != KING]:
+        remaining = [spec for index, spec in enumerate(specs) if index != captured]
+        variants = [remaining]
+        for index, spec in enumerate(remaining):
+            if spec[1] == PAWN:
+                variants.extend(remaining[:index] + [(spec[0], promotion)] + remaining[index + 1:] for promotion in _PROMOTIONS)
+        for variant in variants:
+            if variant is remaining and captured is None:
+                continue
+            found.add(table_index([(colour, p_type, 0) for colour, p_type in variant], WHITE)[0])
+    found.discard('KvK')
+    return found
+
+def decode_value(value):
+    """
+        Reads a table byte.
+
+        Returns
+        -------
+            (integer, integer)
+                The result for the colour to move (1 win, 0 draw, -1 loss) and the half moves until checkmate (0 for a draw)
+    """
+    if value == 0:
+        return (0, 0)
+    if value < LOSS:
+        return (1, value)
+    return (-1, value - LOSS)
+
+def _encode_value(result, plies):
+    if plies >= LOSS:
+        raise ValueError("Mates longer than {} half moves don't fit in a table byte".format(LOSS - 1))
+    return plies if result > 0 else LOSS + plies
+
+def _table_path(directory, signature):
+    return os.path.join(directory, signature + '.tb')
+
+def generate_tables(signatures, directory, progress=None):
+    """
+        Generates tables along with the smaller tables they depend on. Tables already in the directory are kept.
+
+        Parameters
+        ----------
+            signatures: array of strings
+                Material signatures of the tables to generate, ex: ['KQvK', 'KRvK', 'KPvK']
+            directory: string
+                Directory the table files are written to
+            progress: function
+                Called with the statistics of each table once generated (see _TableGenerator.generate)
+
+        Returns
+        -------
+            array of JSON objects
+                The statistics of every table generated, smaller tables first
+    """
+    os.makedirs(directory, exist_ok=True)
+    generated = []
+    pending = [parse_signature(signature)[0] for signature in signatures]
+    tablebase = Tablebase(directory)
+    try:
+        while pending:
+            signature = pending[-1]
+            if os.path.exists(_table_path(directory, signature)):
+                pending.pop()
+                continue
+            missing = [dependency for dependency in sorted(_dependencies(signature)) if not os.path.exists(_table_path(directory, dependency))]
+            if missing:
+                pending.extend(missing)
+                continue
+            tablebase.refresh()
+            stats = _TableGenerator(signature, tablebase).generate(_table_path(directory, signature))
+            generated.append(stats)
+            if progress:
+                progress(stats)
+            pending.pop()
+    finally:
+        tablebase.close()
+    return generated
+
+class _TableGenerator():
+    """
+        Class for generating one table by retrograde analysis.
+        Every position is first set up by looking at its moves forwards: checkmates, stalemates, the results of its captures and promotions
+        (from the smaller tables) and the number of its moves that stay in the table. The results are then worked back from the checkmates
+        with moves played backwards (unmoves), resolving the positions in order of their distance to mate.
+    """
+    def __init__(self, signature, tablebase):
+        """
+            Initialize the _TableGenerator object
+
+            Parameters
+            ----------
+                signature: string
+                    The table's material signature
+                tablebase: Tablebase object
+                    Tablebase holding the tables that captures and promotions lead to
+        """
+        self.__signature, self.__specs = parse_signature(signature)
+        self.__tablebase = tablebase
+        self.__count = len(self.__specs)
+        self.__size = 2 * 64 ** self.__count
+        self.__kings = [index for index, spec in enumerate(self.__specs) if spec[1] == KING]
+        # How much a piece's square counts in the index
+        self.__weights = [64 ** (self.__count - 1 - index) for index in range(self.__count)]
+
+    def __in_check(self, placed, colour, occupied, captured=-1):
+        """
+            Checks whether colour's king is attacked, ignoring the piece at index captured.
+        """
+        king_bit = 1 << placed[self.__kings[colour]]
+        for index, (piece_colour, p_type) in enumerate(self.__specs):
+            if piece_colour != colour and index != captured and piece_attacks(piece_colour, p_type, placed[index], occupied) & king_bit:
+                return True
+        return False
+
+    def __is_valid(self, placed, turn):
+        """
+            Checks a position can happen: no two pieces on a square, no pawns on the first or last row and the colour not to move isn't in check.
+
+            Returns
+            -------
+                None: If the position can't happen
+                bitboard: The occupied squares
+        """
+        occupied = 0
+        for index, square in enumerate(placed):
+            bit = 1 << square
+            if occupied & bit or (self.__specs[index][1] == PAWN and square >> 3 in (0, 7)):
+                return None
+            occupied |= bit
+        if self.__in_check(placed, turn ^ 1, occupied):
+            return None
+        return occupied
+
+    def __setup(self, placed, turn, occupied):
+        """
+            Plays a position's moves forwards.
+
+            Returns
+            -------
+                (integer, integer, integer, integer, boolean)
+                    The number of legal moves, how many of them stay in the table, the quickest win through a capture or promotion (0 for none),
+                    the slowest loss through one (0 for none) and whether one of them draws
+        """
+        specs = self.__specs
+        own = 0
+        for index, (colour, p_type) in enumerate(specs):
+            if colour == turn:
+                own |= 1 << placed[index]
+        enemy = occupied & ~own
+        king = self.__kings[turn]
+        king_square = placed[king]
+        # Squares the king can't go to, seen through the king since it can't step back along a line it's checked on
+        danger = 0
+        for index, (colour, p_type) in enumerate(specs):
+            if colour != turn:
+                danger |= piece_attacks(colour, p_type, placed[index], occupied ^ (1 << king_square))
+        checked = danger & (1 << king_square)
+        # Other pieces can only uncover a check from the king's lines, or need to deal with a check already there
+        king_lines = queen_attacks(king_square, 0)
+        legal = 0
+        quiet = 0
+        exit_win = 0
+        exit_loss = 0
+        exit_draw = False
+        for index, (colour, p_type) in enumerate(specs):
+            if colour != turn:
+                continue
+            square = placed[index]
+            if p_type == PAWN:
+                step = -8 if turn == WHITE else 8
+                targets = PAWN_ATTACKS[turn][square] & enemy
+                if not occupied & (1 << (square + step)):
+                    targets |= 1 << (square + step)
+                    if square >> 3 == (6 if turn == WHITE else 1) and not occupied & (1 << (square + 2 * step)):
+                        targets |= 1 << (square + 2 * step)
+            else:
+                targets = piece_attacks(turn, p_type, square, occupied) & ~own
+            for target in squares(targets):
+                moved = list(placed)
+                moved[index] = target
+                target_bit = 1 << target
+                captured = placed.index(target) if enemy & target_bit else -1
+                if index == king:
+                    if danger & target_bit:
+                        continue
+                elif (checked or king_lines & (1 << square)) and self.__in_check(moved, turn, (occupied ^ (1 << square)) | target_bit, captured):
+                    continue
+                legal += 1
+                promotion = p_type == PAWN and target >> 3 in (0, 7)
+                if captured < 0 and not promotion:
+                    quiet += 1
+                    continue
+                pieces = [(specs[piece][0], specs[piece][1], moved[piece]) for piece in range(self.__count) if piece != captured]
+                for promoted in _PROMOTIONS if promotion else (None,):
+                    if promoted is not None:
+                        pieces = [(piece_colour, promoted if piece_square == target else piece_type, piece_square) for piece_colour, piece_type, piece_square in pieces]
+                    result, plies = self.__tablebase.probe_pieces(pieces, turn ^ 1)
+                    if result < 0:
+                        exit_win = min(exit_win, plies + 1) if exit_win else plies + 1
+                    elif result > 0:
+                        exit_loss = max(exit_loss, plies + 1)
+                    else:
+                        exit_draw = True
+        return (legal, quiet, exit_win, exit_loss, exit_draw)
+
+    def __unmoves(self, index, placed, turn):
+        """
+            Lists the positions one quiet move before a position: the colour that just moved takes back a move that didn't capture or promote.
+
+            Returns
+            -------
+                array of integers
+                    Their indexes
+        """
+        mover = turn ^ 1
+        occupied = 0
+        for square in placed:
+            occupied |= 1 << square
+        empty = ~occupied & FULL_BOARD
+        base = index + (mover - turn) * 64 ** self.__count
+        found = []
+        for piece, (colour, p_type) in enumerate(self.__specs):
+            if colour != mover:
+                continue
+            square = placed[piece]
+            if p_type == PAWN:
+                step = 8 if mover == WHITE else -8
+                origins = 0
+                origin = square + step
+                if 8 <= origin < 56 and (1 << origin) & empty:
+                    origins |= 1 << origin
+                    if square >> 3 == (4 if mover == WHITE else 3) and (1 << (origin + step)) & empty:
+                        origins |= 1 << (origin + step)
+            else:
+                origins = piece_attacks(mover, p_type, square, occupied) & empty
+            weight = self.__weights[piece]
+            for origin in squares(origins):
+                found.append(base + (origin - square) * weight)
+        return found
+
+    def __placement(self, index):
+        placed = []
+        for piece in range(self.__count):
+            index, square = divmod(index, 64)
+            placed.append(square)
+        placed.reverse()
+        return (placed, index)
+
+    def generate(self, path):
+        """
+            Generates the table and writes it to a file, replacing the file once it has been written completely.
+
+            Parameters
+            ----------
+                path: string
+                    The table file
+
+            Returns
+            -------
+                JSON object
+                    The table's "Signature", number of valid "Positions", "Wins", "Draws" and "Losses" for the colour to move and "Longest" mate in half moves
+        """
+        size = self.__size
+        # 0: can't happen, 1: not resolved yet, 2: resolved
+        state = bytearray(size)
+        values = bytearray(size)
+        remaining = bytearray(size)
+        exit_losses = bytearray(size)
+        # Quickest win found so far, a win through a capture or promotion can still be beaten by a quieter move
+        best_wins = bytearray(size)
+        wins = [[] for plies in range(LOSS + 1)]
+        losses = [[] for plies in range(LOSS + 1)]
+        index = 0
+        for turn in (WHITE, BLACK):
+            for placed in itertools.product(range(64), repeat=self.__count):
+                occupied = self.__is_valid(placed, turn)
+                if occupied is not None:
+                    legal, quiet, exit_win, exit_loss, exit_draw = self.__setup(placed, turn, occupied)
+                    state[index] = 1
+                    if not legal:
+                        if self.__in_check(placed, turn, occupied):
+                            losses[0].append(index)
+                        else:
+                            state[index] = 2
+                    elif exit_win:
+                        best_wins[index] = exit_win
+                        wins[exit_win].append(index)
+                    elif exit_draw:
+                        # A drawing way out means the position is a draw at worst, it only needs telling apart from a win
+                        remaining[index] = 255
+                    elif not quiet:
+                        losses[exit_loss].append(index)
+                    else:
+                        remaining[index] = quiet
+                        exit_losses[index] = exit_loss
+                index += 1
+        for plies in range(LOSS):
+            for index in losses[plies]:
+                if state[index] != 1:
+                    continue
+                state[index] = 2
+                values[index] = _encode_value(-1, plies)
+                placed, turn = self.__placement(index)
+                for previous in self.__unmoves(index, placed, turn):
+                    if state[previous] == 1 and (not best_wins[previous] or plies + 1 < best_wins[previous]):
+                        best_wins[previous] = plies + 1
+                        wins[plies + 1].append(previous)
+            for index in wins[plies]:
+                if state[index] != 1:
+                    continue
+                state[index] = 2
+                values[index] = _encode_value(1, plies)
+                placed, turn = self.__placement(index)
+                for previous in self.__unmoves(index, placed, turn):
+                    if state[previous] != 1 or best_wins[previous] or remaining[previous] == 255:
+                        continue
+                    remaining[previous] -= 1
+                    if not remaining[previous]:
+                        losses[max(plies + 1, exit_losses[previous])].append(previous)
+        if wins[LOSS] or losses[LOSS]:
+            raise ValueError("Mates longer than {} half moves don't fit in a table byte".format(LOSS - 1))
+        temporary_path = path + '.tmp'
+        with open(temporary_path, 'wb') as stream:
+            stream.write(values)
+        os.replace(temporary_path, path)
+        positions = state.count(1) + state.count(2)
+        table_wins = sum(1 for value in values if 0 < value < LOSS)
+        table_losses = sum(1 for value in values if value >= LOSS)
+        return {"Signature": self.__signature, "Positions": positions, "Wins": table_wins, "Draws": positions - table_wins - table_losses, "Losses": table_losses, "Longest": max((value & 127 for value in values), default=0)}
+
+class Tablebase():
+    """
+        Class for probing the tables in a directory. Each table is memory mapped read-only the first time it's needed.
+    """
+    def __init__(self, directory):
+        """
+            Initialize the Tablebase object
+
+            Parameters
+            ----------
+                directory: string
+                    Directory holding the table files (see generate_tables)
+        """
+        self.__directory = directory
+        self.__maps = {}
+        self.__max_pieces = 0
+        self.refresh()
+
+    def __getstate__(self):
+        """
+            Sending the tablebase to another process only sends its directory, the other process maps the same files.
+        """
+        return {"Directory": self.__directory}
+
+    def __setstate__(self, state):
+        self.__init__(state["Directory"])
+
+    def refresh(self):
+        """
+            Looks for tables added to the directory since it was last read.
+        """
+        self.__maps = {signature: table for signature, table in self.__maps.items() if table is not None}
+        self.__max_pieces = max([len(signature) - 1 for signature in self.get_signatures()], default=0)
+
+    def get_signatures(self):
+        """
+            Returns
+            -------
+                array of strings: Material signatures of the tables in the directory
+        """
+        if not os.path.isdir(self.__directory):
+            return []
+        return sorted(name[:-3] for name in os.listdir(self.__directory) if name.endswith('.tb'))
+
+    def get_max_pieces(self):
+        """
+            Returns
+            -------
+                integer: Number of pieces in the largest table, positions with more pieces are never in the tablebase
+        """
+        return self.__max_pieces
+
+    def __table(self, signature):
+        """
+            Maps a table the first time it's used.
+
+            Returns
+            -------
+                None: If the table hasn't been generated
+                mmap object: The table
+        """
+        if signature not in self.__maps:
+            path = _table_path(self.__directory, signature)
+            table = None
+            if os.path.exists(path):
+                if os.path.getsize(path) != 2 * 64 ** (len(signature) - 1):
+                    raise ValueError("{} isn't the size of a {} table".format(path, signature))
+                with open(path, 'rb') as stream:
+                    table = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+            self.__maps[signature] = table
+        return self.__maps[signature]
+
+    def probe_pieces(self, pieces, turn):
+        """
+            Looks up a position given as a list of pieces.
+
+            Parameters
+            ----------
+                pieces: array of (integer, integer, integer)
+                    The colour, piece type and square of every piece, both kings included
+                turn: integer
+                    The colour to move
+
+            Returns
+            -------
+                None: If the position's table hasn't been generated
+                (integer, integer): The result for the colour to move (1 win, 0 draw, -1 loss) and the half moves until checkmate
+        """
+        signature, index = table_index(pieces, turn)
+        if signature == 'KvK':
+            return (0, 0)
+        table = self.__table(signature)
+        if table is None:
+            return None
+        return decode_value(table[index])
+
+    def probe(self, position):
+        """
+            Looks up a position.
+
+            Parameters
+            ----------
+                position: Position object
+                    The position to look up
+
+            Returns
+            -------
+                None: If the position isn't in the tablebase (too many pieces, castling or en passant possible or the table hasn't been generated)
+                (integer, integer): The result for the colour to move (1 win, 0 draw, -1 loss) and the half moves until checkmate
+        """
+        occupied = position.get_occupied()
+        if bin(occupied).count('1') > self.__max_pieces or position.get_en_passant() is not None or position.get_castling_rights():
+            return None
+        if not position.get_pieces(WHITE, KING) or not position.get_pieces(BLACK, KING):
+            return None
+        pieces = [(colour, p_type, square) for colour in (WHITE, BLACK) for p_type in range(6) for square in squares(position.get_pieces(colour, p_type))]
+        return self.probe_pieces(pieces, position.get_turn())
+
+    def close(self):
+        """
+            Unmaps the tables.
+        """
+        for table in self.__maps.values():
+            if table is not None:
+                table.close()
+        self.__maps = {}
@@ -0,0 +1,337 @@
+from Classes.bitboard import *
+from Classes.book import OpeningBook
+from Classes.engine import Engine
+from Classes.fen import START_FEN, position_from_fen
+from Classes.notation import move_to_san
+from Classes.pgn import read_games, write_game
+from Classes.tablebase import Tablebase
+
+import math
+import multiprocessing
+import os
+import random
+
+"""
+    Self-play tournaments between two engine settings, for measuring whether an engine change is an improvement.
+    Games are played headlessly on Position objects across a pool of worker processes and written to a PGN file as they finish,
+    which is also how an interrupted tournament picks up where it left off.
+"""
+
+# Engines built in a worker process, keyed by their settings, so each worker only creates their transposition tables once
+_worker_engines = {}
+
+# Player settings and the Engine argument each one sets
+PLAYER_SETTINGS = {'depth': ('max_depth', int), 'time': ('time_limit', float), 'hash': ('hash_mb', float), 'book': ('book', str), 'tablebase': ('tablebase', str)}
+
+def parse_player(description):
+    """
+        Reads a player's engine settings from a description like 'depth=3,time=0.5,hash=8,book=openings.bin'. Settings left out keep the Engine's defaults.
+
+        Parameters
+        ----------
+            description: string
+                Comma separated settings: depth (maximum search depth), time (seconds per move), hash (transposition table megabytes), book (opening book file) and tablebase (endgame tables directory)
+
+        Returns
+        -------
+            dictionary
+                Keyword arguments for the Engine object
+    """
+    settings = {}
+    for setting in description.split(','):
+        if not setting.strip():
+            continue
+        name, _, value = setting.partition('=')
+        if name.strip() not in PLAYER_SETTINGS:
+            raise ValueError("Unknown player setting: {}".format(setting))
+        argument, kind = PLAYER_SETTINGS[name.strip()]
+        settings[argument] = kind(value)
+    return settings
+
+def elo_difference(wins, draws, losses):
+    """
+        Estimates the Elo difference between two players from a match score, with the margin of a 95% confidence interval.
+
+        Parameters
+        ----------
+            wins: integer
+                Games won by the first player
+            draws: integer
+                Games drawn
+            losses: integer
+                Games lost by the first player
+
+        Returns
+        -------
+            (float, float)
+                The Elo difference in the first player's favour and the margin either side of it (infinite while the score is 0% or 100%)
+    """
+    games = wins + draws + losses
+    if games == 0:
+        return (0.0, float('inf'))
+    score = (wins + draws / 2) / games
+    deviation = math.sqrt((wins * (1 - score) ** 2 + draws * (0.5 - score) ** 2 + losses * score ** 2) / games / games)
+    elo = lambda score: 400 * math.log10(score / (1 - score)) if 0 < score < 1 else math.copysign(float('inf'), score - 0.5)
+    low = elo(score - 1.96 * deviation)
+    high = elo(score + 1.96 * deviation)
+    return (elo(score), (high - low) / 2)
+
+def _random_opening(seed, plies):
+    """
+        Plays random legal moves from the starting position, so games don't all follow the same line.
+
+        Returns
+        -------
+            array of integers
+                The encoded moves
+    """
+    generator = random.Random(seed)
+    position = position_from_fen(START_FEN)
+    moves = []
+    for ply in range(plies):
+        candidates = position.generate_legal_moves()
+        if not candidates:
+            break
+        move = generator.choice(candidates)
+        position.make_move(move)
+        moves.append(move)
+    return moves
+
+def _get_engine(settings):
+    key = tuple(sorted(settings.items()))
+    if key not in _worker_engines:
+        # Each worker maps the book and table files itself, they all share the operating system's copy of them
+        if 'book' in settings:
+            settings = dict(settings, book=OpeningBook(settings['book']))
+        if 'tablebase' in settings:
+            settings = dict(settings, tablebase=Tablebase(settings['tablebase']))
+        _worker_engines[key] = Engine(**settings)
+    return _worker_engines[key]
+
+def _adjudicate(position, keys, scores, rules):
+    """
+        Checks whether the game is over before the colour to move plays.
+
+        Returns
+        -------
+            None: If the game goes on
+            (string, string): The result and the reason the game ended
+    """
+    colour = position.get_turn()
+    winner = '0-1' if colour == WHITE else '1-0'
+    if not position.get_pieces(colour, KING):
+        return (winner, 'king captured')
+    # Neither side can mate with nothing but the kings left, or with a lone knight or bishop against a bare king
+    others = position.get_occupied() & ~(position.get_pieces(WHITE, KING) | position.get_pieces(BLACK, KING))
+    minors = position.get_pieces(WHITE, KNIGHT) | position.get_pieces(WHITE, BISHOP) | position.get_pieces(BLACK, KNIGHT) | position.get_pieces(BLACK, BISHOP)
+    if not others or (not others & (others - 1) and others & minors):
+        return ('1/2-1/2', 'insufficient material')
+    if position.get_halfmove_clock() >= 100:
+        return ('1/2-1/2', 'fifty move rule')
+    if keys.count(position.get_key()) >= 3:
+        return ('1/2-1/2', 'repetition')
+    if len(keys) > rules["MaxPlies"]:
+        return ('1/2-1/2', 'move limit')
+    resign_moves = rules["ResignMoves"]
+    if resign_moves and len(scores) >= resign_moves:
+        recent = scores[-resign_moves:]
+        if all(score >= rules["ResignScore"] for score in recent):
+            return ('1-0', 'adjudicated')
+        if all(score <= -rules["ResignScore"] for score in recent):
+            return ('0-1', 'adjudicated')
+    return None
+
+def play_game(task):
+    """
+        Plays one game between two engines. Run in the worker processes.
+
+        Parameters
+        ----------
+            task: JSON object
+                The game's "Index", "White" and "Black" engine settings, "Opening" moves and adjudication "Rules"
+
+        Returns
+        -------
+            JSON object
+                The task's fields plus the "Moves" in SAN, the "Result" and the "Termination" reason
+    """
+    position = position_from_fen(START_FEN)
+    engines = (_get_engine(task["White"]), _get_engine(task["Black"]))
+    for engine in engines:
+        engine.get_table().clear()
+    sans = []
+    keys = [position.get_key()]
+    # Engine scores from white's point of view, for resign adjudication
+    scores = []
+    result = None
+    opening = list(task["Opening"])
+    while result is None:
+        result = _adjudicate(position, keys, scores, task["Rules"])
+        if result:
+            break
+        colour = position.get_turn()
+        if opening:
+            move = opening.pop(0)
+        else:
+            engine = engines[colour]
+            move = engine.search(position)
+            if move is None:
+                result = ('0-1' if colour == WHITE else '1-0', 'checkmate') if position.in_check(colour) else ('1/2-1/2', 'stalemate')
+                break
+            score = engine.get_score()
+            scores.append(score if colour == WHITE else -score)
+        sans.append(move_to_san(position, move))
+        position.make_move(move)
+        keys.append(position.get_key())
+    finished = dict(task)
+    finished["Moves"] = sans
+    finished["Result"], finished["Termination"] = result
+    return finished
+
+class Tournament():
+    """
+        Class for running a match of self-play games between two engine settings.
+        Games come in pairs that share a random opening, with the players swapping colours, so neither player is favoured by the openings.
+        Each finished game is appended to the PGN file straight away, and games already in the file (matched by their Round tag) are skipped,
+        so running the same tournament again after an interruption only plays the missing games.
+    """
+    def __init__(self, first_player, second_player, games=100, pgn_path=None, workers=None, opening_plies=4, max_plies=400, resign_score=1000, resign_moves=8, seed=0):
+        """
+            Initialize the Tournament object
+
+            Parameters
+            ----------
+                first_player: string
+                    Engine settings of the first player (see parse_player)
+                second_player: string
+                    Engine settings of the second player
+                games: integer
+                    Number of games to play
+                pgn_path: string
+                    File the games are written to and resumed from, leave empty to not save them
+                workers: integer
+                    Number of processes to play games in, all cores by default
+                opening_plies: integer
+                    Number of random half moves each opening starts with
+                max_plies: integer
+                    Half moves after which a game is adjudicated a draw
+                resign_score: integer
+                    Score in centipawns at which a game is adjudicated won...
+                resign_moves: integer
+                    ...once both engines' scores have agreed on it for this many half moves in a row, 0 to never adjudicate
+                seed: integer
+                    Seed for the random openings, the same seed plays the same openings
+        """
+        if games < 1 or opening_plies < 0 or max_plies < 1:
+            raise ValueError("Invalid tournament settings. games: {} opening_plies: {} max_plies: {}".format(games, opening_plies, max_plies))
+        self.__players = (first_player, second_player)
+        self.__settings = (parse_player(first_player), parse_player(second_player))
+        self.__games = games
+        self.__pgn_path = pgn_path
+        self.__workers = workers or os.cpu_count() or 1
+        self.__opening_plies = opening_plies
+        self.__rules = {"MaxPlies": max_plies, "ResignScore": resign_score, "ResignMoves": resign_moves}
+        self.__seed = seed
+        self.__results = {"Wins": 0, "Draws": 0, "Losses": 0}
+
+    def get_results(self):
+        """
+            Returns
+            -------
+                JSON object: The first player's "Wins", "Draws" and "Losses" so far
+        """
+        return dict(self.__results)
+
+    def get_elo(self):
+        """
+            Returns
+            -------
+                (float, float): The first player's Elo difference and its 95% margin (see elo_difference)
+        """
+        return elo_difference(self.__results["Wins"], self.__results["Draws"], self.__results["Losses"])
+
+    def __task(self, index):
+        """
+            Describes one game. The first player has white in even games and black in odd ones.
+        """
+        first_is_white = index % 2 == 0
+        white, black = (0, 1) if first_is_white else (1, 0)
+        return {
+            "Index": index,
+            "FirstIsWhite": first_is_white,
+            "White": self.__settings[white],
+            "Black": self.__settings[black],
+            "WhiteName": self.__players[white],
+            "BlackName": self.__players[black],
+            "Opening": _random_opening(self.__seed * 1000003 + index // 2, self.__opening_plies),
+            "Rules": self.__rules
+        }
+
+    def __count(self, result, first_is_white):
+        """
+            Adds a game's result to the first player's score.
+        """
+        if result == '1/2-1/2':
+            self.__results["Draws"] += 1
+        elif result in ('1-0', '0-1'):
+            self.__results["Wins" if (result == '1-0') == first_is_white else "Losses"] += 1
+
+    def __finished_games(self):
+        """
+            Reads the games already in the PGN file and counts their results. Games without a result or whose Round tag isn't a game number (ex: a hand edited file) are played again.
+
+            Returns
+            -------
+                set of integers: Indexes of the games already played
+        """
+        played = set()
+        if not self.__pgn_path or not os.path.exists(self.__pgn_path):
+            return played
+        with open(self.__pgn_path, encoding='utf-8') as stream:
+            for game in read_games(stream):
+                round_tag = game["Tags"].get('Round', '')
+                if not round_tag.isdecimal():
+                    continue
+                index = int(round_tag) - 1
+                if 0 <= index < self.__games and index not in played and game["Result"] != '*':
+                    played.add(index)
+                    self.__count(game["Result"], index % 2 == 0)
+        return played
+
+    def run(self, progress=None):
+        """
+            Plays the games that haven't been played yet, spreading them across the worker processes.
+
+            Parameters
+            ----------
+                progress: function
+                    Called with each finished game (see play_game) and the results so far, ex: for printing progress
+
+            Returns
+            -------
+                JSON object: The first player's "Wins", "Draws" and "Losses"
+        """
+        self.__results = {"Wins": 0, "Draws": 0, "Losses": 0}
+        played = self.__finished_games()
+        tasks = [self.__task(index) for index in range(self.__games) if index not in played]
+        if not tasks:
+            return self.get_results()
+        stream = open(self.__pgn_path, 'a', encoding='utf-8') if self.__pgn_path else None
+        pool = multiprocessing.Pool(min(self.__workers, len(tasks))) if self.__workers > 1 else None
+        try:
+            games = pool.imap_unordered(play_game, tasks) if pool else map(play_game, tasks)
+            for game in games:
+                self.__count(game["Result"], game["FirstIsWhite"])
+                if stream:
+                    tags = {"Event": "Self-play", "Round": game["Index"] + 1, "White": game["WhiteName"], "Black": game["BlackName"], "SetUp": "1", "FEN": START_FEN, "Termination": game["Termination"]}
+                    write_game(stream, game["Moves"], tags, game["Result"])
+                    stream.flush()
+                if progress:
+                    progress(game, self.get_results())
+        finally:
+            if pool:
+                pool.terminate()
+                pool.join()
+            if stream:
+                stream.close()
+        return self.get_results()
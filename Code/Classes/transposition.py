@@ -0,0 +1,140 @@
+from array import array
+
+"""
+    Fixed size transposition table for caching search results by Zobrist key.
+"""
+
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+# A bucket is two entries of two 64-bit words (key check word, data word)
+BUCKET_BYTES = 32
+SCORE_OFFSET = 1 << 31
+
+class TranspositionTable():
+    """
+        Class for the search's cache of positions it has already searched, keyed by the position's Zobrist key.
+        The table is one preallocated array of 64-bit words, so its memory use never grows past the size asked for. Each key maps to a bucket of two entries:
+        the first is only replaced by a search at least as deep (depth-preferred), the second takes whatever the first didn't (always-replace).
+        An entry's data (best move, score, depth and bound type) is packed into one word and stored next to the key XOR the data, so an entry written half way
+        (for example by another process sharing the buffer) doesn't match its key and is ignored.
+    """
+    def __init__(self, size_mb=16, buffer=None):
+        """
+            Initialize the TranspositionTable object
+
+            Parameters
+            ----------
+                size_mb: float
+                    Memory for the table in megabytes. The number of buckets is rounded down to a power of two so a key can be masked to its bucket.
+                buffer: writable buffer
+                    Memory to keep the table in instead of allocating it (e.g. shared memory), it must hold at least size_mb megabytes.
+        """
+        buckets = int(size_mb * 1024 * 1024) // BUCKET_BYTES
+        if buckets < 1:
+            raise ValueError("The transposition table needs room for at least one bucket ({} bytes): {} MB".format(BUCKET_BYTES, size_mb))
+        self.__buckets = 1 << (buckets.bit_length() - 1)
+        self.__mask = self.__buckets - 1
+        if buffer is None:
+            self.__words = array('Q', bytes(self.__buckets * BUCKET_BYTES))
+            self.__bytes = memoryview(self.__words).cast('B')
+        else:
+            if memoryview(buffer).nbytes < self.__buckets * BUCKET_BYTES:
+                raise ValueError("The buffer is too small for a {} MB transposition table".format(size_mb))
+            self.__bytes = memoryview(buffer).cast('B')[:self.__buckets * BUCKET_BYTES]
+            self.__words = self.__bytes.cast('Q')
+        self.__hits = 0
+        self.__misses = 0
+        self.__collisions = 0
+        self.__stores = 0
+
+    def get_size(self):
+        """
+            Returns
+            -------
+                integer: The memory held by the table's entries in bytes
+        """
+        return self.__buckets * BUCKET_BYTES
+
+    def get_stats(self):
+        """
+            Returns
+            -------
+                JSON object: Counters since the table was created or cleared, with fields for: hits, misses, collisions (a probe finding only other positions' entries in its bucket) and stores.
+        """
+        return {
+            "Hits": self.__hits,
+            "Misses": self.__misses,
+            "Collisions": self.__collisions,
+            "Stores": self.__stores
+        }
+
+    def clear(self):
+        """
+            Empties every entry and resets the counters.
+        """
+        self.__bytes[:] = bytes(len(self.__bytes))
+        self.__hits = 0
+        self.__misses = 0
+        self.__collisions = 0
+        self.__stores = 0
+
+    def probe(self, key):
+        """
+            Looks up the entry stored for a position.
+
+            Parameters
+            ----------
+                key: integer
+                    The position's 64-bit Zobrist key
+
+            Returns
+            -------
+                None: If the position isn't in the table
+                (integer, integer, integer, integer): The entry's depth, bound type (EXACT, LOWER_BOUND or UPPER_BOUND), score and best move
+        """
+        words = self.__words
+        index = (key & self.__mask) << 2
+        occupied = False
+        for slot in (index, index + 2):
+            data = words[slot + 1]
+            if data:
+                if words[slot] ^ data == key:
+                    self.__hits += 1
+                    return ((data >> 48) & 0xFF, data >> 56, ((data >> 16) & 0xFFFFFFFF) - SCORE_OFFSET, data & 0xFFFF)
+                occupied = True
+        self.__misses += 1
+        if occupied:
+            self.__collisions += 1
+        return None
+
+    def store(self, key, depth, bound, score, move):
+        """
+            Saves a search result for a position. The depth-preferred entry is replaced when it holds the same position or the new search is at least as deep,
+            otherwise the result goes in the always-replace entry.
+
+            Parameters
+            ----------
+                key: integer
+                    The position's 64-bit Zobrist key
+                depth: integer
+                    Depth the position was searched to
+                bound: integer
+                    EXACT, LOWER_BOUND (the score is at least this) or UPPER_BOUND (the score is at most this)
+                score: integer
+                    The search score
+                move: integer
+                    The best encoded move found, 0 for none
+        """
+        words = self.__words
+        index = (key & self.__mask) << 2
+        data = (bound << 56) | (min(depth, 0xFF) << 48) | ((score + SCORE_OFFSET) << 16) | move
+        stored = words[index + 1]
+        if words[index] ^ stored == key or not stored or depth >= (stored >> 48) & 0xFF:
+            slot = index
+        else:
+            slot = index + 2
+        words[slot] = key ^ data
+        words[slot + 1] = data
+        self.__stores += 1
@@ -0,0 +1,29 @@
+"""
+    Zobrist keys for hashing positions. A position's key is the XOR of one random 64-bit number per piece on its square,
+    one for the current castling rights, one for the file of a pawn that can be taken en passant and one more when black
+    is to move, so a move only needs to XOR in and out the numbers for what it changes.
+
+    The numbers come from a fixed splitmix64 sequence rather than the random module so that keys are the same in every
+    process and Python version (keys get stored on disk and shared between worker processes).
+"""
+
+def _splitmix64(count, seed=0x2545F4914F6CDD1D):
+    numbers = []
+    state = seed
+    for i in range(count):
+        state = (state + 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF
+        number = state
+        number = ((number ^ (number >> 30)) * 0xBF58476D1CE4E5B9) & 0xFFFFFFFFFFFFFFFF
+        number = ((number ^ (number >> 27)) * 0x94D049BB133111EB) & 0xFFFFFFFFFFFFFFFF
+        numbers.append(number ^ (number >> 31))
+    return numbers
+
+_NUMBERS = _splitmix64(2 * 6 * 64 + 16 + 1 + 8)
+
+# PIECE_KEYS[colour][piece type][square]
+PIECE_KEYS = tuple(tuple(tuple(_NUMBERS[(colour * 6 + p_type) * 64 + square] for square in range(64)) for p_type in range(6)) for colour in range(2))
+# CASTLING_KEYS[rights], where rights has one bit per castling option (see Position.get_castling_rights)
+CASTLING_KEYS = tuple(_NUMBERS[768 + rights] if rights else 0 for rights in range(16))
+BLACK_TO_MOVE_KEY = _NUMBERS[784]
+# EN_PASSANT_KEYS[file of the en passant square]
+EN_PASSANT_KEYS = tuple(_NUMBERS[785 + file] for file in range(8))
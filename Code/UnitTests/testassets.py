@@ -0,0 +1,36 @@
+import unittest
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import pygame
+from Classes.assets import *
+from Classes.button import Button
+
+class TestAssetMethods(unittest.TestCase):
+    def setUp(self):
+        clear_images()
+
+    def test_images_are_loaded_once(self):
+        surface = load_image('Images/knight.png')
+        self.assertIs(surface, load_image('Images/knight.png'))
+        Button(200, 200, 'Images/knight.png')
+        button = Button(300, 300, 'Images/pawn.png')
+        button.update_image('Images/knight.png')
+        self.assertIs(surface, load_image('Images/knight.png'))
+        self.assertRaises(ValueError, lambda: load_image('Images/fake_image.png'))
+
+    def test_preload_converts_images(self):
+        pygame.display.init()
+        try:
+            load_image('Images/pawn.png')
+            pygame.display.set_mode((690, 690))
+            self.assertEqual(len([name for name in os.listdir('Images') if name.endswith(('.png', '.jpg'))]), preload_images())
+            # Images cached before the display existed are converted once it does
+            self.assertEqual(pygame.display.get_surface().get_bitsize(), load_image('Images/pawn.png').get_bitsize())
+            self.assertIs(load_image('Images/chess_board.jpg'), load_image('Images/chess_board.jpg'))
+        finally:
+            pygame.display.quit()
+            clear_images()
+
+if __name__ == '__main__':
+    unittest.main()
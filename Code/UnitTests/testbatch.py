@@ -0,0 +1,66 @@
+import unittest
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from Classes.bitboard import *
+from Classes.evaluation import evaluate
+from Classes.fen import START_FEN, position_from_fen
+from gamelogic import Game
+
+try:
+    import numpy
+    from Classes import batch
+    from Classes.batch import *
+except ImportError:
+    numpy = None
+
+KIWIPETE = 'r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1'
+
+@unittest.skipUnless(numpy, 'Batch evaluation needs NumPy')
+class TestBatchMethods(unittest.TestCase):
+    def test_packPositionsAndBoards(self):
+        game = Game(headless=True)
+        mailboxes, turns = pack_boards([game.get_board()])
+        self.assertEqual((1, 64), mailboxes.shape)
+        self.assertEqual(numpy.uint8, mailboxes.dtype)
+        pieces_board = game.get_board().get_pieces_board()
+        for square in range(64):
+            x_pos, y_pos = board_index(square)
+            piece = pieces_board[x_pos][y_pos]
+            self.assertEqual(1 + piece.get_colour_code() * 6 + piece.get_type_code() if piece else 0, mailboxes[0][square])
+        positions = [position_from_fen(START_FEN), position_from_fen(KIWIPETE.replace(' w ', ' b '))]
+        mailboxes, turns = pack_positions(positions)
+        self.assertEqual([WHITE, BLACK], list(turns))
+        planes = to_planes(mailboxes)
+        self.assertEqual((2, 12, 64), planes.shape)
+        self.assertEqual(1, planes[0][BLACK * 6 + KING][square_index((3, 0))])
+        self.assertEqual(32, planes[0].sum())
+
+    def test_evaluateBatchMatchesEvaluate(self):
+        positions = [position_from_fen(fen) for fen in (START_FEN, KIWIPETE, KIWIPETE.replace(' w ', ' b '), '8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1')]
+        mailboxes, turns = pack_positions(positions)
+        self.assertEqual([evaluate(position) for position in positions], list(evaluate_batch(mailboxes, turns, mobility=False)))
+        self.assertRaises(ValueError, lambda: evaluate_batch(mailboxes[:, :32], turns))
+
+    def test_mobility(self):
+        # Both sides have the same moves at the start, and the colour to move only flips the sign
+        mailboxes, turns = pack_positions([position_from_fen(START_FEN), position_from_fen(START_FEN.replace(' w ', ' b '))])
+        self.assertEqual([0, 0], list(evaluate_batch(mailboxes, turns)))
+        # A lone rook in the corner reaches 14 squares, a knight there 2 and a bishop in the middle 13
+        fens = ('1k6/7K/8/8/8/8/8/R7 w - - 0 1', 'k7/7K/8/8/8/8/8/N7 w - - 0 1', 'k7/7K/8/8/3B4/8/8/8 w - - 0 1')
+        positions = [position_from_fen(fen) for fen in fens]
+        mailboxes, turns = pack_positions(positions)
+        extra = evaluate_batch(mailboxes, turns) - evaluate_batch(mailboxes, turns, mobility=False)
+        self.assertEqual([14 * STRAIGHT_MOBILITY, 2 * KNIGHT_MOBILITY, 13 * DIAGONAL_MOBILITY], list(extra))
+        # Batches larger than a chunk give the same scores
+        mailboxes, turns = pack_positions(positions * (CHUNK_SIZE // 2))
+        self.assertEqual(list(evaluate_batch(*pack_positions(positions))) * (CHUNK_SIZE // 2), list(evaluate_batch(mailboxes, turns)))
+
+    def test_popcountWithoutBitwiseCount(self):
+        # NumPy before 2.0 has no bitwise_count, bits are then counted a byte at a time
+        bitboards = numpy.array([0, 1, FULL_BOARD, 0x8000000000000001, 0x0F0F0F0F0F0F0F0F], dtype=numpy.uint64)
+        self.assertEqual([0, 1, 64, 2, 32], list(batch._table_popcount(bitboards)))
+        self.assertEqual([0, 64, 32], list(batch._table_popcount(bitboards[::2])))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,8 +3,10 @@ import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from Classes.board import Board
+from Classes.bitboard import *
 from Classes.player import Player
 from Classes.piece_factory import PieceFactory
+from gamelogic import Game
 
 class TestBoardMethods(unittest.TestCase):
     def test_createBoardProperly(self):
@@ -43,7 +45,127 @@ class TestBoardMethods(unittest.TestCase):
         self.assertRaises(ValueError, lambda: testBoard.move_piece(first_player.get_pieces()[0], 0))
         self.assertRaises(ValueError, lambda: testBoard.move_piece(first_player.get_pieces()[0], (0, 12)))
         self.assertRaises(ValueError, lambda: testBoard.move_piece(first_player.get_pieces()[0], (-2, 3)))
-        
+
+    def test_addPotentialPositions(self):
+        first_player = Player('white', self.helper_createCorrectPieces())
+        second_player = Player('black', self.helper_createCorrectPieces())
+        testBoard = Board(self.helper_createBoard(), first_player, second_player)
+        pawn = first_player.get_pieces()[0]
+        testBoard.move_piece(pawn, (2, 2))
+        testBoard.add_potential_positions(pawn)
+        # The pawn has moved so it can only step one square forward
+        self.assertEqual([(2, 3)], [position['Index'] for position in testBoard.get_potential_positions()])
+        testBoard.clear_potential_positions()
+        self.assertEqual([], testBoard.get_potential_positions())
+
+    def test_headlessBoard(self):
+        first_player = Player('white', self.helper_createCorrectPieces())
+        second_player = Player('black', self.helper_createCorrectPieces())
+        testBoard = Board(self.helper_createBoard(), first_player, second_player, headless=True)
+        pawn = first_player.get_pieces()[0]
+        self.assertIsNone(pawn.get_button())
+        testBoard.move_piece(pawn, (2, 2))
+        testBoard.add_potential_positions(pawn)
+        self.assertEqual([(2, 3)], [position['Index'] for position in testBoard.get_potential_positions()])
+        self.assertIsNone(testBoard.get_potential_positions()[0]['Button'])
+
+    def test_squareAt(self):
+        first_player = Player('white', self.helper_createCorrectPieces())
+        second_player = Player('black', self.helper_createCorrectPieces())
+        board = Board(self.helper_createBoard(), first_player, second_player, headless=True)
+        self.assertEqual((0, 0), board.square_at((60, 55)))
+        self.assertEqual((0, 0), board.square_at((134, 129)))
+        self.assertEqual((1, 1), board.square_at((135, 130)))
+        self.assertEqual((7, 7), board.square_at((659, 654)))
+        self.assertIsNone(board.square_at((59, 100)))
+        self.assertIsNone(board.square_at((100, 655)))
+
+    def test_makeAndUnmakeMove(self):
+        game = Game(headless=True)
+        testBoard = game.get_board()
+        pieces_board = testBoard.get_pieces_board()
+        white_pieces = [pieces_board[x][y] for x in range(8) for y in (6, 7)]
+        pawn = pieces_board[0][6]
+        black_pawn = pieces_board[1][1]
+        black_rook = pieces_board[0][0]
+        self.assertIsNone(testBoard.make_move(pawn, (0, 2)))
+        self.assertEqual(black_pawn, testBoard.make_move(pawn, (1, 1)))
+        # Capturing the rook on the last row exchanges the pawn for a queen
+        self.assertEqual(black_rook, testBoard.make_move(pawn, (0, 0)))
+        self.assertEqual('queen', pieces_board[0][0].get_piece_type())
+        self.assertNotIn(black_rook, [piece for column in pieces_board for piece in column])
+        # Castling moves the rook next to the king
+        testBoard.make_move(pieces_board[5][7], (5, 4))
+        testBoard.make_move(pieces_board[6][7], (6, 4))
+        king = pieces_board[4][7]
+        rook = pieces_board[7][7]
+        testBoard.make_move(king, (6, 7))
+        self.assertEqual(rook, pieces_board[5][7])
+        self.assertTrue(rook.has_moved())
+        for i in range(6):
+            testBoard.unmake_move()
+        self.assertEqual(pawn, pieces_board[0][6])
+        self.assertFalse(pawn.has_moved())
+        self.assertEqual(black_pawn, pieces_board[1][1])
+        self.assertEqual(black_rook, pieces_board[0][0])
+        self.assertEqual(rook, pieces_board[7][7])
+        self.assertFalse(rook.has_moved())
+        self.assertEqual((7, 7), rook.get_board_index())
+        self.assertEqual(sorted(map(id, white_pieces)), sorted(map(id, [piece for column in pieces_board for piece in column if piece and piece.get_colour() == 'white'])))
+        self.assertEqual(20, len(testBoard.get_position().generate_moves()))
+
+    def test_makeMoveWithPromotionChoice(self):
+        testBoard = Game(headless=True).get_board()
+        pieces_board = testBoard.get_pieces_board()
+        pawn = pieces_board[0][6]
+        testBoard.make_move(pawn, (0, 2))
+        testBoard.make_move(pawn, (1, 1))
+        testBoard.make_move(pawn, (0, 0), 'knight')
+        self.assertEqual('knight', pieces_board[0][0].get_piece_type())
+        self.assertEqual((WHITE, KNIGHT), testBoard.get_position().piece_at(0))
+        testBoard.unmake_move()
+        self.assertEqual(pawn, pieces_board[1][1])
+        self.assertEqual('rook', pieces_board[0][0].get_piece_type())
+
+    def test_positionKeyFollowsMoves(self):
+        testBoard = Game(headless=True).get_board()
+        pieces_board = testBoard.get_pieces_board()
+        start_key = testBoard.position_key()
+        testBoard.make_move(pieces_board[6][7], (5, 5))
+        testBoard.make_move(pieces_board[6][0], (5, 2))
+        testBoard.make_move(pieces_board[5][5], (6, 7))
+        testBoard.make_move(pieces_board[5][2], (6, 0))
+        # The knights are back where they started, knights don't affect castling so it's the same position
+        self.assertEqual(start_key, testBoard.position_key())
+        testBoard.unmake_move()
+        self.assertNotEqual(start_key, testBoard.position_key())
+
+    def test_attackMapsFollowMoves(self):
+        testBoard = Game(headless=True, fen='r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1').get_board()
+        position = testBoard.get_position()
+        pieces_board = testBoard.get_pieces_board()
+        def check_attack_maps():
+            for colour in ('white', 'black'):
+                colour_code = COLOUR_CODES[colour]
+                expected = sum(1 << square for square in range(64) if position.is_attacked(square, colour_code))
+                self.assertEqual(expected, testBoard.get_attack_map(colour))
+                for square in range(64):
+                    self.assertEqual(bin(position.attackers(square, colour_code)).count('1'), testBoard.attack_count(board_index(square), colour))
+        check_attack_maps()
+        self.assertEqual(1, testBoard.attack_count((5, 2), 'white'))
+        self.assertEqual(3, testBoard.attack_count((4, 2), 'black'))
+        # Castling, captures, a promotion, a double step allowing en passant and the en passant capture
+        moves = [((4, 7), (6, 7)), ((7, 5), (6, 6)), ((3, 3), (4, 2)), ((6, 6), (5, 7)), ((0, 6), (0, 4)), ((1, 4), (0, 5)), ((6, 7), (5, 7)), ((0, 5), (1, 6))]
+        for from_pos, to_pos in moves:
+            testBoard.make_move(pieces_board[from_pos[0]][from_pos[1]], to_pos)
+            check_attack_maps()
+            if to_pos == (5, 7) and from_pos == (6, 6):
+                self.assertTrue(testBoard.in_check('white'))
+        self.assertFalse(testBoard.in_check('white'))
+        for i in range(8):
+            testBoard.unmake_move()
+            check_attack_maps()
+
     def helper_createBoard(self):
         board = [ [0]*8 for i in range(8)]
         x_coord = 60
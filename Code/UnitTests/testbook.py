@@ -0,0 +1,117 @@
+import unittest
+import sys
+import os
+import pickle
+import tempfile
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from Classes.book import *
+from Classes.engine import Engine
+from Classes.fen import START_FEN, position_from_fen
+from Classes.notation import move_to_san
+from Classes.pgn import DEFAULT_FEN
+
+GAMES = """[Event "1"]
+
+1. e4 e5 2. Nf3 Nc6 1-0
+
+[Event "2"]
+
+1. e4 c5 2. Nf3 1/2-1/2
+
+[Event "3"]
+
+1. e4 e5 2. Bc4 0-1
+
+[Event "4"]
+
+1. d4 d5 2. Qxd5 *
+"""
+
+class TestBookMethods(unittest.TestCase):
+    def test_buildAndProbe(self):
+        with tempfile.TemporaryDirectory() as directory:
+            book_path = self.helper_build(directory)
+            book = OpeningBook(book_path)
+            position = position_from_fen(DEFAULT_FEN)
+            self.assertEqual([('e4', 3), ('d4', 1)], self.helper_sans(position, book.get_moves(position)))
+            position.make_move(book.get_moves(position)[0][0])
+            self.assertEqual([('e5', 2), ('c5', 1)], self.helper_sans(position, book.get_moves(position)))
+            self.assertEqual([], book.get_moves(position_from_fen('4k3/8/8/8/8/8/8/4K3 w - - 0 1')))
+            # The entries are sorted by key, and by weight for the same key
+            with open(book_path, 'rb') as stream:
+                data = stream.read()
+            entries = [ENTRY.unpack_from(data, offset) for offset in range(0, len(data), ENTRY.size)]
+            self.assertEqual(len(book), len(entries))
+            self.assertEqual(sorted(entries, key=lambda entry: (entry[0], -entry[2])), entries)
+            book.close()
+
+    def test_buildSettings(self):
+        with tempfile.TemporaryDirectory() as directory:
+            book_path = self.helper_build(directory, max_plies=1, min_weight=2)
+            book = OpeningBook(book_path)
+            position = position_from_fen(DEFAULT_FEN)
+            self.assertEqual([('e4', 3)], self.helper_sans(position, book.get_moves(position)))
+            self.assertEqual(1, len(book))
+            self.assertRaises(ValueError, lambda: build_book([], book_path, max_plies=0))
+            # The invalid last move of game 4 is left out with the rest of the game
+            book_path = self.helper_build(directory)
+            position = position_from_fen('rnbqkbnr/ppp1pppp/8/3p4/3P4/8/PPP1PPPP/RNBQKBNR w KQkq - 0 2')
+            self.assertEqual([], OpeningBook(book_path).get_moves(position))
+
+    def test_chooseMove(self):
+        with tempfile.TemporaryDirectory() as directory:
+            book = OpeningBook(self.helper_build(directory), seed=1)
+            position = position_from_fen(DEFAULT_FEN)
+            choices = [move_to_san(position, book.choose_move(position)) for i in range(400)]
+            self.assertEqual({'e4', 'd4'}, set(choices))
+            self.assertGreater(choices.count('e4'), choices.count('d4'))
+            self.assertIsNone(book.choose_move(position_from_fen('4k3/8/8/8/8/8/8/4K3 w - - 0 1')))
+            # A copy sent to another process maps the same file
+            self.assertEqual(book.get_moves(position), pickle.loads(pickle.dumps(book)).get_moves(position))
+            # and picks the same moves with the same seed
+            seeded = [OpeningBook(book.get_path(), seed=7), pickle.loads(pickle.dumps(OpeningBook(book.get_path(), seed=7)))]
+            self.assertEqual(*[[copy.choose_move(position) for i in range(50)] for copy in seeded])
+            # The engine plays book moves without searching
+            engine = Engine(max_depth=2, book=book)
+            self.assertIn(move_to_san(position, engine.search(position)), ('e4', 'd4'))
+            self.assertEqual(0, engine.get_nodes())
+
+    def test_gameLayout(self):
+        with tempfile.TemporaryDirectory() as directory:
+            pgn_path = os.path.join(directory, 'games.pgn')
+            with open(pgn_path, 'w') as stream:
+                stream.write('[FEN "{}"]\n\n1. e4 e5 *\n'.format(START_FEN))
+            book_path = os.path.join(directory, 'book.bin')
+            self.assertEqual(0, build_book([pgn_path], book_path)["Standard"])
+            position = position_from_fen(START_FEN)
+            self.assertEqual([('e4', 1)], self.helper_sans(position, OpeningBook(book_path).get_moves(position)))
+            # Books of games from the usual layout never hit in the game's starting position
+            self.assertEqual([], OpeningBook(self.helper_build(directory)).get_moves(position))
+
+    def test_emptyAndInvalidBooks(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'empty.bin')
+            open(path, 'wb').close()
+            book = OpeningBook(path)
+            self.assertEqual(0, len(book))
+            self.assertIsNone(book.choose_move(position_from_fen(DEFAULT_FEN)))
+            with open(path, 'wb') as stream:
+                stream.write(b'12345')
+            self.assertRaises(ValueError, lambda: OpeningBook(path))
+
+    def helper_build(self, directory, max_plies=20, min_weight=1):
+        pgn_path = os.path.join(directory, 'games.pgn')
+        with open(pgn_path, 'w') as stream:
+            stream.write(GAMES)
+        book_path = os.path.join(directory, 'book.bin')
+        results = build_book([pgn_path], book_path, max_plies, min_weight)
+        self.assertEqual(4, results["Games"])
+        # None of the games have a FEN tag, so they start from the usual layout rather than the game's own
+        self.assertEqual(4, results["Standard"])
+        return book_path
+
+    def helper_sans(self, position, moves):
+        return [(move_to_san(position, move), weight) for move, weight in moves]
+
+if __name__ == '__main__':
+    unittest.main()
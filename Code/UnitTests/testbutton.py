@@ -14,5 +14,12 @@ class TestButtonMethods(unittest.TestCase):
         self.assertRaises(ValueError, lambda: Button(100, 800, 'Images/knight.png'))
         self.assertRaises(ValueError, lambda: Button(200, 200, 'Images/fake_image.png'))
 
+    def test_collides(self):
+        testButton = Button(200, 200, 'Images/knight.png')
+        self.assertTrue(testButton.collides((200, 200)))
+        self.assertTrue(testButton.collides((225, 225)))
+        self.assertFalse(testButton.collides((199, 225)))
+        self.assertFalse(testButton.collides((225, 400)))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,53 @@
+import unittest
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from Classes.bitboard import *
+from Classes.engine import Engine, MATE_SCORE
+from Classes.evaluation import evaluate
+from Classes.perft import parse_position, move_name
+from gamelogic import Game
+
+class TestEngineMethods(unittest.TestCase):
+    def test_evaluation_is_symmetric(self):
+        position = Game(headless=True).get_board().get_position()
+        self.assertEqual(0, evaluate(position))
+        position = parse_position("4k3/8/8/3q4/8/8/8/3RK3 w")
+        score = evaluate(position)
+        self.assertLess(score, 0)
+        position.set_turn(BLACK)
+        self.assertEqual(-score, evaluate(position))
+
+    def test_evaluation_is_tapered(self):
+        # With only kings and pawns left the endgame tables count fully, so the king belongs in the centre rather than the corner
+        centre = evaluate(parse_position("7k/8/8/8/3K4/8/P7/8 w"))
+        corner = evaluate(parse_position("7k/8/8/8/8/8/P7/K7 w"))
+        self.assertGreater(centre, corner)
+
+    def test_takes_hanging_queen(self):
+        position = parse_position("4k3/8/8/3q4/8/8/8/3RK3 w")
+        key = position.get_key()
+        engine = Engine(time_limit=5, max_depth=3)
+        self.assertEqual('d1d5', move_name(engine.search(position)))
+        self.assertEqual(3, engine.get_depth())
+        self.assertGreater(engine.get_score(), 0)
+        # The search leaves the position as it found it
+        self.assertEqual(key, position.get_key())
+        self.assertEqual([], position.get_move_list())
+
+    def test_finds_mate(self):
+        position = parse_position("6k1/5ppp/8/8/8/8/8/R5K1 w")
+        engine = Engine(time_limit=5, max_depth=4)
+        self.assertEqual('a1a8', move_name(engine.search(position)))
+        self.assertGreater(engine.get_score(), MATE_SCORE - 10)
+
+    def test_time_limit(self):
+        position = Game(headless=True).get_board().get_position()
+        engine = Engine(time_limit=0.2)
+        self.assertIn(engine.search(position), position.generate_moves())
+        self.assertLess(engine.get_depth(), 32)
+        self.assertRaises(ValueError, lambda: Engine(time_limit=0))
+        self.assertRaises(ValueError, lambda: Engine(max_depth=0))
+
+if __name__ == '__main__':
+    unittest.main()
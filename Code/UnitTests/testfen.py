@@ -0,0 +1,72 @@
+import unittest
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from Classes.bitboard import *
+from Classes.position import encode_move
+from Classes.fen import *
+
+class TestFenMethods(unittest.TestCase):
+    def test_round_trip(self):
+        fens = [
+            START_FEN,
+            'r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1',
+            '8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1',
+            'rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w KQkq f6 0 3',
+            'r3k3/8/8/8/8/8/8/4K2R b Kq - 12 40'
+        ]
+        for fen in fens:
+            position = position_from_fen(fen)
+            self.assertEqual(fen, position_to_fen(position))
+            self.assertEqual(position.compute_key(), position.get_key())
+
+    def test_fields(self):
+        position = position_from_fen('r3k3/8/8/8/8/8/4P3/4K2R b Kq - 12 40')
+        self.assertEqual(BLACK, position.get_turn())
+        self.assertEqual(2 | 4, position.get_castling_rights())
+        self.assertEqual((12, 40), (position.get_halfmove_clock(), position.get_fullmove_number()))
+        self.assertEqual((BLACK, ROOK), position.piece_at(square_index((0, 0))))
+        # Only the pawn on its starting row and the pieces with castling rights haven't moved
+        self.assertEqual(sum(1 << square_index(board_pos) for board_pos in ((0, 0), (4, 0), (4, 6), (4, 7), (7, 7))), position.get_unmoved())
+        # Fields left out get their defaults
+        self.assertEqual('8/8/8/8/8/8/8/K6k w - - 0 1', position_to_fen(position_from_fen('8/8/8/8/8/8/8/K6k')))
+
+    def test_en_passant_square(self):
+        # A double step that no pawn can capture leaves no en passant square, so the key matches the same position reached another way
+        position = position_from_fen('4k3/8/8/8/8/8/4P3/4K3 w - - 0 1')
+        position.make_move(encode_move(square_index((4, 6)), square_index((4, 4))))
+        self.assertEqual('4k3/8/8/8/4P3/8/8/4K3 b - - 0 1', position_to_fen(position))
+        self.assertEqual(position.get_key(), position_from_fen('4k3/8/8/8/4P3/8/8/4K3 b - e3 0 1').get_key())
+        position = position_from_fen('4k3/8/8/8/3p4/8/4P3/4K3 w - - 0 1')
+        position.make_move(encode_move(square_index((4, 6)), square_index((4, 4))))
+        self.assertEqual('4k3/8/8/8/3pP3/8/8/4K3 b - e3 0 1', position_to_fen(position))
+        self.assertEqual(position.get_key(), position_from_fen(position_to_fen(position)).get_key())
+
+    def test_invalid_fens(self):
+        invalid = [
+            '',
+            '8/8/8/8/8/8/8 w',
+            '9/8/8/8/8/8/8/8 w',
+            'x7/8/8/8/8/8/8/8 w',
+            '8/8/8/8/8/8/8/8é w',
+            '8/8/8/8/8/8/8/8 x',
+            '4k3/8/8/8/8/8/8/4K3 w K',
+            '4k3/8/8/8/8/8/8/4K2R w KK',
+            '4k3/8/8/8/8/8/8/4K3 w - e3',
+            '4k3/8/8/8/8/8/8/4K3 w - - -1 1',
+            '4k3/8/8/8/8/8/8/4K3 w - - 0 x',
+            '4k3/8/8/8/8/8/8/4K3 w - - 0 1 extra',
+            # One king each, and no pawns on the first or last row
+            'kk6/8/8/8/8/8/8/7K w - - 0 1',
+            '8/8/8/8/8/8/8/7K w - - 0 1',
+            'P6k/8/8/8/8/8/8/7K w - - 0 1',
+            '7k/8/8/8/8/8/8/p6K w - - 0 1'
+        ]
+        for fen in invalid:
+            self.assertRaises(ValueError, lambda: parse_fen(fen))
+        # The colour that isn't to move can't be in check
+        self.assertRaises(ValueError, lambda: position_from_fen('kK6/8/8/8/8/8/8/8 w - - 0 1'))
+        self.assertRaises(ValueError, lambda: position_from_fen('4k3/8/8/8/8/8/8/4R1K1 w - - 0 1'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import unittest
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from Classes.bitboard import *
+from Classes.fen import position_to_fen
+from Classes.pgn import read_games, replay_game
+from gamelogic import Game
+import io
+
+class TestGameMethods(unittest.TestCase):
+    def test_headless_game_start(self):
+        game = Game(headless=True)
+        position = game.get_board().get_position()
+        self.assertEqual(WHITE, position.get_turn())
+        self.assertEqual(20, len(position.generate_moves()))
+        pieces_board = game.get_board().get_pieces_board()
+        for x_pos in range(8):
+            for y_pos in (0, 1, 6, 7):
+                piece = pieces_board[x_pos][y_pos]
+                self.assertIsNone(piece.get_button())
+                self.assertEqual((COLOUR_CODES[piece.get_colour()], PIECE_CODES[piece.get_piece_type()]), position.piece_at(square_index((x_pos, y_pos))))
+
+    def test_clicks_select_and_move_pieces(self):
+        game = Game(headless=True)
+        board = game.get_board()
+        pixel = lambda board_pos: (60 + board_pos[0] * 75 + 30, 55 + board_pos[1] * 75 + 30)
+        # Clicking an empty square or a black piece on white's turn selects nothing
+        game.handle_click(pixel((4, 4)))
+        game.handle_click(pixel((4, 1)))
+        self.assertEqual([], board.get_potential_positions())
+        game.handle_click(pixel((4, 6)))
+        self.assertCountEqual([(4, 5), (4, 4)], [position['Index'] for position in board.get_potential_positions()])
+        game.handle_click(pixel((4, 4)))
+        self.assertEqual([], board.get_potential_positions())
+        self.assertEqual('pawn', board.get_pieces_board()[4][4].get_piece_type())
+        self.assertEqual(BLACK, board.get_position().get_turn())
+        # Clicks outside the board are ignored
+        game.handle_click((5, 5))
+        game.handle_click((689, 689))
+        game.handle_click(pixel((3, 1)))
+        self.assertEqual(2, len(board.get_potential_positions()))
+
+    def test_game_from_fen(self):
+        fen = 'rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w KQkq f6 0 3'
+        game = Game(headless=True, fen=fen)
+        board = game.get_board()
+        self.assertEqual(fen, board.to_fen())
+        self.assertEqual(board.get_position().compute_key(), board.position_key())
+        black_pieces = lambda: [piece for column in board.get_pieces_board() for piece in column if piece and piece.get_colour() == 'black']
+        self.assertEqual(16, len(black_pieces()))
+        # Capturing en passant takes the black pawn beside the white one
+        pixel = lambda board_pos: (60 + board_pos[0] * 75 + 30, 55 + board_pos[1] * 75 + 30)
+        game.handle_click(pixel((4, 3)))
+        game.handle_click(pixel((5, 2)))
+        self.assertIsNone(board.get_pieces_board()[5][3])
+        self.assertEqual(15, len(black_pieces()))
+        self.assertEqual('rnbqkbnr/ppp1p1pp/5P2/3p4/8/8/PPPP1PPP/RNBQKBNR b KQkq - 0 3', board.to_fen())
+        game.from_fen('4k3/8/8/8/8/8/8/4K3 b - - 0 1')
+        self.assertEqual('4k3/8/8/8/8/8/8/4K3 b - - 0 1', game.get_board().to_fen())
+        self.assertEqual(Game(headless=True).get_board().to_fen(), 'rnbkqbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1')
+        self.assertRaises(ValueError, lambda: Game(headless=True, fen='8/8/8/8/8/8/8/4K3 w - - 0 1'))
+
+    def test_move_log_and_pgn(self):
+        game = Game(headless=True)
+        pixel = lambda board_pos: (60 + board_pos[0] * 75 + 30, 55 + board_pos[1] * 75 + 30)
+        for board_pos in [(4, 6), (4, 4), (3, 1), (3, 3), (4, 4), (3, 3)]:
+            game.handle_click(pixel(board_pos))
+        self.assertEqual(['e4', 'd5', 'exd5'], game.get_move_log())
+        game.get_board().unmake_move()
+        self.assertEqual(['e4', 'd5'], game.get_move_log())
+        text = game.to_pgn({"White": "Tester"})
+        self.assertIn('[White "Tester"]', text)
+        self.assertIn('[FEN "rnbkqbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"]', text)
+        self.assertIn('1. e4 d5 *', text)
+        parsed = next(read_games(io.StringIO(text)))
+        self.assertEqual(game.get_board().to_fen(), position_to_fen(replay_game(parsed)))
+        # Moves taken back and played differently are logged afresh
+        board = game.get_board()
+        board.unmake_move()
+        board.make_move(board.get_pieces_board()[3][1], (3, 2))
+        self.assertEqual(['e4', 'd6'], game.get_move_log())
+
+    def test_checkmate_and_stalemate(self):
+        pixel = lambda board_pos: (60 + board_pos[0] * 75 + 30, 55 + board_pos[1] * 75 + 30)
+        # The knight on e5 is pinned to its king, so it has nowhere to move
+        game = Game(headless=True, fen='4r1k1/8/8/4N3/8/8/8/2N1K3 w - - 0 1')
+        game.handle_click(pixel((4, 3)))
+        self.assertEqual([], game.get_board().get_potential_positions())
+        game = Game(headless=True, fen='6k1/5ppp/8/8/8/8/8/R3K3 w - - 0 1')
+        game.handle_click(pixel((0, 7)))
+        game.handle_click(pixel((0, 0)))
+        self.assertEqual(['Ra8#'], game.get_move_log())
+        self.assertEqual('1-0', game.get_result())
+        self.assertEqual(['gameOver'], game.game_state)
+        game = Game(headless=True, fen='k7/8/8/2Q5/8/8/8/4K3 w - - 0 1')
+        game.handle_click(pixel((2, 3)))
+        game.handle_click(pixel((1, 2)))
+        self.assertEqual('1/2-1/2', game.get_result())
+
+if __name__ == '__main__':
+    unittest.main()
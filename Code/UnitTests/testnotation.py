@@ -0,0 +1,61 @@
+import unittest
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from Classes.bitboard import *
+from Classes.position import encode_move
+from Classes.fen import position_from_fen
+from Classes.notation import *
+
+def move(from_name, to_name, promotion=0):
+    to_square = lambda name: square_index(('abcdefgh'.index(name[0]), 8 - int(name[1])))
+    return encode_move(to_square(from_name), to_square(to_name), promotion)
+
+class TestNotationMethods(unittest.TestCase):
+    def test_move_to_san(self):
+        position = position_from_fen('r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1')
+        expected = {
+            move('e1', 'g1'): 'O-O',
+            move('e1', 'c1'): 'O-O-O',
+            move('d5', 'e6'): 'dxe6',
+            move('e5', 'f7'): 'Nxf7',
+            move('f3', 'f6'): 'Qxf6',
+            move('c3', 'b1'): 'Nb1',
+            move('d2', 'h6'): 'Bh6',
+            move('e5', 'd7'): 'Nxd7',
+            move('e2', 'a6'): 'Bxa6',
+            move('a2', 'a4'): 'a4'
+        }
+        for encoded, san in expected.items():
+            self.assertEqual(san, move_to_san(position, encoded))
+            self.assertEqual(encoded, san_to_move(position, san))
+        self.assertEqual([], position.get_move_list())
+
+    def test_checks_promotions_and_en_passant(self):
+        position = position_from_fen('3k4/1P6/8/3pP3/8/8/8/4K3 w - d6 0 1')
+        self.assertEqual('exd6', move_to_san(position, move('e5', 'd6')))
+        self.assertEqual('b8=Q+', move_to_san(position, move('b7', 'b8', QUEEN)))
+        self.assertEqual('b8=N', move_to_san(position, move('b7', 'b8', KNIGHT)))
+        self.assertEqual(move('b7', 'b8', KNIGHT), san_to_move(position, 'b8=N'))
+        self.assertEqual(move('b7', 'b8', ROOK), san_to_move(position, 'b8R!?'))
+        position = position_from_fen('6k1/5ppp/8/8/8/8/8/R3K3 w - - 0 1')
+        self.assertEqual('Ra8#', move_to_san(position, move('a1', 'a8')))
+        self.assertEqual(move('a1', 'a8'), san_to_move(position, 'Ra8#'))
+
+    def test_disambiguation(self):
+        # Only the file or rank needed to tell the pieces apart is added
+        position = position_from_fen('4k3/8/8/RN6/8/1N6/7K/R4R2 w - - 0 1')
+        self.assertEqual('Rad1', move_to_san(position, move('a1', 'd1')))
+        self.assertEqual('R1a3', move_to_san(position, move('a1', 'a3')))
+        self.assertEqual('N5d4', move_to_san(position, move('b5', 'd4')))
+        self.assertEqual(move('b3', 'd4'), san_to_move(position, 'N3d4'))
+        self.assertRaises(ValueError, lambda: san_to_move(position, 'Nd4'))
+        self.assertRaises(ValueError, lambda: san_to_move(position, 'Qd4'))
+        self.assertRaises(ValueError, lambda: san_to_move(position, 'Zz9'))
+        # The knight on e5 is pinned, so Nd3 can only be the other knight
+        position = position_from_fen('4r1k1/8/8/4N3/8/8/8/2N1K3 w - - 0 1')
+        self.assertEqual(move('c1', 'd3'), san_to_move(position, 'Nd3'))
+        self.assertEqual('Nd3', move_to_san(position, move('c1', 'd3')))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+import unittest
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from Classes.bitboard import *
+from Classes.parallel import *
+from Classes.perft import parse_position, perft, REFERENCE_POSITIONS
+from Classes.position import encode_move
+from gamelogic import Game
+
+class TestParallelMethods(unittest.TestCase):
+    def test_describe_and_build_position(self):
+        board = Game(headless=True).get_board()
+        pieces_board = board.get_pieces_board()
+        board.make_move(pieces_board[7][7], (7, 5))
+        position = build_position(describe_board(board))
+        self.assertEqual(board.position_key(), position.get_key())
+        self.assertEqual(board.get_position().get_unmoved(), position.get_unmoved())
+        self.assertEqual(BLACK, position.get_turn())
+        self.assertEqual(board.position_key(), build_position(describe_position(board.get_position())).get_key())
+
+    def test_parallel_perft(self):
+        position = parse_position(REFERENCE_POSITIONS[2]["Position"])
+        self.assertEqual(perft(position, 2), parallel_perft(position, 2, 2))
+        self.assertEqual(REFERENCE_POSITIONS[0]["Nodes"][2], parallel_perft(Game(headless=True).get_board().get_position(), 3, 3))
+
+    def test_parallel_search(self):
+        position = parse_position("4k3/8/8/3q4/8/8/8/3RK3 w")
+        engine = ParallelEngine(time_limit=0.3, max_depth=3, hash_mb=1, workers=2)
+        try:
+            self.assertEqual(2, engine.get_workers())
+            self.assertEqual(encode_move(square_index((3, 7)), square_index((3, 3))), engine.search(position))
+            self.assertEqual(3, engine.get_depth())
+            self.assertGreater(engine.get_nodes(), 0)
+        finally:
+            engine.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+import unittest
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from Classes.bitboard import *
+from Classes.perft import *
+
+class TestPerftMethods(unittest.TestCase):
+    def test_reference_positions(self):
+        # Depth 3 keeps the suite quick, deeper counts are checked through the perft.py script
+        for result in run_reference_suite(3):
+            self.assertEqual(result["Expected"], result["Nodes"], "{} depth {}".format(result["Name"], result["Depth"]))
+
+    def test_divide_matches_perft(self):
+        position = parse_position(REFERENCE_POSITIONS[2]["Position"])
+        counts = divide(position, 2)
+        self.assertEqual(48, len(counts))
+        self.assertEqual(perft(position, 2), sum(counts.values()))
+        # Castling is listed as the king's move
+        self.assertIn('e1g1', counts)
+        self.assertIn('e1c1', counts)
+
+    def test_perft_leaves_position_unchanged(self):
+        position = parse_position(REFERENCE_POSITIONS[0]["Position"])
+        before = [position.get_pieces(colour, p_type) for colour in (WHITE, BLACK) for p_type in range(6)]
+        perft(position, 3)
+        self.assertEqual(before, [position.get_pieces(colour, p_type) for colour in (WHITE, BLACK) for p_type in range(6)])
+        self.assertEqual([], position.get_move_list())
+
+    def test_parse_invalid_positions(self):
+        self.assertRaises(ValueError, lambda: parse_position(''))
+        self.assertRaises(ValueError, lambda: parse_position('8/8/8/8/8/8/8 w'))
+        self.assertRaises(ValueError, lambda: parse_position('9/8/8/8/8/8/8/8 w'))
+        self.assertRaises(ValueError, lambda: parse_position('x7/8/8/8/8/8/8/8 w'))
+
+if __name__ == '__main__':
+    unittest.main()
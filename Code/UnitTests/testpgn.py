@@ -0,0 +1,61 @@
+import unittest
+import sys
+import os
+import io
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from Classes.fen import position_to_fen
+from Classes.pgn import *
+
+OPERA_GAME = """[Event "Paris"]
+[Site "Paris FRA"]
+[Date "1858.??.??"]
+[Round "?"]
+[White "Paul Morphy"]
+[Black "Duke Karl / Count Isouard"]
+[Result "1-0"]
+
+1.e4 e5 2.Nf3 d6 3.d4 Bg4 {This is a weak move
+already.--Fischer} 4.dxe5 Bxf3 5.Qxf3 dxe5 6.Bc4 Nf6 7.Qb3 Qe7
+8.Nc3 c6 9.Bg5 b5 10.Nxb5 cxb5 11.Bxb5+ Nbd7 12.O-O-O Rd8 13.Rxd7 Rxd7
+14.Rd1 Qe6 15.Bxd7+ Nxd7 16.Qb8+ Nxb8 17.Rd8# 1-0
+
+"""
+
+class TestPgnMethods(unittest.TestCase):
+    def test_read_and_replay(self):
+        games = list(read_games(io.StringIO(OPERA_GAME * 2)))
+        self.assertEqual(2, len(games))
+        game = games[0]
+        self.assertEqual('Paul Morphy', game["Tags"]["White"])
+        self.assertEqual('1-0', game["Result"])
+        self.assertEqual(33, len(game["Moves"]))
+        self.assertEqual(['e4', 'e5', 'Nf3'], game["Moves"][:3])
+        self.assertEqual('1n1Rkb1r/p4ppp/4q3/4p1B1/4P3/8/PPP2PPP/2K5 b k - 1 17', position_to_fen(replay_game(game)))
+
+    def test_skips_comments_and_variations(self):
+        text = '; a comment line\n[Event "Test"]\n\n1. e4 (1. d4 d5 (1... Nf6) 2. c4) 1... c5 $1 {a\nlong comment} 2. Nf3! d6?! ; rest of the line\n3. d4 *\n[Event "Unfinished"]\n1. d4'
+        games = list(read_games(io.StringIO(text)))
+        self.assertEqual(['e4', 'c5', 'Nf3!', 'd6?!', 'd4'], games[0]["Moves"])
+        self.assertEqual('*', games[0]["Result"])
+        self.assertEqual({"Event": "Unfinished"}, games[1]["Tags"])
+        self.assertEqual(['d4'], games[1]["Moves"])
+
+    def test_invalid_move(self):
+        game = {"Tags": {}, "Moves": ['e4', 'e5', 'Ke3'], "Result": '*'}
+        self.assertRaisesRegex(ValueError, 'Move 3', lambda: replay_game(game))
+
+    def test_write_and_read_back(self):
+        game = next(read_games(io.StringIO(OPERA_GAME)))
+        stream = io.StringIO()
+        write_game(stream, game["Moves"], game["Tags"], game["Result"])
+        text = stream.getvalue()
+        self.assertTrue(text.startswith('[Event "Paris"]\n[Site "Paris FRA"]'))
+        self.assertTrue(all(len(line) <= LINE_LENGTH for line in text.splitlines()))
+        self.assertEqual(game, next(read_games(io.StringIO(text))))
+        # Games starting with black to move number the first move with '...'
+        text = format_game(['e5', 'Nf3'], {"FEN": 'rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq - 0 7'})
+        self.assertIn('7... e5 8. Nf3 *', text)
+        self.assertRaises(ValueError, lambda: format_game([], result='2-0'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,6 +3,7 @@ import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from Classes.piece_factory import PieceFactory
+from Classes.bitboard import BLACK, KNIGHT
 
 class TestPieceMethods(unittest.TestCase):
     def test_create_pieces_properly(self):
@@ -72,5 +73,38 @@ class TestPieceMethods(unittest.TestCase):
         self.assertRaises(ValueError, lambda: piece.move('2, 2'))
         self.assertRaises(ValueError, lambda: piece.move(('f', 'g')))
 
+    def test_possible_moves_stay_on_board(self):
+        factory = PieceFactory()
+        expected_counts = {'rook': 14, 'bishop': 7, 'knight': 2, 'queen': 21, 'king': 3}
+        for p_type, count in expected_counts.items():
+            moves = factory.create_piece(p_type, 'white', 0, 0).get_possible_moves()
+            self.assertEqual(count, len(moves))
+            self.assertTrue(all(0 <= x_pos < 8 and 0 <= y_pos < 8 for x_pos, y_pos in moves))
+        # Rays are ordered away from the piece
+        self.assertEqual(((0, 1), (0, 2), (0, 3)), factory.create_piece('rook', 'white', 0, 0).get_possible_moves()[:3])
+        pawn = factory.create_piece('pawn', 'white', 0, 6)
+        self.assertEqual(((0, 5), (0, 4)), pawn.get_possible_moves())
+        self.assertEqual(((1, 5),), pawn.get_possible_attack_moves())
+        pawn.move((0, 5))
+        self.assertEqual(((0, 4),), pawn.get_possible_moves())
+
+    def test_compact_pieces(self):
+        factory = PieceFactory()
+        piece = factory.create_piece('knight', 'black', 1, 0)
+        self.assertEqual(BLACK, piece.get_colour_code())
+        self.assertEqual(KNIGHT, piece.get_type_code())
+        self.assertEqual('black', piece.get_colour())
+        # Pieces use __slots__, so they have no instance dictionary
+        self.assertFalse(hasattr(piece, '__dict__'))
+        self.assertRaises(AttributeError, lambda: setattr(piece, 'extra', 1))
+
+    def test_possible_moves_are_shared(self):
+        factory = PieceFactory()
+        first_queen = factory.create_piece('queen', 'white', 3, 3)
+        second_queen = factory.create_piece('queen', 'black', 3, 3)
+        self.assertIs(first_queen.get_possible_moves(), second_queen.get_possible_moves())
+        self.assertIs(first_queen.get_possible_moves(), first_queen.get_possible_attack_moves())
+        self.assertIsInstance(first_queen.get_possible_moves(), tuple)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -27,6 +27,28 @@ class TestPlayerMethods(unittest.TestCase):
         self.assertEqual(pieces, player.get_pieces())
         self.assertEqual(colour, player.get_colour())
 
+    def test_addRemoveAndReplacePieces(self):
+        pieces = self.helper_createCorrectPieces()
+        player = Player('black', list(pieces))
+        first, last = pieces[0], pieces[-1]
+        # The last piece fills the removed piece's slot
+        player.remove_piece(first)
+        self.assertFalse(player.owns(first))
+        self.assertEqual(last, player.get_pieces()[0])
+        self.assertEqual(15, len(player.get_pieces()))
+        self.assertRaises(ValueError, lambda: player.remove_piece(first))
+        player.add_piece(first)
+        self.assertTrue(player.owns(first))
+        self.assertEqual(first, player.get_pieces()[-1])
+        self.assertRaises(ValueError, lambda: player.add_piece(first))
+        self.assertRaises(ValueError, lambda: player.add_piece(PieceFactory().create_piece('pawn', 'white', 0, 0)))
+        queen = PieceFactory().create_piece('queen', 'black', 6, 0)
+        player.replace_piece(first, queen)
+        self.assertEqual(queen, player.get_pieces()[-1])
+        self.assertFalse(player.owns(first))
+        self.assertTrue(player.owns(queen))
+        self.assertRaises(ValueError, lambda: Player('black', [first, first]))
+
     def helper_createCorrectPieces(self):
         factory = PieceFactory()
         pieces_to_create = ['rook', 'bishop', 'knight', 'queen', 'king', 'knight', 'bishop', 'rook']
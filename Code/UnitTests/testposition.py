@@ -0,0 +1,261 @@
+import unittest
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from Classes.bitboard import *
+from Classes.position import Position, encode_move
+from Classes.fen import position_from_fen
+from Classes.evaluation import compute_scores, MAX_PHASE
+
+class TestPositionMethods(unittest.TestCase):
+    def test_attack_tables(self):
+        self.assertEqual(2, bin(KNIGHT_ATTACKS[square_index((0, 0))]).count('1'))
+        self.assertEqual(8, bin(KNIGHT_ATTACKS[square_index((3, 3))]).count('1'))
+        self.assertEqual(3, bin(KING_ATTACKS[square_index((7, 7))]).count('1'))
+        # White pawns attack up the board array, black pawns down it.
+        self.assertEqual([square_index((2, 3)), square_index((4, 3))], squares(PAWN_ATTACKS[WHITE][square_index((3, 4))]))
+        self.assertEqual([square_index((2, 5)), square_index((4, 5))], squares(PAWN_ATTACKS[BLACK][square_index((3, 4))]))
+
+    def test_sliding_attacks_stop_at_blockers(self):
+        self.assertEqual(14, bin(rook_attacks(square_index((0, 0)), 0)).count('1'))
+        self.assertEqual(27, bin(queen_attacks(square_index((3, 3)), 0)).count('1'))
+        blocker = 1 << square_index((0, 3))
+        attacks = rook_attacks(square_index((0, 0)), blocker)
+        self.assertTrue(attacks & blocker)
+        self.assertFalse(attacks & (1 << square_index((0, 4))))
+
+    def test_square_conversions(self):
+        for square in range(64):
+            self.assertEqual(square, square_index(board_index(square)))
+        self.assertEqual((4, 7), board_index(60))
+
+    def test_piece_moves(self):
+        position = Position()
+        position.add_piece(WHITE, ROOK, square_index((0, 7)))
+        position.add_piece(WHITE, PAWN, square_index((0, 4)))
+        position.add_piece(BLACK, KNIGHT, square_index((3, 7)))
+        quiet, captures, castling = position.get_piece_moves(square_index((0, 7)))
+        self.assertEqual([square_index((0, 5)), square_index((0, 6)), square_index((1, 7)), square_index((2, 7))], squares(quiet))
+        self.assertEqual([square_index((3, 7))], squares(captures))
+        self.assertEqual(0, castling)
+        # An unmoved pawn can step two squares, a moved one can't
+        self.assertEqual(2, len(squares(position.get_piece_moves(square_index((0, 4)))[0])))
+        position.move_piece(square_index((0, 4)), square_index((0, 3)))
+        self.assertEqual([square_index((0, 2))], squares(position.get_piece_moves(square_index((0, 3)))[0]))
+
+    def test_castling_targets(self):
+        position = Position()
+        position.add_piece(WHITE, KING, square_index((4, 7)))
+        position.add_piece(WHITE, ROOK, square_index((0, 7)))
+        position.add_piece(WHITE, ROOK, square_index((7, 7)))
+        castling = position.get_piece_moves(square_index((4, 7)))[2]
+        self.assertEqual([square_index((2, 7)), square_index((6, 7))], squares(castling))
+        position.add_piece(WHITE, KNIGHT, square_index((1, 7)))
+        position.move_piece(square_index((7, 7)), square_index((7, 6)))
+        self.assertEqual(0, position.get_piece_moves(square_index((4, 7)))[2])
+
+    def test_move_and_promote(self):
+        position = Position()
+        position.add_piece(WHITE, PAWN, square_index((1, 1)))
+        position.add_piece(BLACK, ROOK, square_index((2, 0)))
+        position.move_piece(square_index((1, 1)), square_index((2, 0)))
+        position.promote(square_index((2, 0)), QUEEN)
+        self.assertEqual((WHITE, QUEEN), position.piece_at(square_index((2, 0))))
+        self.assertIsNone(position.piece_at(square_index((1, 1))))
+        self.assertEqual(0, position.get_occupied(BLACK))
+
+    def test_make_and_unmake_move(self):
+        position = Position()
+        position.add_piece(WHITE, KING, square_index((4, 7)))
+        position.add_piece(WHITE, ROOK, square_index((7, 7)))
+        position.add_piece(WHITE, PAWN, square_index((0, 1)), moved=True)
+        position.add_piece(BLACK, KNIGHT, square_index((1, 0)), moved=True)
+        position.add_piece(BLACK, KING, square_index((7, 0)))
+        before = [position.get_pieces(colour, p_type) for colour in (WHITE, BLACK) for p_type in range(6)]
+        unmoved = position.get_unmoved()
+        moves = [
+            encode_move(square_index((4, 7)), square_index((6, 7))),
+            encode_move(square_index((7, 0)), square_index((6, 0))),
+            encode_move(square_index((0, 1)), square_index((1, 0)), KNIGHT)
+        ]
+        for move in moves:
+            self.assertIn(move, position.generate_moves())
+            position.make_move(move)
+        self.assertEqual(moves, position.get_move_list())
+        self.assertEqual(BLACK, position.get_turn())
+        self.assertEqual((WHITE, ROOK), position.piece_at(square_index((5, 7))))
+        self.assertEqual((WHITE, KNIGHT), position.piece_at(square_index((1, 0))))
+        self.assertEqual(0, position.get_pieces(BLACK, KNIGHT))
+        mailbox = position.get_mailbox()
+        for square in range(64):
+            self.assertEqual(position.piece_at(square), divmod(mailbox[square] - 1, 6) if mailbox[square] else None)
+        self.assertEqual(1 + WHITE * 6 + ROOK, mailbox[square_index((5, 7))])
+        for move in reversed(moves):
+            self.assertEqual(move, position.unmake_move())
+        self.assertEqual(before, [position.get_pieces(colour, p_type) for colour in (WHITE, BLACK) for p_type in range(6)])
+        self.assertEqual(unmoved, position.get_unmoved())
+        self.assertEqual(WHITE, position.get_turn())
+        self.assertEqual(1 + WHITE * 6 + ROOK, mailbox[square_index((7, 7))])
+        self.assertEqual(0, mailbox[square_index((5, 7))])
+
+    def test_zobrist_key(self):
+        position = Position()
+        position.add_piece(WHITE, KING, square_index((4, 7)))
+        position.add_piece(WHITE, ROOK, square_index((7, 7)))
+        position.add_piece(BLACK, KING, square_index((4, 0)))
+        position.add_piece(BLACK, KNIGHT, square_index((1, 0)), moved=True)
+        self.assertEqual(position.compute_key(), position.get_key())
+        self.assertEqual(2, position.get_castling_rights())
+        start_key = position.get_key()
+        white_king_moves = [encode_move(square_index((4, 7)), square_index((4, 6))), encode_move(square_index((4, 6)), square_index((4, 7)))]
+        black_knight_moves = [encode_move(square_index((1, 0)), square_index((2, 2))), encode_move(square_index((2, 2)), square_index((1, 0)))]
+        for white_move, black_move in zip(white_king_moves, black_knight_moves):
+            position.make_move(white_move)
+            self.assertEqual(position.compute_key(), position.get_key())
+            position.make_move(black_move)
+            self.assertEqual(position.compute_key(), position.get_key())
+        # Same pieces on the same squares, but the king has moved so castling is no longer possible
+        self.assertEqual(0, position.get_castling_rights())
+        self.assertNotEqual(start_key, position.get_key())
+        position.set_turn(BLACK)
+        self.assertEqual(position.compute_key(), position.get_key())
+        position.set_turn(WHITE)
+        for i in range(4):
+            position.unmake_move()
+        self.assertEqual(start_key, position.get_key())
+
+    def test_evaluation_totals(self):
+        position = Position()
+        self.assertEqual((0, 0, 0), position.get_scores())
+        position.add_piece(WHITE, KING, square_index((4, 7)))
+        position.add_piece(WHITE, ROOK, square_index((7, 7)))
+        position.add_piece(WHITE, PAWN, square_index((0, 1)), moved=True)
+        position.add_piece(BLACK, KNIGHT, square_index((1, 0)), moved=True)
+        position.add_piece(BLACK, KING, square_index((7, 0)))
+        self.assertEqual(compute_scores(position), position.get_scores())
+        start = position.get_scores()
+        # Castling, a capture with promotion and a king move
+        moves = [
+            encode_move(square_index((4, 7)), square_index((6, 7))),
+            encode_move(square_index((7, 0)), square_index((6, 0))),
+            encode_move(square_index((0, 1)), square_index((1, 0)), QUEEN),
+            encode_move(square_index((6, 0)), square_index((7, 0)))
+        ]
+        for move in moves:
+            position.make_move(move)
+            self.assertEqual(compute_scores(position), position.get_scores())
+        self.assertEqual(2 + 4, position.get_scores()[2])
+        self.assertEqual(compute_scores(position), position.copy().get_scores())
+        for move in moves:
+            position.unmake_move()
+        self.assertEqual(start, position.get_scores())
+        position.move_piece(square_index((0, 1)), square_index((1, 0)))
+        position.promote(square_index((1, 0)), QUEEN)
+        position.remove_piece(square_index((7, 7)))
+        self.assertEqual(compute_scores(position), position.get_scores())
+        position = position_from_fen('rnbkqbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBKQBNR w KQkq - 0 1')
+        self.assertEqual((0, 0, MAX_PHASE), position.get_scores())
+
+    def test_en_passant(self):
+        position = Position()
+        position.add_piece(WHITE, PAWN, square_index((4, 6)))
+        position.add_piece(BLACK, PAWN, square_index((3, 4)), moved=True)
+        position.add_piece(BLACK, PAWN, square_index((6, 1)))
+        before = [position.get_pieces(colour, PAWN) for colour in (WHITE, BLACK)]
+        start_key = position.get_key()
+        position.make_move(encode_move(square_index((4, 6)), square_index((4, 4))))
+        self.assertEqual(square_index((4, 5)), position.get_en_passant())
+        self.assertEqual(position.compute_key(), position.get_key())
+        self.assertIn(encode_move(square_index((3, 4)), square_index((4, 5))), position.generate_moves())
+        self.assertEqual((1 << square_index((3, 5)), 1 << square_index((4, 5)), 0), position.get_piece_moves(square_index((3, 4))))
+        position.make_move(encode_move(square_index((3, 4)), square_index((4, 5))))
+        # The white pawn beside the black pawn is taken
+        self.assertEqual(0, position.get_pieces(WHITE, PAWN))
+        self.assertEqual((BLACK, PAWN), position.piece_at(square_index((4, 5))))
+        self.assertIsNone(position.piece_at(square_index((4, 4))))
+        self.assertIsNone(position.get_en_passant())
+        self.assertEqual(position.compute_key(), position.get_key())
+        position.unmake_move()
+        self.assertEqual((WHITE, PAWN), position.piece_at(square_index((4, 4))))
+        self.assertIsNone(position.piece_at(square_index((4, 5))))
+        self.assertEqual(square_index((4, 5)), position.get_en_passant())
+        position.unmake_move()
+        self.assertEqual(before, [position.get_pieces(colour, PAWN) for colour in (WHITE, BLACK)])
+        self.assertEqual(start_key, position.get_key())
+        # Without an opposing pawn beside it, a double step leaves no en passant square
+        position.make_move(encode_move(square_index((4, 6)), square_index((4, 5))))
+        position.make_move(encode_move(square_index((6, 1)), square_index((6, 3))))
+        self.assertIsNone(position.get_en_passant())
+
+    def test_move_counters(self):
+        position = Position()
+        position.add_piece(WHITE, KING, square_index((4, 7)))
+        position.add_piece(WHITE, PAWN, square_index((0, 6)))
+        position.add_piece(BLACK, KING, square_index((4, 0)))
+        moves = [((4, 7), (4, 6)), ((4, 0), (4, 1)), ((0, 6), (0, 4)), ((4, 1), (4, 0))]
+        counters = [(1, 1), (2, 2), (0, 2), (1, 3)]
+        for (from_pos, to_pos), expected in zip(moves, counters):
+            position.make_move(encode_move(square_index(from_pos), square_index(to_pos)))
+            self.assertEqual(expected, (position.get_halfmove_clock(), position.get_fullmove_number()))
+        for i in range(4):
+            position.unmake_move()
+        self.assertEqual((0, 1), (position.get_halfmove_clock(), position.get_fullmove_number()))
+
+    def test_legal_moves(self):
+        names = lambda moves: sorted(square_name(move & 63) + square_name((move >> 6) & 63) for move in moves)
+        # The rook on d2 is pinned by the rook on d8 and the knight on c2 by the bishop, each can only move along the line of its pin
+        position = position_from_fen('3r3k/8/8/8/b7/8/2NR4/3K4 w - - 0 1')
+        d1, d2, d8, c2, a4 = (square_index(board_pos) for board_pos in ((3, 7), (3, 6), (3, 0), (2, 6), (0, 4)))
+        self.assertEqual({d2: BETWEEN[d1][d8] | (1 << d8), c2: BETWEEN[d1][a4] | (1 << a4)}, position.pins(WHITE))
+        self.assertEqual(['d1c1', 'd1e1', 'd1e2', 'd2d3', 'd2d4', 'd2d5', 'd2d6', 'd2d7', 'd2d8'], names(position.generate_legal_moves()))
+        # In check from the rook: block it with the knight or move the king off the file
+        position = position_from_fen('4r2k/8/8/8/8/8/3N1P2/2R1K3 w - - 0 1')
+        self.assertTrue(position.in_check(WHITE))
+        self.assertEqual(['d2e4', 'e1d1', 'e1f1'], names(position.generate_legal_moves()))
+        # Double check, only the king moves
+        position = position_from_fen('4r2k/8/8/8/8/5n2/3N4/4K3 w - - 0 1')
+        self.assertEqual(['e1d1', 'e1f1', 'e1f2'], names(position.generate_legal_moves()))
+        # No castling through an attacked square
+        position = position_from_fen('5r2/6k1/8/8/8/8/8/R3K2R w KQ - 0 1')
+        self.assertIn('e1c1', names(position.generate_legal_moves()))
+        self.assertNotIn('e1g1', names(position.generate_legal_moves()))
+        # Taking en passant would uncover the king along the row
+        position = position_from_fen('8/8/8/K2pP2r/8/8/8/7k w - d6 0 1')
+        self.assertNotIn('e5d6', names(position.generate_legal_moves()))
+        self.assertIn('e5d6', names(position.generate_moves()))
+        self.assertEqual([], position.generate_legal_moves(captures_only=True))
+        self.assertTrue(position_from_fen('3R2k1/5ppp/8/8/8/8/8/4K3 b - - 0 1').is_checkmate())
+        self.assertTrue(position_from_fen('k7/8/1Q6/8/8/8/8/4K3 b - - 0 1').is_stalemate())
+        self.assertFalse(position_from_fen('k7/8/1Q6/8/8/8/8/4K3 b - - 0 1').is_checkmate())
+
+    def test_staged_moves(self):
+        position = position_from_fen('r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1')
+        name = lambda name: square_index(('abcdefgh'.index(name[0]), 8 - int(name[1])))
+        hash_move = encode_move(name('a2'), name('a3'))
+        killer = encode_move(name('e1'), name('g1'))
+        moves = list(position.generate_staged_moves(hash_move, [killer, encode_move(name('e1'), name('e3'))]))
+        self.assertCountEqual(position.generate_legal_moves(), moves)
+        self.assertEqual(len(set(moves)), len(moves))
+        self.assertEqual([hash_move], moves[:1])
+        # Captures follow, taking the most valuable piece first and with the least valuable piece first, then the legal killer
+        captures = position.generate_legal_moves(captures_only=True)
+        self.assertCountEqual(captures, moves[1:1 + len(captures)])
+        self.assertEqual([encode_move(name('e2'), name('a6')), encode_move(name('f3'), name('f6'))], moves[1:3])
+        self.assertEqual(encode_move(name('f3'), name('h3')), moves[len(captures)])
+        self.assertEqual(killer, moves[1 + len(captures)])
+        self.assertCountEqual(captures, list(position.generate_staged_moves(quiets=False)))
+        # A move from another position (ex: a table collision) is skipped
+        other_moves = list(position.generate_staged_moves(encode_move(name('a2'), name('a5')), [killer]))
+        self.assertCountEqual(moves, other_moves)
+        self.assertEqual(moves[1], other_moves[0])
+        self.assertFalse(position.is_legal(encode_move(name('a7'), name('a6'))))
+        self.assertFalse(position.is_legal(encode_move(name('a2'), name('a8'))))
+        # Castling through an attacked square isn't legal
+        position = position_from_fen('5r2/6k1/8/8/8/8/8/R3K2R w KQ - 0 1')
+        self.assertFalse(position.is_legal(encode_move(name('e1'), name('g1'))))
+        self.assertTrue(position.is_legal(encode_move(name('e1'), name('c1'))))
+        self.assertTrue(position.has_legal_moves())
+        self.assertFalse(position_from_fen('k7/8/1Q6/8/8/8/8/4K3 b - - 0 1').has_legal_moves())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import pygame
+from Classes.assets import load_image
+from Classes.renderer import Renderer, SQUARE_SIZE
+from gamelogic import Game
+
+class TestRendererMethods(unittest.TestCase):
+    def setUp(self):
+        pygame.display.init()
+        self.screen = pygame.display.set_mode((690, 690))
+
+    def tearDown(self):
+        pygame.display.quit()
+
+    def test_only_dirty_squares_are_redrawn(self):
+        game = Game()
+        board = game.get_board()
+        renderer = Renderer(self.screen)
+        background = load_image('Images/chess_board.jpg')
+        self.assertEqual([self.screen.get_rect()], renderer.render(background, game))
+        # Nothing changed, so nothing is drawn
+        self.assertEqual([], renderer.render(background, game))
+        pieces_board = board.get_pieces_board()
+        board.make_move(pieces_board[4][6], (4, 4))
+        rects = renderer.render(background, game)
+        self.assertEqual(sorted([board.return_board_pos()[4][6], board.return_board_pos()[4][4]]), sorted(rect.topleft for rect in rects))
+        self.assertEqual((SQUARE_SIZE, SQUARE_SIZE), rects[0].size)
+        self.assertEqual([], renderer.render(background, game))
+
+    def test_highlights_are_dirty(self):
+        game = Game()
+        board = game.get_board()
+        renderer = Renderer(self.screen)
+        background = load_image('Images/chess_board.jpg')
+        renderer.render(background, game)
+        board.add_potential_positions(board.get_pieces_board()[1][7])
+        self.assertEqual(2, len(renderer.render(background, game)))
+        board.clear_potential_positions()
+        self.assertEqual(2, len(renderer.render(background, game)))
+        renderer.invalidate()
+        self.assertEqual([self.screen.get_rect()], renderer.render(background, game))
+
+if __name__ == '__main__':
+    unittest.main()
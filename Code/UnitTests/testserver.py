@@ -0,0 +1,138 @@
+import unittest
+import asyncio
+import json
+import sys
+import os
+import tempfile
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from Classes.bitboard import *
+from Classes.notation import coordinate_to_move
+from Classes.position import encode_move
+from Classes.server import GameServer, benchmark
+from gamelogic import Game
+
+class TestServerMethods(unittest.TestCase):
+    def test_coordinateToMove(self):
+        self.assertEqual(encode_move(square_index((4, 6)), square_index((4, 4))), coordinate_to_move('e2e4'))
+        self.assertEqual(encode_move(square_index((0, 1)), square_index((0, 0)), QUEEN), coordinate_to_move('a7a8q'))
+        self.assertRaises(ValueError, lambda: coordinate_to_move('e2e9'))
+        self.assertRaises(ValueError, lambda: coordinate_to_move('Nf3'))
+
+    def test_createServerWithInvalidEngineSettings(self):
+        self.assertRaises(ValueError, lambda: GameServer(self.helper_game, engine_time=0))
+        self.assertRaises(ValueError, lambda: GameServer(self.helper_game, engine_depth=0))
+
+    def test_twoPlayersGame(self):
+        async def scenario(server, port):
+            white = await self.helper_connect(port)
+            black = await self.helper_connect(port)
+            joined = await self.helper_request(white, {"Action": "new"})
+            self.assertEqual('joined', joined["Event"])
+            self.assertEqual('white', joined["Colour"])
+            game_id = joined["Game"]
+            self.assertEqual('black', (await self.helper_request(black, {"Action": "join", "Game": game_id}))["Colour"])
+            self.assertEqual('error', (await self.helper_request(black, {"Action": "join", "Game": game_id}))["Event"])
+            # Only the side to move may play, and only legal moves
+            self.assertEqual('error', (await self.helper_request(black, {"Action": "move", "Game": game_id, "Move": "e7e5"}))["Event"])
+            self.assertEqual('error', (await self.helper_request(white, {"Action": "move", "Game": game_id, "Move": "e2e5"}))["Event"])
+            ack = await self.helper_request(white, {"Action": "move", "Game": game_id, "Move": "e2e4"})
+            self.assertEqual({"Event": "ack", "Game": game_id, "Move": "e4"}, ack)
+            for client in (white, black):
+                position = await self.helper_read(client)
+                self.assertEqual('position', position["Event"])
+                self.assertEqual('e4', position["Move"])
+                self.assertEqual('*', position["Result"])
+                self.assertTrue(position["FEN"].startswith('rnbkqbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b'))
+            # SAN works as well
+            self.assertEqual('e5', (await self.helper_request(black, {"Action": "move", "Game": game_id, "Move": "e5"}))["Move"])
+            self.assertEqual('e5', (await self.helper_read(white))["Move"])
+            self.assertEqual('error', (await self.helper_request(white, {"Action": "teleport"}))["Event"])
+            self.assertEqual('error', (await self.helper_request(white, {"Action": "move", "Game": 999, "Move": "d2d4"}))["Event"])
+            # Fields of the wrong type are rejected without dropping the connection
+            for request in ({"Action": "join", "Game": [1]}, {"Action": "new", "FEN": 123}, {"Action": "new", "Colour": []}, {"Action": "move", "Game": game_id, "Move": 5}):
+                self.assertEqual('error', (await self.helper_request(white, request))["Event"])
+            self.assertEqual(1, server.get_game_count())
+            black[1].close()
+            self.assertEqual({"Event": "left", "Game": game_id}, await self.helper_read(white))
+            white[1].close()
+        self.helper_run(scenario)
+
+    def test_gameAgainstComputer(self):
+        async def scenario(server, port):
+            client = await self.helper_connect(port)
+            joined = await self.helper_request(client, {"Action": "new", "Computer": True})
+            game_id = joined["Game"]
+            await self.helper_request(client, {"Action": "move", "Game": game_id, "Move": "d2d4"})
+            self.assertEqual('d4', (await self.helper_read(client))["Move"])
+            reply = await asyncio.wait_for(self.helper_read(client), 30)
+            self.assertEqual('position', reply["Event"])
+            self.assertEqual(' w ', reply["FEN"][reply["FEN"].index(' '):][:3])
+            client[1].close()
+        self.helper_run(scenario)
+
+    def test_impossiblePositionsAreRejected(self):
+        async def scenario(server, port):
+            client = await self.helper_connect(port)
+            for fen in ('kk6/8/8/8/8/8/8/7K w - - 0 1', 'P6k/8/8/8/8/8/8/7K w - - 0 1', 'kK6/8/8/8/8/8/8/8 w - - 0 1'):
+                self.assertEqual('error', (await self.helper_request(client, {"Action": "new", "Computer": True, "FEN": fen}))["Event"])
+            self.assertEqual(0, server.get_game_count())
+            client[1].close()
+        self.helper_run(scenario)
+
+    def test_computerMoveFailure(self):
+        async def scenario(server, port):
+            # The workers open the book when they first search, it has gone by then
+            os.remove(book_path)
+            client = await self.helper_connect(port)
+            game_id = (await self.helper_request(client, {"Action": "new", "Colour": "black", "Computer": True}))["Game"]
+            reply = await asyncio.wait_for(self.helper_read(client), 30)
+            self.assertEqual(('error', game_id), (reply["Event"], reply["Game"]))
+            client[1].close()
+        with tempfile.TemporaryDirectory() as directory:
+            book_path = os.path.join(directory, 'book.bin')
+            open(book_path, 'wb').close()
+            self.helper_run(scenario, book_path=book_path)
+
+    def test_checkmateEndsGame(self):
+        async def scenario(server, port):
+            client = await self.helper_connect(port)
+            game_id = (await self.helper_request(client, {"Action": "new", "FEN": "6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1"}))["Game"]
+            await self.helper_request(client, {"Action": "join", "Game": game_id})
+            self.assertEqual('Ra8#', (await self.helper_request(client, {"Action": "move", "Game": game_id, "Move": "a1a8"}))["Move"])
+            self.assertEqual('1-0', (await self.helper_read(client))["Result"])
+            self.assertEqual('error', (await self.helper_request(client, {"Action": "move", "Game": game_id, "Move": "g8h8"}))["Event"])
+            client[1].close()
+        self.helper_run(scenario)
+
+    def test_benchmark(self):
+        async def scenario(server, port):
+            results = await benchmark('127.0.0.1', port, games=20, moves=4, interval=0.01, connections=3)
+            self.assertEqual(80, results["Moves"])
+            self.assertTrue(0 < results["Median"] <= results["P99"] <= results["Max"])
+        self.helper_run(scenario)
+
+    def helper_run(self, scenario, book_path=None):
+        async def run():
+            server = GameServer(self.helper_game, port=0, workers=1, engine_time=0.2, engine_depth=2, book_path=book_path)
+            port = await server.start()
+            try:
+                await asyncio.wait_for(scenario(server, port), 60)
+            finally:
+                await server.close()
+        asyncio.run(run())
+
+    def helper_game(self, fen):
+        return Game(headless=True, fen=fen)
+
+    async def helper_connect(self, port):
+        return await asyncio.open_connection('127.0.0.1', port)
+
+    async def helper_request(self, client, request):
+        client[1].write((json.dumps(request) + '\n').encode())
+        return await self.helper_read(client)
+
+    async def helper_read(self, client):
+        return json.loads(await asyncio.wait_for(client[0].readline(), 30))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+import sys
+import os
+import pickle
+import tempfile
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from Classes.tablebase import *
+from Classes.engine import Engine
+from Classes.fen import position_from_fen
+from Classes.notation import move_to_san
+
+class TestTablebaseMethods(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # The smallest table with any wins in it, generated once for all the tests
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.stats = generate_tables(['KvKQ'], cls.directory.name)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+
+    def test_parseSignature(self):
+        self.assertEqual(('KQvK', [(WHITE, KING), (WHITE, QUEEN), (BLACK, KING)]), parse_signature('KQvK'))
+        self.assertEqual('KQvK', parse_signature('kvkq')[0])
+        self.assertEqual('KRvKP', parse_signature('KPvKR')[0])
+        self.assertEqual('KPvKP', parse_signature('KPvKP')[0])
+        for signature in ('KQ', 'KKvK', 'KQvQ', 'KXvK', 'KQRvKR'):
+            self.assertRaises(ValueError, lambda: parse_signature(signature))
+
+    def test_generatedTable(self):
+        self.assertEqual(['KQvK'], [stats["Signature"] for stats in self.stats])
+        # The longest mate with a queen takes 10 moves
+        self.assertEqual(20, self.stats[0]["Longest"])
+        with open(os.path.join(self.directory.name, 'KQvK.tb'), 'rb') as stream:
+            table = stream.read()
+        self.assertEqual(2 * 64 ** 3, len(table))
+        self.assertEqual(19, max(value for value in table[:64 ** 3] if value < LOSS))
+        # Tables already generated are kept
+        self.assertEqual([], generate_tables(['KQvK'], self.directory.name))
+
+    def test_probe(self):
+        tablebase = Tablebase(self.directory.name)
+        self.assertEqual(['KQvK'], tablebase.get_signatures())
+        self.assertEqual(3, tablebase.get_max_pieces())
+        self.assertEqual((1, 1), tablebase.probe(position_from_fen('k7/8/1K6/8/8/8/8/6Q1 w - - 0 1')))
+        self.assertEqual((-1, 0), tablebase.probe(position_from_fen('k6Q/8/1K6/8/8/8/8/8 b - - 0 1')))
+        # Colours swapped, the board is flipped to look it up
+        self.assertEqual((1, 1), tablebase.probe(position_from_fen('6q1/8/8/8/8/1k6/8/K7 b - - 0 1')))
+        # Black takes the undefended queen
+        self.assertEqual((0, 0), tablebase.probe(position_from_fen('k7/1Q6/8/8/8/8/8/7K b - - 0 1')))
+        self.assertEqual((0, 0), tablebase.probe(position_from_fen('k7/8/8/8/8/8/8/7K w - - 0 1')))
+        self.assertIsNone(tablebase.probe(position_from_fen('k7/8/8/8/8/8/8/6RK w - - 0 1')))
+        self.assertIsNone(tablebase.probe(position_from_fen('k7/8/8/8/8/8/8/5QRK w - - 0 1')))
+        self.assertEqual((1, 1), pickle.loads(pickle.dumps(tablebase)).probe(position_from_fen('k7/8/1K6/8/8/8/8/6Q1 w - - 0 1')))
+        tablebase.close()
+
+    def test_engineUsesTablebase(self):
+        tablebase = Tablebase(self.directory.name)
+        position = position_from_fen('k7/8/1K6/8/8/8/8/6Q1 w - - 0 1')
+        engine = Engine(max_depth=4, tablebase=tablebase)
+        self.assertEqual('Qg8#', move_to_san(position, engine.search(position)))
+        self.assertEqual(0, engine.get_nodes())
+        # Taking the rook leads into the table, which scores it as a forced mate instead of the search carrying on
+        position = position_from_fen('2k5/8/8/8/8/8/8/r2QK3 w - - 0 1')
+        engine = Engine(max_depth=3, tablebase=tablebase)
+        self.assertEqual('Qxa1', move_to_san(position, engine.search(position)))
+        self.assertGreater(engine.get_score(), 90000)
+        searched = Engine(max_depth=3)
+        searched.search(position)
+        self.assertLess(searched.get_score(), 90000)
+        self.assertLess(engine.get_nodes(), searched.get_nodes())
+        tablebase.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+import sys
+import os
+import tempfile
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from Classes.pgn import read_games, replay_game
+from Classes import tournament
+from Classes.fen import position_from_fen
+from Classes.tournament import *
+
+class TestTournamentMethods(unittest.TestCase):
+    def test_parse_player(self):
+        self.assertEqual({'max_depth': 3, 'time_limit': 0.5, 'hash_mb': 8.0}, parse_player('depth=3, time=0.5,hash=8'))
+        self.assertEqual({'book': 'openings.bin'}, parse_player('book=openings.bin'))
+        self.assertEqual({}, parse_player(''))
+        with self.assertRaises(ValueError):
+            parse_player('eval=material')
+
+    def test_elo_difference(self):
+        elo, margin = elo_difference(5, 10, 5)
+        self.assertEqual(0, elo)
+        self.assertGreater(margin, 0)
+        # 75% is about +191 Elo
+        elo, margin = elo_difference(60, 30, 10)
+        self.assertAlmostEqual(190.8, elo, 1)
+        self.assertLess(margin, elo)
+        self.assertEqual(float('inf'), elo_difference(3, 0, 0)[0])
+
+    def test_insufficient_material(self):
+        rules = {"MaxPlies": 100, "ResignScore": 1000, "ResignMoves": 0}
+        def adjudicate(fen):
+            position = position_from_fen(fen)
+            return tournament._adjudicate(position, [position.get_key()], [], rules)
+        for fen in ('4k3/8/8/8/8/8/8/4K3 w', '4k3/8/8/8/8/8/8/2B1K3 w', '4k3/8/3n4/8/8/8/8/4K3 b'):
+            self.assertEqual(('1/2-1/2', 'insufficient material'), adjudicate(fen))
+        # A rook, a pawn or two minor pieces can still mate
+        for fen in ('4k3/8/8/8/8/8/8/R3K3 w', '4k3/8/8/8/8/8/P7/4K3 w', '4k3/8/8/8/8/8/8/1NB1K3 w', '4k3/8/3n4/8/8/8/8/2B1K3 w'):
+            self.assertIsNone(adjudicate(fen))
+
+    def test_play_game(self):
+        rules = {"MaxPlies": 12, "ResignScore": 1000, "ResignMoves": 0}
+        task = {"Index": 0, "White": {'max_depth': 1}, "Black": {'max_depth': 1}, "Opening": [], "Rules": rules}
+        game = play_game(task)
+        self.assertEqual(('1/2-1/2', 'move limit'), (game["Result"], game["Termination"]))
+        self.assertEqual(12, len(game["Moves"]))
+
+    def test_resume(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'match.pgn')
+            tournament = Tournament('depth=1', 'depth=1,hash=1', games=2, pgn_path=path, workers=1, opening_plies=2, max_plies=8)
+            results = tournament.run()
+            self.assertEqual(2, sum(results.values()))
+            with open(path) as stream:
+                games = list(read_games(stream))
+            self.assertEqual(['1', '2'], [game["Tags"]["Round"] for game in games])
+            # Both games of a pair start with the same opening
+            self.assertEqual(games[0]["Moves"][:2], games[1]["Moves"][:2])
+            for game in games:
+                replay_game(game)
+            # Games already in the file are counted, not played again
+            tournament = Tournament('depth=1', 'depth=1,hash=1', games=3, pgn_path=path, workers=1, opening_plies=2, max_plies=8)
+            played = []
+            results = tournament.run(lambda game, results: played.append(game["Index"]))
+            self.assertEqual([2], played)
+            self.assertEqual(3, sum(results.values()))
+            # Games whose Round tag isn't a game number are played again rather than stopping the tournament
+            with open(path) as stream:
+                text = stream.read()
+            with open(path, 'w') as stream:
+                stream.write(text.replace('[Round "1"]', '[Round "?"]').replace('[Round "2"]', '[Round "1.2"]'))
+            played = []
+            tournament = Tournament('depth=1', 'depth=1,hash=1', games=3, pgn_path=path, workers=1, opening_plies=2, max_plies=8)
+            tournament.run(lambda game, results: played.append(game["Index"]))
+            self.assertEqual([0, 1], sorted(played))
+
+if __name__ == '__main__':
+    unittest.main()
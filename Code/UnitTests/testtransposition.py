@@ -0,0 +1,58 @@
+import unittest
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from Classes.transposition import *
+from Classes.engine import Engine
+from gamelogic import Game
+
+class TestTranspositionMethods(unittest.TestCase):
+    def test_store_and_probe(self):
+        table = TranspositionTable(1)
+        self.assertEqual(1024 * 1024, table.get_size())
+        key = 0x123456789ABCDEF0
+        self.assertIsNone(table.probe(key))
+        table.store(key, 5, LOWER_BOUND, -250, 1234)
+        self.assertEqual((5, LOWER_BOUND, -250, 1234), table.probe(key))
+        self.assertEqual({"Hits": 1, "Misses": 1, "Collisions": 0, "Stores": 1}, table.get_stats())
+        table.clear()
+        self.assertIsNone(table.probe(key))
+
+    def test_replacement_policy(self):
+        # A single bucket, so every key collides
+        table = TranspositionTable(BUCKET_BYTES / (1024 * 1024))
+        table.store(1, 6, EXACT, 10, 0)
+        table.store(2, 3, EXACT, 20, 0)
+        # The deeper entry stays, the shallower one goes in the always-replace entry
+        self.assertEqual(6, table.probe(1)[0])
+        self.assertEqual(3, table.probe(2)[0])
+        table.store(3, 2, EXACT, 30, 0)
+        self.assertIsNotNone(table.probe(1))
+        self.assertIsNone(table.probe(2))
+        self.assertEqual(1, table.get_stats()["Collisions"])
+        table.store(4, 7, UPPER_BOUND, 40, 0)
+        self.assertIsNone(table.probe(1))
+        self.assertEqual((7, UPPER_BOUND, 40, 0), table.probe(4))
+
+    def test_memory_limit(self):
+        self.assertRaises(ValueError, lambda: TranspositionTable(0))
+        # Rounded down to a power of two number of buckets
+        self.assertEqual(2 * 1024 * 1024, TranspositionTable(3).get_size())
+        self.assertRaises(ValueError, lambda: TranspositionTable(1, bytearray(100)))
+        buffer = bytearray(1024 * 1024)
+        table = TranspositionTable(1, buffer)
+        table.store(99, 1, EXACT, 0, 0)
+        self.assertTrue(any(buffer))
+
+    def test_engine_uses_table(self):
+        position = Game(headless=True).get_board().get_position()
+        engine = Engine(time_limit=5, max_depth=3, hash_mb=1)
+        move = engine.search(position)
+        stats = engine.get_table().get_stats()
+        self.assertGreater(stats["Stores"], 0)
+        self.assertGreater(stats["Hits"], 0)
+        # The root's result is in the table
+        self.assertEqual(move, engine.get_table().probe(position.get_key())[3])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import argparse
+import sys
+import time
+
+from Classes.book import OpeningBook, build_book
+from Classes.fen import START_FEN, position_from_fen
+from Classes.notation import move_to_san
+from Classes.pgn import DEFAULT_FEN
+
+"""
+    Script for compiling PGN games into an opening book file (see Classes/book.py), or listing a position's book moves.
+
+    Run from the top level of the ChessGame folder:
+        python3 Code/book.py games.pgn more_games.pgn --output openings.bin --plies 16 --min-weight 2
+        python3 Code/book.py --probe openings.bin --position "rnbkqbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq - 0 1"
+
+    The book is used with --book in run.py and server.py, and book=openings.bin in tournament.py's player settings.
+    This game's starting layout isn't the usual one (see Classes/book.py), so compile the games it played, ex: a tournament.py PGN file.
+"""
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compile PGN games into an opening book, or list the book moves of a position.')
+    parser.add_argument('files', nargs='*', help='PGN files to compile')
+    parser.add_argument('--output', default='book.bin', help='Book file to write')
+    parser.add_argument('--plies', type=int, default=20, help='Number of half moves of each game to add to the book')
+    parser.add_argument('--min-weight', type=int, default=1, help='Leave out moves played in fewer games than this')
+    parser.add_argument('--probe', metavar='BOOK', help='List the book moves of --position instead of compiling')
+    parser.add_argument('--position', default=START_FEN, help='Position to probe as a FEN string')
+    args = parser.parse_args()
+
+    if args.probe:
+        try:
+            position = position_from_fen(args.position)
+        except ValueError as error:
+            parser.error(str(error))
+        book = OpeningBook(args.probe)
+        moves = book.get_moves(position)
+        total = sum(weight for move, weight in moves)
+        for move, weight in moves:
+            print('{:<8} {:>6} {:>5.1f}%'.format(move_to_san(position, move), weight, 100 * weight / total))
+        print('{} book moves ({} entries in the book)'.format(len(moves), len(book)))
+        sys.exit(0)
+
+    if not args.files:
+        parser.error('Give the PGN files to compile, or --probe a book')
+    start = time.perf_counter()
+    try:
+        results = build_book(args.files, args.output, args.plies, args.min_weight)
+    except ValueError as error:
+        parser.error(str(error))
+    print('{} games, {} positions, {} entries written to {} in {:.1f}s'.format(results["Games"], results["Positions"], results["Entries"], args.output, time.perf_counter() - start))
+    if results["Standard"]:
+        print('Warning: {} of the games start from the usual chess layout ({}), which this game never reaches as it starts from {}. '
+              'Their moves are in the book but will never be played.'.format(results["Standard"], DEFAULT_FEN.split()[0], START_FEN.split()[0]), file=sys.stderr)
+    sys.exit(0)
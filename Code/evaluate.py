@@ -0,0 +1,63 @@
+import argparse
+import sys
+import time
+
+from Classes.pgn import DEFAULT_FEN, read_games
+from Classes.fen import format_fen, position_from_fen
+from Classes.notation import san_to_move
+
+"""
+    Script for scoring every position of PGN archives in one batch with NumPy (see Classes/batch.py), ex: to look for the most
+    lopsided positions of a self-play run. Games are replayed through the rules to reach their positions, games with moves that can't
+    be played stop at the first one.
+
+    Run from the top level of the ChessGame folder (needs NumPy, pip install numpy):
+        python3 Code/evaluate.py games.pgn
+        python3 Code/evaluate.py match.pgn --no-mobility --top 5
+"""
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Score every position of PGN archives in one NumPy batch.')
+    parser.add_argument('files', nargs='+', help='PGN files to score')
+    parser.add_argument('--no-mobility', action='store_true', help='Only score material and piece placement, the same as the engine')
+    parser.add_argument('--top', type=int, default=0, help='Print the positions with the largest scores')
+    args = parser.parse_args()
+
+    try:
+        import numpy
+        from Classes.batch import evaluate_batch
+    except ImportError:
+        parser.error('Batch evaluation needs NumPy: pip install numpy')
+
+    start = time.perf_counter()
+    # Only each position's square codes and colour to move are kept, so archives of millions of positions fit in memory
+    mailboxes = []
+    turns = []
+    for path in args.files:
+        with open(path, encoding='utf-8', errors='replace') as stream:
+            for game in read_games(stream):
+                try:
+                    position = position_from_fen(game["Tags"].get('FEN', DEFAULT_FEN))
+                    mailboxes.append(bytes(position.get_mailbox()))
+                    turns.append(position.get_turn())
+                    for san in game["Moves"]:
+                        position.make_move(san_to_move(position, san))
+                        mailboxes.append(bytes(position.get_mailbox()))
+                        turns.append(position.get_turn())
+                except ValueError:
+                    continue
+    count = len(mailboxes)
+    mailboxes = numpy.frombuffer(b''.join(mailboxes), dtype=numpy.uint8).reshape(-1, 64)
+    turns = numpy.array(turns, dtype=numpy.uint8)
+    replayed = time.perf_counter()
+    scores = evaluate_batch(mailboxes, turns, not args.no_mobility)
+    evaluated = time.perf_counter()
+    # White's point of view, so the scores of different positions compare
+    white_scores = numpy.where(turns == 0, scores, -scores)
+    print('{} positions replayed in {:.1f}s, evaluated in {:.3f}s ({:.0f} positions/s)'.format(count, replayed - start, evaluated - replayed, count / max(evaluated - replayed, 1e-9)))
+    if count:
+        print('White\'s score: mean {:.1f}, min {}, max {}'.format(white_scores.mean(), white_scores.min(), white_scores.max()))
+    if args.top:
+        for index in numpy.argsort(-numpy.abs(white_scores))[:args.top]:
+            print('{:>6} {}'.format(white_scores[index], format_fen(mailboxes[index].tobytes(), int(turns[index]), 0, None, 0, 1)))
+    sys.exit(0)
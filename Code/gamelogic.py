@@ -1,52 +1,125 @@
 from Classes.player import *
-from Classes.button import Button
 from Classes.board import Board
 from Classes.piece_factory import PieceFactory
+from Classes.bitboard import board_index, COLOURS, PIECE_TYPES, WHITE, BLACK, KING
+from Classes.position import decode_move
+from Classes.fen import position_from_fen
+from Classes.pgn import format_game
 
-import os
-import pygame
 import sys
 
+def _create_board_coordinates():
+    """
+        This creates the array object which represents the board. The array object is initialized with positions that follow the squares on the board image.
+
+        Returns
+        -------
+            2D tuple
+                The screen coordinates of each square, indexed [x][y] like the Board object's array
+    """
+    board = [ [0]*8 for i in range(8)]
+    x_coord = 60
+    y_coord = 55
+    for y in range(0, 8):
+        for x in range(0, 8):
+            board[x][y] = (x_coord, y_coord)
+            x_coord += 75
+        y_coord += 75
+        x_coord = 60
+    return tuple(tuple(column) for column in board)
+
+BOARD_COORDINATES = _create_board_coordinates()
+
 class Game():
     """
         Class for controlling much of the game logic.
         Game logic is split between higher level control which belongs here and
         lower level management of the board which is contained in board.py.
+        pygame is only needed for displaying the game, a headless game keeps the same rules without loading any images.
+        Given an Engine object, the computer plays the second player's ('p2', black) moves.
+        Games start from the usual layout, or from any position given as a FEN string (see from_fen).
+        The moves played are logged in SAN and the game can be saved as PGN with to_pgn.
     """
-    def __init__(self):
+    def __init__(self, headless=False, engine=None, fen=None):
         """
             Initialize the game logic
+
+            Paramters
+            ---------
+                headless: boolean
+                    True to run the game without pygame (for example on a server), nothing can be drawn or clicked.
+                engine: Engine object
+                    The computer opponent playing the second player's moves, leave empty for two human players.
+                fen: string
+                    FEN string of the position to start from, leave empty for the usual starting layout.
         """
         self.__factory = PieceFactory()
-        
+        self.__headless = headless
+        self.__possible_moves = []
+        self.__current_piece = None
+        self.__engine = engine
+        self.game_state = []
+        if fen:
+            self.from_fen(fen)
+            return
+
         self.__white_pieces = self.__create_pieces('white')
         self.__black_pieces = self.__create_pieces('black')
 
         self.__first_player = Player('white', self.__white_pieces)
         self.__second_player = Player('black', self.__black_pieces)
 
-        self.__board = self.__create_board(self.__first_player, self.__second_player)
+        self.__board = self.__create_board(self.__first_player, self.__second_player, headless)
  
         self.__game_turn = 'p1'
-        self.__possible_moves = []
+        self.__start_fen = self.__board.to_fen()
+        self.__result = '*'
+
+    def from_fen(self, fen):
+        """
+            Sets the game up from a FEN string (see fen.py) instead of the starting layout, replacing the current pieces and board. Used to load test positions or carry on stored games.
+            The pieces are created from the position the FEN string describes: pawns on their starting row and the kings and rooks with castling rights haven't moved, every other piece has.
+            The colour to move, en passant square and move counters are copied to the board's position.
+
+            Paramters
+            ---------
+                fen: string
+                    The FEN string of a position that can happen in a game: one king per colour, no pawns on the first or last row and the colour that isn't to move not in check (see fen.position_from_fen)
+        """
+        position = position_from_fen(fen)
+        pieces = ([], [])
+        unmoved = position.get_unmoved()
+        for square, code in enumerate(position.get_mailbox()):
+            if code:
+                colour, p_type = divmod(code - 1, 6)
+                x_pos, y_pos = board_index(square)
+                piece = self.__factory.create_piece(PIECE_TYPES[p_type], COLOURS[colour], x_pos, y_pos)
+                piece.restore((x_pos, y_pos), not (1 << square) & unmoved)
+                pieces[colour].append(piece)
+        self.__white_pieces, self.__black_pieces = pieces
+
+        self.__first_player = Player('white', self.__white_pieces)
+        self.__second_player = Player('black', self.__black_pieces)
+
+        self.__board = self.__create_board(self.__first_player, self.__second_player, self.__headless)
+        board_position = self.__board.get_position()
+        board_position.set_turn(position.get_turn())
+        board_position.set_en_passant(position.get_en_passant())
+        board_position.set_move_counters(position.get_halfmove_clock(), position.get_fullmove_number())
+
+        self.__game_turn = 'p1' if position.get_turn() == WHITE else 'p2'
         self.__current_piece = None
+        self.__start_fen = self.__board.to_fen()
+        self.__result = '*'
 
-    def __create_board(self, first_player, second_player):
+    def __create_board(self, first_player, second_player, headless):
         """
-            This creates the array object which represents the board and is used to initialize the Board object. The array object is initialized with positions that follow the squares on the board image.
+            This creates the Board object from the array of positions that follow the squares on the board image.
             The reason for creating the array here as opposed to in the board.py class is separation of logic from initialization.
             The GameLogic class handles most of the initializations and the top level game logic whereas the Board class is focused on the logic of managing the board's squares.
+            The array never changes, so every game shares the one built when the module is imported.
         """
-        board = [ [0]*8 for i in range(8)]
-        x_coord = 60
-        y_coord = 55
-        for y in range(0, 8):
-            for x in range(0, 8):
-                board[x][y] = (x_coord, y_coord)
-                x_coord += 75
-            y_coord += 75
-            x_coord = 60
-        return Board(board, first_player, second_player)
+        return Board(BOARD_COORDINATES, first_player, second_player, headless)
 
     def __create_pieces_helper(self, colour, p_type, amount, y_pos, piece_counter):
         """
@@ -135,6 +208,75 @@ class Game():
         for position in self.__board.get_potential_positions():
             position['Button'].draw(screen)
 
+    def get_board(self):
+        """
+            Returns
+            -------
+                Board object: The board holding the game's pieces
+        """
+        return self.__board
+
+    def get_move_log(self):
+        """
+            Returns
+            -------
+                array of strings: The moves played so far in SAN, oldest first
+        """
+        return self.__board.get_move_log()
+
+    def get_result(self):
+        """
+            Returns
+            -------
+                string: '1-0' or '0-1' once a player is checkmated (or a king has been taken), '1/2-1/2' after a stalemate, '*' while the game is still going
+        """
+        return self.__result
+
+    def play_move(self, move):
+        """
+            Plays an encoded move (see position.encode_move) for the player to move, the same way a clicked move is played. Used to drive a headless game, ex: from the game server.
+
+            Paramters
+            ---------
+                move: integer
+                    The encoded move
+
+            Returns
+            -------
+                string: The move in SAN
+
+            Raises
+            ------
+                ValueError
+                    If the game is over or the move isn't legal
+        """
+        if self.__result != '*' or not self.__board.get_position().is_legal(move):
+            raise ValueError("Illegal move: {}".format(move))
+        from_square, to_square, promotion = decode_move(move)
+        from_pos = board_index(from_square)
+        self.__board.clear_potential_positions()
+        self.__current_piece = self.__board.get_pieces_board()[from_pos[0]][from_pos[1]]
+        self.__play_move(board_index(to_square), PIECE_TYPES[promotion] if promotion else 'queen')
+        return self.__board.get_move_log()[-1]
+
+    def to_pgn(self, tags=None):
+        """
+            Writes the game played so far as PGN text (see pgn.py). The starting position is saved in a FEN tag, since the game's layout isn't the usual chess one.
+
+            Paramters
+            ---------
+                tags: dictionary
+                    Extra PGN tags, ex: {"White": "Kurran", "Event": "Club night"}
+
+            Returns
+            -------
+                string: The game in PGN
+        """
+        tags = dict(tags or {})
+        tags['SetUp'] = '1'
+        tags['FEN'] = self.__start_fen
+        return format_game(self.get_move_log(), tags, self.__result)
+
     def __change_turn(self):
         """
             Handles turn changes (Separated as method in order to increase readability)
@@ -150,65 +292,91 @@ class Game():
 
     def __remove_piece(self, piece):
         """
-            Handles removing a 'taken' piece. Takes in the piece in the occupied game board square and removes it from the non current player. (If  the piece is a king, the game is ended)
+            Handles a 'taken' piece. The board already removes the piece from the non current player when the move is made, so this only checks whether the game is over. (If  the piece is a king, the game is ended)
             
             Paramters
             ---------
                 piece: Piece object
-                    The piece to be removed from the board after being taken by the opposing player.
+                    The piece taken by the opposing player.
         """
-        player = self.__first_player if 'p1' != self.__game_turn else self.__second_player
-        player.get_pieces().remove(piece)
-        if piece.get_piece_type() == 'king':
+        if piece.get_type_code() == KING:
+            self.__result = '0-1' if piece.get_colour() == 'white' else '1-0'
             self.__game_over()
-        piece = None
 
-    def __select_move(self):
+    def __play_move(self, board_pos, promotion='queen'):
         """
-            This method is called as part of the regular game loop. The for loop will be empty until a piece is selected and then the board objects potential positions' array will be populated.
-            The potential positions' array is a list of every move that a piece can make. This loop will cycle through all these possibilities to register a click on one of them.
-            
-            This loop can be broken down into two sections within the first if statement (checking for a click).
-            The main section is what will always occur and it shifts the selected piece to the newly selected square. The piece is added to the new square in the board array and old square removes its reference to the piece, the potential positions' array is cleared and the turn is changed.
-
-            The second section is contained in the if statement for the condition that the piece selected is the king and it hasn't moved yet. This logic is to handle castling (swapping the rook and king) which requires a bit more involved logic than the other moves since two pieces move.
-        """
-        for move in self.__board.get_potential_positions():
-            if move['Button'].click():
-                if self.__current_piece.get_piece_type() == 'king' and not self.__current_piece.has_moved():
-                    pos_diff = move['Index'][0] - self.__current_piece.get_board_index()[0]
-                    board_layout = self.__board.get_pieces_board()
-                    if(pos_diff > 1):
-                        rook = board_layout[move['Index'][0]+1][move['Index'][1]] if board_layout[move['Index'][0]+1][move['Index'][1]] != None else board_layout[move['Index'][0]+2][move['Index'][1]]
-                        self.__board.move_piece(rook, (move['Index'][0]-1, move['Index'][1]))
-                    elif(pos_diff < -1):
-                        rook = board_layout[move['Index'][0]-1][move['Index'][1]] if board_layout[move['Index'][0]-1][move['Index'][1]] != None else board_layout[move['Index'][0]-2][move['Index'][1]]
-                        self.__board.move_piece(rook, (move['Index'][0]+1, move['Index'][1]))
-                self.__board.move_piece(self.__current_piece, move['Index'])
-                if(piece := move['Piece']):
-                    self.__remove_piece(piece)
-                self.__board.clear_potential_positions()
-                self.__change_turn() 
-
-    def __turn(self, player):
-        """
-            This method is called as part of the regular game loop and cycles through the current player's pieces.
-            The pieces are cycled through waiting for a click which then updates the board with the potential moves for the selected piece.
+            Plays the selected piece's move to a square. The board makes the move, which shifts the selected piece to the new square and also handles capturing, castling (moving the rook along with the king) and exchanging pawns.
+            The potential positions' array is then cleared and the turn is changed.
+
+            Paramters
+            ---------
+                board_pos: Integer coordinates
+                    The square the current piece moves to
+                promotion: string
+                    The piece type a pawn reaching the end of the board is exchanged for
+        """
+        self.__board.clear_potential_positions()
+        if(piece := self.__board.make_move(self.__current_piece, board_pos, promotion)):
+            self.__remove_piece(piece)
+        self.__current_piece = None
+        self.__change_turn()
+        self.__check_game_end()
+
+    def __check_game_end(self):
+        """
+            Ends the game when the player to move has no legal moves left: checkmate if their king is in check (the other player wins), stalemate otherwise (a draw).
+        """
+        position = self.__board.get_position()
+        if self.__result != '*' or position.has_legal_moves():
+            return
+        if self.__board.in_check(COLOURS[position.get_turn()]):
+            self.__result = '0-1' if position.get_turn() == WHITE else '1-0'
+        else:
+            self.__result = '1/2-1/2'
+        self.__game_over()
+
+    def __computer_move(self):
+        """
+            Lets the engine search the board's position and plays the move it picks for the second player, the same way a clicked move is played.
+        """
+        move = self.__engine.search(self.__board.get_position())
+        if move is None:
+            return
+        from_square, to_square, promotion = decode_move(move)
+        from_pos = board_index(from_square)
+        self.__current_piece = self.__board.get_pieces_board()[from_pos[0]][from_pos[1]]
+        self.__play_move(board_index(to_square), PIECE_TYPES[promotion] if promotion else 'queen')
+
+    def handle_click(self, pixel_pos):
+        """
+            Handles a mouse click on the board, called from run.py for every click event.
+            The click is mapped straight to a square: clicking one of the highlighted potential positions plays the selected piece's move there,
+            clicking one of the current player's pieces selects it and displays the squares it can move to.
 
             Paramters
             ---------
-                player: player object
-                    The current player whose turn it is.
+                pixel_pos: Integer coordinates
+                    Pixel coordinates of the click on the screen
         """
-        for piece in player.get_pieces():
-            if piece.piece_clicked():
-                self.__board.clear_potential_positions()
-                self.__board.add_potential_positions(piece)
-                self.__current_piece = piece
+        if self.__engine and 'p2' == self.__game_turn:
+            return
+        board_pos = self.__board.square_at(pixel_pos)
+        if board_pos is None:
+            return
+        if self.__board.get_potential_position(board_pos):
+            self.__play_move(board_pos)
+            return
+        piece = self.__board.get_pieces_board()[board_pos[0]][board_pos[1]]
+        player = self.__first_player if 'p1' == self.__game_turn else self.__second_player
+        if piece and piece.get_colour() == player.get_colour():
+            self.__board.clear_potential_positions()
+            self.__board.add_potential_positions(piece)
+            self.__current_piece = piece
 
-    def menu_display(self, game_state, start_button, exit_button):
+    def menu_display(self, game_state, start_button, exit_button, click_pos=None):
         """
             Game menu logic. Displays the menu screen with start and exit buttons, loading the chess board upon start being clicked.
+            The background images come from the shared asset cache, so they aren't read from disk every frame.
 
             Paramters
             ---------
@@ -218,18 +386,21 @@ class Game():
                     The button object for the start button (to begin the game)
                 exit_button: button object
                     The button object for the quit button (to exit)
+                click_pos: Integer coordinates
+                    Pixel coordinates of this frame's mouse click, if there was one
             
             Returns
             -------
                 background: pygame image
                     The background image loaded through pygame.
         """
+        from Classes.assets import load_image
         self.game_state = game_state
-        background = pygame.image.load(os.path.join('./', 'Images/Menu.png'))
-        if start_button.click():
-            background = pygame.image.load(os.path.join('./', 'Images/chess_board.jpg'))
+        background = load_image('Images/Menu.png')
+        if click_pos and start_button.collides(click_pos):
+            background = load_image('Images/chess_board.jpg')
             self.game_state_manager(game_state, 'game')
-        if exit_button.click():
+        if click_pos and exit_button.collides(click_pos):
             sys.exit()
         return background
 
@@ -250,7 +421,7 @@ class Game():
 
     def game(self):
         """
-            Central game loop called from run.py, this handles passing in the current player to the turn method (handles piece selection) and then the select_move method (handles moving the selected piece).
+            Central game loop called from run.py every frame. Human players' moves come from click events (see handle_click), so this only has work to do when the computer is playing the second player and it is their turn.
         """
-        self.__turn(self.__first_player) if 'p1' == self.__game_turn else self.__turn(self.__second_player)
-        self.__select_move()
\ No newline at end of file
+        if self.__engine and 'p2' == self.__game_turn:
+            self.__computer_move()
\ No newline at end of file
@@ -0,0 +1,75 @@
+import argparse
+import sys
+import time
+
+from Classes.perft import *
+from Classes.parallel import parallel_perft, ParallelEngine
+from Classes.engine import Engine
+
+"""
+    Script for measuring the move generator. Counts the leaf nodes of the move tree (perft) from the game's starting position,
+    from a given position or for the whole reference suite, and reports the nodes per second.
+
+    Run from the top level of the ChessGame folder:
+        python3 Code/perft.py --depth 4
+        python3 Code/perft.py --depth 3 --position "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+        python3 Code/perft.py --suite --depth 3
+        python3 Code/perft.py --depth 5 --workers 8
+        python3 Code/perft.py --search 5 --workers 8
+
+    The script only runs as __main__, since worker processes may import it again when they start.
+"""
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Count move generator leaf nodes (perft).')
+    parser.add_argument('--depth', type=int, default=3, help='Number of half moves to search')
+    parser.add_argument('--position', help='FEN string of the position, ex: "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"')
+    parser.add_argument('--divide', action='store_true', help='Print the node count for every root move')
+    parser.add_argument('--suite', action='store_true', help='Run the reference positions and compare against their known node counts')
+    parser.add_argument('--workers', type=int, default=1, help='Number of processes to split the work between')
+    parser.add_argument('--search', type=float, help='Search the position for this many seconds and report the search speed instead')
+    args = parser.parse_args()
+
+    if args.suite:
+        failed = False
+        for result in run_reference_suite(args.depth):
+            status = 'ok' if result["Nodes"] == result["Expected"] else 'FAILED (expected {})'.format(result["Expected"])
+            failed = failed or result["Nodes"] != result["Expected"]
+            print('{:<16} depth {} {:>12} nodes {:>12.0f} nodes/s {}'.format(result["Name"], result["Depth"], result["Nodes"], result["Speed"], status))
+        sys.exit(1 if failed else 0)
+
+    if args.position:
+        position = parse_position(args.position)
+    else:
+        from gamelogic import Game
+        position = Game(headless=True).get_board().get_position()
+
+    if args.search:
+        if args.workers > 1:
+            engine = ParallelEngine(time_limit=args.search, workers=args.workers)
+        else:
+            engine = Engine(time_limit=args.search)
+        start = time.perf_counter()
+        move = engine.search(position)
+        elapsed = time.perf_counter() - start
+        print('Best move: {} (depth {}, score {})'.format(move_name(move), engine.get_depth(), engine.get_score()))
+        print('Nodes: {}'.format(engine.get_nodes()))
+        print('Nodes/s: {:.0f}'.format(engine.get_nodes() / elapsed))
+        if args.workers > 1:
+            engine.close()
+        sys.exit(0)
+
+    if args.divide:
+        counts = divide(position, args.depth)
+        for move in sorted(counts):
+            print('{}: {}'.format(move, counts[move]))
+        print('Moves: {}'.format(len(counts)))
+
+    if args.workers > 1:
+        start = time.perf_counter()
+        nodes = parallel_perft(position, args.depth, args.workers)
+        speed = nodes / (time.perf_counter() - start)
+    else:
+        nodes, speed = timed_perft(position, args.depth)
+    print('Nodes: {}'.format(nodes))
+    print('Nodes/s: {:.0f}'.format(speed))
@@ -0,0 +1,41 @@
+import argparse
+import sys
+import time
+
+from Classes.pgn import read_games, replay_game
+
+"""
+    Script for validating archives of PGN games. Every game is replayed through the rules from its starting position and the
+    games with moves that can't be played are reported. Files are streamed one game at a time, so they can be any size.
+
+    Run from the top level of the ChessGame folder:
+        python3 Code/replay.py games.pgn
+        python3 Code/replay.py archive/*.pgn --quiet
+
+    Exits with 1 if any game was invalid.
+"""
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Replay PGN games through the rules to check they are valid.')
+    parser.add_argument('files', nargs='+', help='PGN files to check')
+    parser.add_argument('--quiet', action='store_true', help='Only print the totals, not each invalid game')
+    args = parser.parse_args()
+
+    games = 0
+    invalid = 0
+    moves = 0
+    start = time.perf_counter()
+    for path in args.files:
+        with open(path, encoding='utf-8', errors='replace') as stream:
+            for game in read_games(stream):
+                games += 1
+                moves += len(game["Moves"])
+                try:
+                    replay_game(game)
+                except ValueError as error:
+                    invalid += 1
+                    if not args.quiet:
+                        print('{} game {} ({} - {}): {}'.format(path, games, game["Tags"].get('White', '?'), game["Tags"].get('Black', '?'), error))
+    elapsed = time.perf_counter() - start
+    print('{} games, {} moves, {} invalid, {:.0f} moves/s'.format(games, moves, invalid, moves / elapsed if elapsed > 0 else 0))
+    sys.exit(1 if invalid else 0)
@@ -1,22 +1,38 @@
 import pygame
 import sys
 import os
-import time
 
 from pygame.locals import *
 
 from Classes.button import Button
+from Classes.assets import preload_images
+from Classes.book import OpeningBook
+from Classes.engine import Engine
+from Classes.tablebase import Tablebase
+from Classes.renderer import Renderer
 from gamelogic import Game
 
 """
     Script that starts the game. Initializes the board and runs everything within
-    the main game's while loop.
+    the main game's while loop. Run with --computer to play white against the computer,
+    add --book FILE for the computer to play its openings from a book (see Classes/book.py)
+    and --tablebase DIRECTORY for it to play endings from generated tables (see Classes/tablebase.py).
+    Frames only redraw the squares that changed, so the screen isn't touched while nothing is happening.
+    Clicks are read from mouse button events, so each click is handled exactly once.
 """
 
+book = OpeningBook(sys.argv[sys.argv.index('--book') + 1]) if '--book' in sys.argv else None
+tablebase = Tablebase(sys.argv[sys.argv.index('--tablebase') + 1]) if '--tablebase' in sys.argv else None
+
+def new_game():
+    return Game(engine=Engine(book=book, tablebase=tablebase) if '--computer' in sys.argv else None)
+
 pygame.init()
 clock = pygame.time.Clock()
 
 screen = pygame.display.set_mode((690, 690))
+# Loads every image once, converted for fast blitting, so the game loop never reads from disk.
+preload_images()
 
 game_state = ['menu']
 pygame.display.set_caption('Chess')
@@ -24,29 +40,35 @@ pygame.display.set_caption('Chess')
 start_button = Button(220, 315)
 exit_button = Button(220, 440)
 
-game = Game()
+game = new_game()
+renderer = Renderer(screen)
 
 while True:
-    screen.fill((0,0,0))
     clock.tick(60)
+    click_pos = None
+    for event in pygame.event.get():
+        if event.type == pygame.QUIT:
+            sys.exit()
+        if event.type == pygame.MOUSEBUTTONDOWN and 1 == event.button:
+            click_pos = event.pos
+        if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+            # The window was covered or restored, so what's on screen can't be trusted
+            renderer.invalidate()
+
     if 'menu' in game_state:
-        background = game.menu_display(game_state, start_button, exit_button)
-        screen.blit(background, (0, 0))
+        background = game.menu_display(game_state, start_button, exit_button, click_pos)
+        if 'game' in game_state:
+            # The game starts next frame, which draws the board and all its pieces
+            renderer.invalidate()
+        else:
+            renderer.render(background)
     elif 'game' in game_state:
-        screen.blit(background, (0, 0))
-        game.draw_pieces(screen)
+        if click_pos:
+            game.handle_click(click_pos)
         game.game()
+        renderer.render(background, game)
     elif 'gameOver' in game_state:
         # Recreates new instance of game to play again.
-        game = Game()
-        # sleep is added because without the delay the click that ended the game can carry over to the menu, starting a new game.
-        time.sleep(0.2)
+        game = new_game()
+        renderer.invalidate()
         game.game_state_manager(game_state, 'menu')
-    
-    x, y = pygame.mouse.get_pos()
-
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            sys.exit()
-
-    pygame.display.update()
\ No newline at end of file
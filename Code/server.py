@@ -0,0 +1,55 @@
+import argparse
+import asyncio
+import sys
+
+from Classes.server import GameServer, benchmark
+from gamelogic import Game
+
+"""
+    Script for hosting games over TCP (see Classes/server.py for the JSON lines protocol), or load testing a running server.
+
+    Run from the top level of the ChessGame folder:
+        python3 Code/server.py --port 8765
+        python3 Code/server.py --port 8765 --workers 4 --engine-time 0.5
+        python3 Code/server.py --port 8765 --benchmark 5000 --moves 20 --interval 2
+
+    The script only runs as __main__, since engine worker processes may import it again when they start.
+"""
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Host chess games over TCP, or load test a running server.')
+    parser.add_argument('--host', default='127.0.0.1', help='Address to listen on (or of the server to benchmark)')
+    parser.add_argument('--port', type=int, default=8765, help='Port to listen on (or of the server to benchmark)')
+    parser.add_argument('--workers', type=int, help='Number of processes searching the computer\'s moves, all cores by default')
+    parser.add_argument('--engine-time', type=float, default=1.0, help='Seconds the computer may think about each move')
+    parser.add_argument('--engine-depth', type=int, default=32, help='Deepest search the computer runs')
+    parser.add_argument('--book', help='Opening book file the computer plays its openings from (see Code/book.py)')
+    parser.add_argument('--benchmark', type=int, metavar='GAMES', help='Play this many games at once against a running server and report the move acknowledgement times')
+    parser.add_argument('--moves', type=int, default=20, help='Moves played in each benchmark game')
+    parser.add_argument('--interval', type=float, default=1.0, help='Average seconds between a benchmark game\'s moves')
+    parser.add_argument('--connections', type=int, default=100, help='Connections to spread the benchmark games over')
+    args = parser.parse_args()
+
+    if args.benchmark:
+        results = asyncio.run(benchmark(args.host, args.port, args.benchmark, args.moves, args.interval, args.connections))
+        print('{} moves acknowledged, median {:.2f}ms, p99 {:.2f}ms, max {:.2f}ms'.format(results["Moves"], results["Median"], results["P99"], results["Max"]))
+        sys.exit(0)
+
+    try:
+        server = GameServer(lambda fen: Game(headless=True, fen=fen), args.host, args.port, args.workers, args.engine_time, args.engine_depth, args.book)
+    except ValueError as error:
+        parser.error(str(error))
+
+    async def serve():
+        port = await server.start()
+        print('Serving games on {}:{}'.format(args.host, port), flush=True)
+        try:
+            await server.serve_forever()
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        print('Server stopped')
+    sys.exit(0)
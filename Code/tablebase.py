@@ -0,0 +1,55 @@
+import argparse
+import sys
+import time
+
+from Classes.fen import position_from_fen
+from Classes.notation import move_to_san
+from Classes.tablebase import Tablebase, generate_tables
+from Classes.engine import Engine
+
+"""
+    Script for generating endgame tables (see Classes/tablebase.py), or looking a position up in them.
+    Tables a table depends on (for its captures and promotions) are generated first, and tables already in the directory are kept.
+
+    Run from the top level of the ChessGame folder:
+        python3 Code/tablebase.py KQvK KRvK KPvK --directory tables
+        python3 Code/tablebase.py --directory tables --probe "8/8/8/4k3/8/8/3RK3/8 w - - 0 1"
+
+    The tables are used with --tablebase in run.py and tablebase=tables in tournament.py's player settings.
+"""
+
+RESULTS = {1: 'win', 0: 'draw', -1: 'loss'}
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Generate endgame tables, or look a position up in them.')
+    parser.add_argument('signatures', nargs='*', help='Material of the tables to generate, ex: KQvK KRvK KPvK (up to 4 pieces)')
+    parser.add_argument('--directory', default='tables', help='Directory the tables are written to and read from')
+    parser.add_argument('--probe', metavar='FEN', help='Look up a position instead of generating tables')
+    args = parser.parse_args()
+
+    if args.probe:
+        try:
+            position = position_from_fen(args.probe)
+        except ValueError as error:
+            parser.error(str(error))
+        tablebase = Tablebase(args.directory)
+        entry = tablebase.probe(position)
+        if entry is None:
+            print('Not in the tablebase')
+            sys.exit(1)
+        result, plies = entry
+        move = Engine(tablebase=tablebase).search(position)
+        print('{} for the colour to move{}, best move {}'.format(RESULTS[result], ' in {} half moves'.format(plies) if result else '', move_to_san(position, move) if move is not None else 'none'))
+        sys.exit(0)
+
+    if not args.signatures:
+        parser.error('Give the material of the tables to generate, or --probe a position')
+    start = time.perf_counter()
+    def progress(stats):
+        print('{:<6} {:>9} positions  +{} ={} -{}  longest mate {} half moves  ({:.0f}s)'.format(stats["Signature"], stats["Positions"], stats["Wins"], stats["Draws"], stats["Losses"], stats["Longest"], time.perf_counter() - start), flush=True)
+    try:
+        generated = generate_tables(args.signatures, args.directory, progress)
+    except ValueError as error:
+        parser.error(str(error))
+    print('{} tables generated in {}'.format(len(generated), args.directory))
+    sys.exit(0)
@@ -0,0 +1,50 @@
+import argparse
+import sys
+import time
+
+from Classes.tournament import Tournament
+
+"""
+    Script for playing self-play matches between two engine settings, ex: to check whether a change makes the engine stronger.
+    Games are played across all cores and saved to a PGN file as they finish. Running the same command again after an
+    interruption (Ctrl+C) only plays the games missing from the file.
+
+    Run from the top level of the ChessGame folder:
+        python3 Code/tournament.py --first depth=3 --second depth=2 --games 100 --pgn match.pgn
+        python3 Code/tournament.py --first time=0.5,hash=32 --second time=0.5,hash=1 --games 200 --workers 4 --pgn hash.pgn
+
+    The script only runs as __main__, since worker processes may import it again when they start.
+"""
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Play a self-play match between two engine settings.')
+    parser.add_argument('--first', default='depth=3', help='Engine settings of the first player, ex: "depth=3,time=0.5,hash=8,book=openings.bin"')
+    parser.add_argument('--second', default='depth=2', help='Engine settings of the second player')
+    parser.add_argument('--games', type=int, default=100, help='Number of games to play, colours alternate every game')
+    parser.add_argument('--pgn', help='PGN file to save the games to and resume from')
+    parser.add_argument('--workers', type=int, help='Number of processes to play games in, all cores by default')
+    parser.add_argument('--opening-plies', type=int, default=4, help='Number of random half moves each opening pair starts with')
+    parser.add_argument('--max-plies', type=int, default=400, help='Half moves after which a game is adjudicated a draw')
+    parser.add_argument('--resign-score', type=int, default=1000, help='Score in centipawns at which a game is adjudicated won')
+    parser.add_argument('--resign-moves', type=int, default=8, help='Half moves the score has to stay past --resign-score for, 0 to turn off')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for the random openings')
+    args = parser.parse_args()
+
+    try:
+        tournament = Tournament(args.first, args.second, args.games, args.pgn, args.workers, args.opening_plies, args.max_plies, args.resign_score, args.resign_moves, args.seed)
+    except ValueError as error:
+        parser.error(str(error))
+
+    start = time.perf_counter()
+    def progress(game, results):
+        print('Game {:>4} {:>7} ({}) {} vs {}   +{} ={} -{}'.format(game["Index"] + 1, game["Result"], game["Termination"], game["WhiteName"], game["BlackName"], results["Wins"], results["Draws"], results["Losses"]), flush=True)
+
+    try:
+        results = tournament.run(progress)
+    except KeyboardInterrupt:
+        print('Interrupted, run the same command again to resume')
+        results = tournament.get_results()
+    elo, margin = tournament.get_elo()
+    print('{} vs {}: +{} ={} -{} in {:.0f}s'.format(args.first, args.second, results["Wins"], results["Draws"], results["Losses"], time.perf_counter() - start))
+    print('Elo difference: {:+.1f} +/- {:.1f}'.format(elo, margin))
+    sys.exit(0)